@@ -5,8 +5,12 @@ from autolang.backend.machines.dfa import DFA
 from autolang.backend.machines.nfa import NFA
 from autolang.backend.machines.pda import PDA
 from autolang.backend.machines.tm import TM
+from autolang.backend.machines.dfa_bank import DFABank
 from autolang.backend.regex.regex_to_nfa import regex_to_nfa
 from autolang.backend.regex.nfa_to_dfa import nfa_to_dfa
 from autolang.backend.regex.regex_to_dfa import regex_to_dfa
+from autolang.backend.regex.derivatives import RegexMatcher
+from autolang.backend.regex.simplify import simplify_regex
+from autolang.backend.regex.equivalence import regex_equivalent
 
-__all__ = ['DFA', 'NFA', 'PDA', 'TM', 'regex_to_nfa', 'nfa_to_dfa', 'regex_to_dfa']
\ No newline at end of file
+__all__ = ['DFA', 'NFA', 'PDA', 'TM', 'DFABank', 'regex_to_nfa', 'nfa_to_dfa', 'regex_to_dfa', 'RegexMatcher', 'simplify_regex', 'regex_equivalent']
\ No newline at end of file
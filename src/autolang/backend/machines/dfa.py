@@ -1,6 +1,8 @@
 from autolang.backend.utils import words_to_length
 from autolang.backend.machines.structs_transition import TransitionDFA
 from autolang.backend.machines.settings_machines import DEFAULT_LANGUAGE_LENGTH
+from autolang.backend.machines.trim import _trim_dfa
+from autolang.backend.machines.dfa_minimise import _minimise_dfa
 
 from autolang.visuals.dfa_visuals import _transition_table_dfa, _get_dfa_digraph
 from autolang.visuals.render_diagrams import render_digraph
@@ -32,6 +34,13 @@ class DFA:
         return f'<{len(self.states)}-state DFA with alphabet {'{' + ','.join(self.alphabet) + '}'}>'
     def __str__(self):
         return self.__repr__()
+
+    # Shallow copy, sharing the read-only transition function but not the accept set
+    def __copy__(self):
+        new = type(self).__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        new.accept = set(self.accept)
+        return new
     
     def accepts(self, 
                 word: str) -> bool:
@@ -44,6 +53,35 @@ class DFA:
             current = self.transition[(current, letter)] # Transition to next state
         return current in self.accept # True if current state is in accept after word has been read
     
+    # TRANSFORMATIONS
+
+    # Equivalent DFA with only states that are reachable from the start, and can reach an accept state
+    def trim(self) -> 'DFA':
+        '''
+        - all transitions into removed states are redirected to a single sink state, so the result is still a complete DFA
+        - the sink reuses the name of one of the removed states, and is omitted if no transitions need it
+        '''
+        return DFA(*_trim_dfa(self.transition, self.start, self.accept))
+
+    # Equivalent DFA with the fewest possible states
+    def minimise(self) -> 'DFA':
+        '''
+        - unreachable states are dropped, and equivalent states merged by Hopcroft's algorithm, see dfa_minimise.py
+        - merged states keep the name of their first member in len-lex order
+        '''
+        return DFA(*_minimise_dfa(self.transition, self.start, self.accept))
+
+    # Regex matching the language of the DFA, by state elimination
+    def to_regex(self,
+                 heuristic: str | None = None) -> str:
+        '''
+        - `heuristic` is one of 'degree', 'weight', 'naive', choosing the order states are eliminated in, see state_elimination.py
+        - labels are simplified as they are built, so the result is usually much shorter than with naive elimination
+        '''
+        from autolang.backend.regex.state_elimination import _to_regex # Imported here, since the regex package itself depends on machines
+        items = ((key, (next_state,)) for key, next_state in self.transition.items())
+        return _to_regex(items, self.start, self.accept, heuristic)
+    
     # Generate language of DFA up to given length
     # By default, returns tuple up-front, returns generator if lazy = True
     def L(self, 
@@ -0,0 +1,117 @@
+from autolang.backend.machines.dfa import DFA
+
+from collections.abc import Iterable
+
+# NumPy is optional, and only used to vectorise the per-letter step
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class DFABank:
+    '''
+    Simulates many `DFA`s over the same input word in a single pass.
+    - every DFA state is interned to an int, with each DFA occupying its own block of rows in one combined `table`
+    - row 0 is a shared dead state, used for letters missing from an individual DFA's alphabet, since `DFA.accepts()` rejects these
+    - `table[row][letter]` gives the next row, so stepping the whole bank is one lookup per DFA for each letter of the word
+    - if NumPy is available, the lookups for each letter are done as a single fancy-indexing operation
+    '''
+
+    def __init__(self,
+                 dfas: Iterable[DFA],
+                 use_numpy: bool | None = None):
+        '''
+        - `dfas`: the machines to pack, in the order used for indices and bitmasks
+        - `use_numpy`: force NumPy on/off, or auto-detect if None
+        '''
+        self.dfas = tuple(dfas)
+        for dfa in self.dfas:
+            if not isinstance(dfa, DFA):
+                raise TypeError(f'DFABank can only contain DFAs, not {type(dfa)}.')
+        if use_numpy and np is None:
+            raise ImportError('NumPy is not installed, so `use_numpy` cannot be set.')
+        self.use_numpy = (np is not None) if use_numpy is None else use_numpy
+        # Combined alphabet of every DFA in the bank
+        self.alphabet = tuple(sorted({letter for dfa in self.dfas for letter in dfa.alphabet}))
+        self.letter_index = {letter: i for i, letter in enumerate(self.alphabet)}
+        self.table, self.starts, self.accepting = self.pack()
+        if self.use_numpy:
+            self.table = np.array(self.table, dtype=np.int32)
+            self.starts = np.array(self.starts, dtype=np.int32)
+            self.accepting = np.array(self.accepting, dtype=bool)
+        else:
+            # Store columns per letter so each step only indexes a single flat list
+            self.table = [[row[i] for row in self.table] for i in range(len(self.alphabet))]
+
+    def __repr__(self):
+        return f'<DFABank of {len(self.dfas)} DFAs with alphabet {"{" + ",".join(self.alphabet) + "}"}>'
+    def __str__(self):
+        return self.__repr__()
+
+    def __len__(self):
+        return len(self.dfas)
+
+    # Build combined integer transition table, start rows, and accepting flags for each row
+    def pack(self) -> tuple[list[list[int]], list[int], list[bool]]:
+        dead = [0] * len(self.alphabet) # Shared dead state loops to itself on every letter
+        table = [dead]
+        accepting = [False]
+        starts = []
+        for dfa in self.dfas:
+            offset = len(table) # First row of current DFA
+            row_of = {state: offset + i for i, state in enumerate(dfa.states)}
+            for state in dfa.states:
+                row = [0] * len(self.alphabet) # Letters outside this DFA's alphabet lead to the dead state
+                for letter in dfa.alphabet:
+                    row[self.letter_index[letter]] = row_of[dfa.transition[(state, letter)]]
+                table.append(row)
+                accepting.append(state in dfa.accept)
+            starts.append(row_of[dfa.start])
+        return table, starts, accepting
+
+    # Run every DFA on `word` and return the final row of each
+    def run(self,
+            word: str):
+
+        if not isinstance(word, str): raise TypeError(f'Input word \'{word}\' is not a string.')
+        letters = [self.letter_index.get(letter) for letter in word] # Read word once, shared by all DFAs
+        if None in letters: # No DFA in the bank recognises some letter, so all reject
+            return None
+        if self.use_numpy:
+            current = self.starts
+            for i in letters:
+                current = self.table[current, i]
+            return current
+        current = list(self.starts)
+        for i in letters:
+            column = self.table[i]
+            current = [column[row] for row in current]
+        return current
+
+    # Bitmask of accepting DFAs, where bit i is set if `self.dfas[i]` accepts `word`
+    def accepts_mask(self,
+                     word: str) -> int:
+
+        current = self.run(word)
+        if current is None:
+            return 0
+        if self.use_numpy:
+            flags = self.accepting[current]
+            return int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little')
+        mask = 0
+        for i, row in enumerate(current):
+            if self.accepting[row]:
+                mask |= 1 << i
+        return mask
+
+    # Indices of DFAs that accept `word`, in bank order
+    def accepting_indices(self,
+                          word: str) -> tuple[int, ...]:
+
+        current = self.run(word)
+        if current is None:
+            return tuple()
+        if self.use_numpy:
+            return tuple(int(i) for i in np.flatnonzero(self.accepting[current]))
+        return tuple(i for i, row in enumerate(current) if self.accepting[row])
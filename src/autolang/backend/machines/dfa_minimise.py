@@ -0,0 +1,100 @@
+from autolang.backend.utils import sort_states
+from autolang.backend.machines.structs_transition import TransitionDFA
+from autolang.backend.machines.trim import reachable
+
+from collections import deque
+
+'''
+Hopcroft's algorithm for DFA minimisation, called by `DFA.minimise()` and the compositional regex construction
+- two states are equivalent if every word leads both to accept, or both to reject, and merging them never changes the language
+- the coarsest equivalence is found by partition refinement, starting from {accept, non-accept}:
+    - a *splitter* is a (block, letter) pair, and splits every block into the states that do and do not go into it on the letter
+    - after a split, only the smaller part needs adding as a new splitter, since the other part's effect follows from it
+    - each state moves into a smaller part O(log n) times, so the total work is O(k n log n) for k letters and n states
+- the internal form has states 0, 1, 2, ..., with `delta[state][i]` the next state on the i-th letter of a fixed alphabet
+    - minimal DFAs are renumbered in breadth-first order from the start state 0, so equal languages give equal `delta`
+'''
+
+# Coarsest partition of states 0..n-1 that refines {accept, non-accept} and is stable under `delta`
+# Returns the block id of each state
+def hopcroft(delta: list[tuple[int, ...]], accept: list[bool]) -> list[int]:
+    n = len(delta)
+    k = len(delta[0]) if delta else 0
+    inverse = [[[] for _ in range(n)] for _ in range(k)] # inverse[i][state]: states reaching `state` on letter i
+    for state, next_states in enumerate(delta):
+        for i, next_state in enumerate(next_states):
+            inverse[i][next_state].append(state)
+    accepting = {state for state in range(n) if accept[state]}
+    blocks = [part for part in (accepting, set(range(n)) - accepting) if part]
+    block_of = [0] * n
+    for block, members in enumerate(blocks):
+        for state in members:
+            block_of[state] = block
+    smallest = min(range(len(blocks)), key=lambda block: len(blocks[block]))
+    work = {(smallest, i) for i in range(k)} if len(blocks) > 1 else set()
+    while work:
+        splitter, i = work.pop()
+        touched = {} # block: its members that go into `splitter` on letter i
+        for state in blocks[splitter]:
+            for previous in inverse[i][state]:
+                touched.setdefault(block_of[previous], set()).add(previous)
+        for block, inside in touched.items():
+            if len(inside) == len(blocks[block]):
+                continue
+            outside = blocks[block] - inside
+            small, large = (inside, outside) if len(inside) <= len(outside) else (outside, inside)
+            blocks[block] = large # Larger part keeps old id, so any pending splitters on it stay valid
+            new = len(blocks)
+            blocks.append(small)
+            for state in small:
+                block_of[state] = new
+            work.update((new, j) for j in range(k))
+    return block_of
+
+# States reachable from `start`, renumbered in breadth-first order with the start as 0
+def renumber(delta: list[tuple[int, ...]],
+             start: int,
+             accept: list[bool]) -> tuple[list[tuple[int, ...]], list[bool]]:
+    order = {start: 0}
+    queue = deque([start])
+    while queue:
+        for next_state in delta[queue.popleft()]:
+            if next_state not in order:
+                order[next_state] = len(order)
+                queue.append(next_state)
+    new_delta = [tuple(order[next_state] for next_state in delta[state]) for state in order]
+    return new_delta, [accept[state] for state in order]
+
+# Minimal DFA of the states reachable from `start`, in the canonical numbering of `renumber()`
+def minimise_int(delta: list[tuple[int, ...]],
+                 start: int,
+                 accept: list[bool]) -> tuple[list[tuple[int, ...]], list[bool]]:
+    delta, accept = renumber(delta, start, accept)
+    block_of = hopcroft(delta, accept)
+    quotient_delta = [None] * len(block_of)
+    quotient_accept = [False] * len(block_of)
+    for state, block in enumerate(block_of): # Block ids are below the number of states, so can index directly
+        quotient_delta[block] = tuple(block_of[next_state] for next_state in delta[state])
+        quotient_accept[block] = accept[state]
+    return renumber(quotient_delta, block_of[0], quotient_accept)
+
+
+def _minimise_dfa(transition: TransitionDFA,
+                  start: str,
+                  accept: set[str]) -> tuple[dict[tuple[str, str], str], str, set[str]]:
+    '''
+    - unreachable states are dropped, then equivalent states are merged
+    - each merged state is named after its first member in len-lex order, as in `NFA.reduce()`
+    '''
+    edges = {state: [transition[(state, letter)] for letter in transition.alphabet] for state in transition.states}
+    states = sort_states(reachable({start}, edges))
+    index = {state: i for i, state in enumerate(states)}
+    delta = [tuple(index[next_state] for next_state in edges[state]) for state in states]
+    block_of = hopcroft(delta, [state in accept for state in states])
+    name = {}
+    for i, state in enumerate(states): # Already in len-lex order
+        name.setdefault(block_of[i], state)
+    rep = {state: name[block_of[index[state]]] for state in states}
+    new_transition = {(rep[state], letter): rep[next_state]
+                      for (state, letter), next_state in transition.items() if state in index}
+    return new_transition, rep[start], {rep[state] for state in accept if state in index}
@@ -1,7 +1,14 @@
 from autolang.backend.utils import words_to_length
-from autolang.backend.machines.structs_config import ConfigNFA
 from autolang.backend.machines.structs_transition import TransitionNFA
-from autolang.backend.machines.settings_machines import DEFAULT_LANGUAGE_LENGTH
+from autolang.backend.machines.nfa_bitset import BitsetNFA
+from autolang.backend.machines.nfa_lazy import LazyDFA
+from autolang.backend.machines.nfa_batch import _accepts_many
+from autolang.backend.machines.nfa_epsilon import _remove_epsilon
+from autolang.backend.machines.trim import _trim_nfa
+from autolang.backend.machines.nfa_reduce import _reduce_nfa
+from autolang.backend.machines.nfa_antichain import _universality_counterexample, _inclusion_counterexample
+from autolang.backend.machines.nfa_ambiguity import _count_runs, _is_unambiguous
+from autolang.backend.machines.settings_machines import DEFAULT_LANGUAGE_LENGTH, DEFAULT_NFA_MODE, NFA_MODES, NFA_COMPILE_MAX_STATES
 
 from autolang.visuals.nfa_visuals import _transition_table_nfa, _get_nfa_digraph
 from autolang.visuals.render_diagrams import render_digraph
@@ -14,9 +21,12 @@ class NFA:
     def __init__(self, 
                  transition: dict[tuple[str, str], tuple[str, ...]], 
                  start: str, 
-                 accept: Iterable[str]):
-        
-        self.transition = TransitionNFA(transition) # Wrap transition function and check valid encoding
+                 accept: Iterable[str],
+                 compact: bool = False):
+        '''
+        - `compact`: store transitions as interned int arrays instead of a dict, to save memory for very large NFAs, see `TransitionNFA`
+        '''
+        self.transition = TransitionNFA(transition, compact) # Wrap transition function and check valid encoding
         self.states = self.transition.states
         self.alphabet = self.transition.alphabet
         # Check additional args agree with `transition`
@@ -28,11 +38,54 @@ class NFA:
         self.start = start
         self.accept = set(accept)
 
+    # Compiled forms are built from `transition`, `start` and `accept`, so are dropped whenever any of them is reassigned
+    # Changing `accept` in place needs nothing, since `BitsetNFA` reads the same set each time it is queried
+    @property
+    def transition(self) -> TransitionNFA:
+        return self._transition
+    @transition.setter
+    def transition(self, transition: TransitionNFA):
+        self._transition = transition
+        self.invalidate()
+
+    @property
+    def start(self) -> str:
+        return self._start
+    @start.setter
+    def start(self, start: str):
+        self._start = start
+        self.invalidate()
+
+    @property
+    def accept(self) -> set[str]:
+        return self._accept
+    @accept.setter
+    def accept(self, accept: set[str]):
+        self._accept = accept
+        self.invalidate()
+
+    # Drop cached compiled forms
+    def invalidate(self) -> None:
+        self._compiled = None # Cached `BitsetNFA`, built on first use by `compile()`
+        self._lazy_dfa = None # Cached `LazyDFA`, built on first use by `lazy_dfa()`
+
     # Represent NFA in text
     def __repr__(self):
         return f'<{len(self.states)}-state NFA with alphabet {'{' + ','.join(self.alphabet) + '}'}>'
     def __str__(self):
         return self.__repr__()
+
+    # Shallow copy, sharing the read-only transition function and the precomputed part of the compiled `BitsetNFA`,
+    # but not the accept set
+    # The `LazyDFA` is not shared, since its cache is written to while it runs
+    def __copy__(self):
+        new = type(self).__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        new._accept = set(self.accept)
+        if self._compiled is not None:
+            new._compiled = self._compiled.with_accept(new._accept)
+        new._lazy_dfa = None
+        return new
     
     # TODO refactor more into `next_states` from `accepts` as with PDA case?
     def next_states(self, 
@@ -47,53 +100,225 @@ class NFA:
             return tuple() # Empty next states if key not present, because no transitions
         return self.transition[(state, letter)]
     
+    # Close set of states under ε-transitions
+    def epsilon_closure(self,
+                        states: set[str]) -> set[str]:
+        
+        if self.transition.compact:
+            index = self.transition.state_index
+            return {self.states[i] for i in self.epsilon_closure_ids({index[state] for state in states})}
+        closure = set(states)
+        stack = list(states) # States to explore ε-transitions from
+        while stack:
+            for next_state in self.transition.get((stack.pop(), '')):
+                if next_state not in closure:
+                    closure.add(next_state)
+                    stack.append(next_state)
+        return closure
+
+    # As `epsilon_closure()`, on state indices of a compact transition function, see `TransitionNFA.successors()`
+    def epsilon_closure_ids(self,
+                            ids: set[int]) -> set[int]:
+        
+        k = self.transition.letter_index['']
+        closure = set(ids)
+        stack = list(ids)
+        while stack:
+            for j in self.transition.successors(stack.pop(), k):
+                if j not in closure:
+                    closure.add(j)
+                    stack.append(j)
+        return closure
+    
+    # Precompute bitset encoding of NFA, reused by every later call
+    def compile(self) -> BitsetNFA:
+        if self._compiled is None:
+            self._compiled = BitsetNFA(self.transition, self.start, self.accept)
+        return self._compiled
+    
+    # Lazily-determinised view of NFA, whose subset transitions are cached across calls
+    def lazy_dfa(self) -> LazyDFA:
+        if self._lazy_dfa is None:
+            self._lazy_dfa = LazyDFA(self.compile())
+        return self._lazy_dfa
+    
+    # Compiled simulator for given mode, or None for 'set' mode
+    def simulator(self, 
+                  mode: str) -> BitsetNFA | LazyDFA | None:
+        
+        if mode == 'bitset':
+            return self.compile()
+        if mode == 'lazy':
+            return self.lazy_dfa()
+        return None
+    
+    # Check simulation mode is recognised, and fill in default
+    def check_mode(self, 
+                   mode: str | None) -> str:
+        
+        if mode is None:
+            return DEFAULT_NFA_MODE if len(self.states) <= NFA_COMPILE_MAX_STATES else 'set'
+        if mode not in NFA_MODES:
+            raise ValueError(f'NFA simulation mode \'{mode}\' is not recognised, must be one of {NFA_MODES}.')
+        return mode
+    
     def accepts(self, 
-                word: str) -> bool:
+                word: str,
+                mode: str | None = None) -> bool:
+        '''
+        - `mode`: simulation strategy, one of `NFA_MODES` in settings_machines.py
+            - if None, `DEFAULT_NFA_MODE` for NFAs of up to `NFA_COMPILE_MAX_STATES` states, and 'set' otherwise
+            - 'set': step a set of state names per letter, see `accepts_set()`
+            - 'bitset': step an int bitmask per letter using precomputed ε-closures, see `compile()`
+            - 'lazy': as with 'bitset', but each subset transition is cached the first time it is computed, see `lazy_dfa()`
+        '''
+        simulator = self.simulator(self.check_mode(mode))
+        if simulator is not None:
+            return simulator.accepts(word)
+        return self.accepts_set(word)
+    
+    # Decide many words at once, returning results in the same order as `words`
+    def accepts_many(self,
+                     words: Iterable[str],
+                     use_numpy: bool | None = None) -> tuple[bool, ...]:
+        '''
+        - `use_numpy`: force NumPy on/off, or auto-detect if None
+        - with NumPy, words of equal length are stepped together with one boolean matrix product per letter position, see nfa_batch.py
+        - without NumPy, each word is decided separately in 'bitset' mode
+        - NFAs of over `NFA_COMPILE_MAX_STATES` states are not compiled, as in `accepts()`, so each word is decided in 'set' mode,
+          unless `use_numpy` is set
+        '''
+        if not use_numpy and self.check_mode(None) == 'set':
+            return tuple(self.accepts(word, mode='set') for word in words)
+        return _accepts_many(self.compile(), words, use_numpy)
+    
+    def accepts_set(self, 
+                    word: str) -> bool:
         '''
-        - initialise `queue` with start state and whole input word
-        - simulate all computation branches using BFS:
-            - choose next branch from `queue`, and pop it
-            - for each transition (incl. epsilon-) from the current state in this branch, add the corresponding new config to `queue`
-                - NOTE: always choosing from the start of `queue` and adding to the end will ensure BFS implicitly
-            - if no transitions, end the branch by not adding any new configs. This will happen automatically
-            - if no remaining letters in `suffix`, and current state is an accept state, then break the loop and accept
-        - if all branches end, either by having no valid transitions or if (all branches have empty `suffix` and no novel branches), then reject
+        - simulate all computation branches at once by tracking the *set* of states the NFA could be in after each letter
+            - initialise `current` as the ε-closure of the start state
+            - for each letter, step every state in `current` and take the ε-closure of the result
+            - if `current` becomes empty, then every branch has died, so reject early
+        - accept if any state in `current` is an accept state once the whole word has been read
+        - NOTE each letter costs at most one visit per state and transition, so the whole run is O(|word|·|Q|) for a fixed NFA, 
+          unlike BFS over `ConfigNFA`s which copies the suffix and path for every branch
         '''
         if not all(letter in self.alphabet for letter in word): # Reject if unrecognised symbols in input
             return False
+        if self.transition.compact:
+            return self.accepts_set_ids(word)
         
-        queue = [ConfigNFA(self.start, word)] # Initialise list of configs to explore
-        visited = set() # Track seen configs to prevent redunant branches and infinite loops
-
-        while queue:
-            current = queue.pop(0)
-            # Check for termination on accept
-            if current.suffix == '' and current.state in self.accept:
-                return True
-            if current in visited:
-                continue # Abort current branch if already explored
-            visited.add(current)
-
-            # Next letter-transitions
-            state = current.state
-            letter = current.suffix[0] if current.suffix else ''
-            if current.suffix:
-                for next_state in self.next_states(state, letter):
-                    queue.append(ConfigNFA(next_state, current.suffix[1:], current.path + (state, letter)))
-
-            # Next ε-transitions
-            for next_state in self.next_states(state, ''):
-                queue.append(ConfigNFA(next_state, current.suffix, current.path + (state, '')))
-        return False
+        current = self.epsilon_closure({self.start}) # Set of states reachable before reading any letters
+        for letter in word:
+            next_states = set()
+            for state in current:
+                next_states.update(self.transition.get((state, letter)))
+            current = self.epsilon_closure(next_states)
+            if not current: # All branches have died
+                return False
+        return not current.isdisjoint(self.accept)
+
+    # As `accepts_set()`, but stepping sets of state indices with `TransitionNFA.successors()`, for compact NFAs
+    def accepts_set_ids(self, 
+                        word: str) -> bool:
+        
+        transition = self.transition
+        current = self.epsilon_closure_ids({transition.state_index[self.start]})
+        for letter in word:
+            k = transition.letter_index[letter]
+            next_ids = set()
+            for i in current:
+                next_ids.update(transition.successors(i, k))
+            current = self.epsilon_closure_ids(next_ids)
+            if not current: # All branches have died
+                return False
+        return any(self.states[i] in self.accept for i in current)
+    
+    # Number of distinct accepting runs on `word`, i.e. its degree of ambiguity
+    def count_runs(self, 
+                   word: str) -> int | float:
+        '''
+        - forward dynamic programming over (position, state), counting runs into each state instead of just marking it reachable
+        - returns `math.inf` if some accepting run can go round an ε-cycle, since it can then do so any number of times
+        '''
+        if not isinstance(word, str): raise TypeError(f'Input word \'{word}\' is not a string.')
+        return _count_runs(self.transition, self.start, self.accept, word)
+    
+    # Check if every word has at most one accepting run, in polynomial time via the self-product of the NFA
+    def is_unambiguous(self) -> bool:
+        return _is_unambiguous(self.transition, self.start, self.accept)
+    
+    # LANGUAGE COMPARISON
+    # These use antichains of subsets, see nfa_antichain.py, which avoids building the whole DFA via `nfa_to_dfa()`
+
+    # Shortest word over the alphabet that is rejected, or None if every word is accepted
+    def universal_counterexample(self) -> str | None:
+        return _universality_counterexample(self.compile())
+    
+    # Check if every word over the alphabet is accepted
+    def is_universal(self) -> bool:
+        return self.universal_counterexample() is None
+    
+    # Shortest word accepted by this NFA but not `other`, or None if there is no such word
+    def subset_counterexample(self, 
+                              other: 'NFA') -> str | None:
+        
+        if not isinstance(other, NFA):
+            raise TypeError(f'Can only compare languages with another NFA, not {type(other)}.')
+        return _inclusion_counterexample(self.compile(), other.compile())
+    
+    # Check if the language of this NFA is contained in the language of `other`
+    def is_subset_of(self, 
+                     other: 'NFA') -> bool:
+        
+        return self.subset_counterexample(other) is None
+    
+    # TRANSFORMATIONS
+
+    # Equivalent NFA without ε-transitions
+    def remove_epsilon(self) -> 'NFA':
+        '''
+        - closures are computed once, with ε-cycles condensed, see nfa_epsilon.py
+        - states that are unreachable without ε-transitions are dropped
+        '''
+        return NFA(*_remove_epsilon(self.transition, self.start, self.accept))
+    
+    # Equivalent NFA with only states that are reachable from the start, and can reach an accept state
+    def trim(self) -> 'NFA':
+        return NFA(*_trim_nfa(self.transition, self.start, self.accept))
+    
+    # Equivalent NFA with bisimilar states merged
+    def reduce(self, 
+               backward: bool = False) -> 'NFA':
+        '''
+        - `backward`: also merge backward bisimilar states, alternating with forward merging until no more states are removed
+        - uses partition refinement, see nfa_reduce.py, so unlike `nfa_to_dfa()` the result is never larger than the original
+        '''
+        return NFA(*_reduce_nfa(self.transition, self.start, self.accept, backward))
+
+    # Regex matching the language of the NFA, by state elimination
+    def to_regex(self,
+                 heuristic: str | None = None) -> str:
+        '''
+        - `heuristic` is one of 'degree', 'weight', 'naive', choosing the order states are eliminated in, see state_elimination.py
+        - labels are simplified as they are built, so the result is usually much shorter than with naive elimination
+        '''
+        from autolang.backend.regex.state_elimination import _to_regex # Imported here, since the regex package itself depends on machines
+        return _to_regex(self.transition.items(), self.start, self.accept, heuristic)
     
     # Generate language of NFA up to given length
     # By default, returns tuple up-front, returns generator if lazy = True
     def L(self, 
           n: int = DEFAULT_LANGUAGE_LENGTH, 
-          lazy: bool = False) -> tuple[str, ...] | Generator[str]:
+          lazy: bool = False,
+          mode: str | None = None) -> tuple[str, ...] | Generator[str]:
         
         # Generator object that produces words accepted by NFA
-        gen = (word for word in words_to_length(n, self.alphabet) if self.accepts(word))
+        simulator = self.simulator(self.check_mode(mode))
+        if simulator is not None:
+            gen = simulator.language(n) # Shares work between words with common prefixes
+        else:
+            gen = (word for word in words_to_length(n, self.alphabet) if self.accepts(word, mode))
         return gen if lazy else tuple(gen)
 
     # VISUALISATION METHODS
@@ -0,0 +1,137 @@
+from autolang.backend.utils import strongly_connected_components
+from autolang.backend.machines.structs_transition import TransitionNFA
+from autolang.backend.machines.trim import useful_states
+
+from collections.abc import Iterable
+from collections import deque
+import math
+
+'''
+Ambiguity of NFAs, called by `NFA.count_runs()` and `NFA.is_unambiguous()`
+- a run is a path through the transition diagram that reads the word, including the choice of every ε-transition
+    - next states are treated as a set, so repeated states in a transition entry do not count as separate runs
+- runs differing only in how many times they go round an ε-cycle are distinct, so a word can have infinitely many runs
+    - `math.inf` is used in this case, and propagates through sums like an ordinary count
+'''
+
+# ε-graph of NFA, condensed into SCCs in topological order
+# Returns direct ε-successors, components in topological order, and whether each component contains a cycle
+def epsilon_components(transition: TransitionNFA,
+                       states: Iterable[str]) -> tuple[dict[str, set[str]], list[list[str]], list[bool]]:
+    states = tuple(states)
+    keep = set(states)
+    epsilon = {state: {s for s in transition.get((state, '')) if s in keep} for state in states}
+    components = strongly_connected_components(states, epsilon)[::-1] # Tarjan gives reverse topological order
+    cyclic = [len(component) > 1 or component[0] in epsilon[component[0]] for component in components]
+    return epsilon, components, cyclic
+
+
+# Follow ε-transitions from every state with a nonzero count, summing the number of runs into each state
+def propagate(counts: dict[str, int | float],
+              epsilon: dict[str, set[str]],
+              components: list[list[str]],
+              cyclic: list[bool]) -> dict[str, int | float]:
+    counts = dict(counts)
+    for component, is_cyclic in zip(components, cyclic): # Predecessor components are always finished first
+        if is_cyclic and any(counts.get(state) for state in component):
+            for state in component: # Any run entering an ε-cycle can go round it any number of times
+                counts[state] = math.inf
+        for state in component:
+            count = counts.get(state)
+            if not count:
+                continue
+            for next_state in epsilon[state]:
+                if next_state not in component:
+                    counts[next_state] = counts.get(next_state, 0) + count
+    return counts
+
+
+# Number of distinct accepting runs on `word`
+def _count_runs(transition: TransitionNFA,
+                start: str,
+                accept: Iterable[str],
+                word: str) -> int | float:
+    if not all(letter in transition.alphabet for letter in word):
+        return 0
+    epsilon, components, cyclic = epsilon_components(transition, transition.states)
+    counts = propagate({start: 1}, epsilon, components, cyclic)
+    for letter in word:
+        next_counts = {}
+        for state, count in counts.items():
+            if count:
+                for next_state in set(transition.get((state, letter))):
+                    next_counts[next_state] = next_counts.get(next_state, 0) + count
+        counts = propagate(next_counts, epsilon, components, cyclic)
+        if not counts:
+            return 0
+    return sum(counts.get(state, 0) for state in accept)
+
+
+def _is_unambiguous(transition: TransitionNFA,
+                    start: str,
+                    accept: Iterable[str]) -> bool:
+    '''
+    - only useful states matter, i.e. reachable from start and co-reachable to accept, since every accepting run stays inside them
+    - a useful ε-cycle gives infinitely many runs, so the NFA is ambiguous
+    - otherwise, treat each step as "read a letter, then follow an ε-path", with a multiplicity for the number of ε-paths
+        - any multiplicity of 2 or more, including for the initial ε-paths from start, gives two runs with the same states
+    - finally build the self-product of these steps: two runs of the same word with different states meet in an off-diagonal
+      pair (p, q) with p != q, so the NFA is ambiguous iff a useful off-diagonal pair exists
+    - everything is polynomial in the size of the NFA, with no subset construction
+    '''
+    accept = set(accept)
+    useful, _ = useful_states(transition.items(), start, accept)
+    if not useful:
+        return True # No accepting runs at all
+    epsilon, components, cyclic = epsilon_components(transition, useful)
+    if any(cyclic):
+        return False
+    # Number of ε-paths from each state to every other, capped at 2 since only "more than one" matters
+    paths = {}
+    for component in reversed(components): # Successors first
+        state = component[0]
+        count = {state: 1}
+        for next_state in epsilon[state]:
+            for target, c in paths[next_state].items():
+                count[target] = min(count.get(target, 0) + c, 2)
+        paths[state] = count
+    if any(c > 1 for c in paths[start].values()):
+        return False
+    # Steps of the form: read letter, then follow an ε-path
+    steps = {} # state: {letter: list of next states}
+    for state in useful:
+        for letter in transition.alphabet:
+            multiplicity = {}
+            for middle in set(transition.get((state, letter))):
+                for target, c in paths.get(middle, {}).items():
+                    multiplicity[target] = multiplicity.get(target, 0) + c
+            if any(c > 1 for c in multiplicity.values()):
+                return False
+            if multiplicity:
+                steps.setdefault(state, {})[letter] = list(multiplicity)
+    # Self-product, restricted to pairs reachable from the initial pairs
+    initial = [(p, q) for p in paths[start] for q in paths[start]]
+    seen = set(initial)
+    backward = {}
+    queue = deque(initial)
+    while queue:
+        p, q = queue.popleft()
+        p_steps = steps.get(p, {})
+        q_steps = steps.get(q, {})
+        for letter in p_steps.keys() & q_steps.keys():
+            for next_p in p_steps[letter]:
+                for next_q in q_steps[letter]:
+                    pair = (next_p, next_q)
+                    backward.setdefault(pair, []).append((p, q))
+                    if pair not in seen:
+                        seen.add(pair)
+                        queue.append(pair)
+    # Pairs that can reach an accepting pair
+    co_reachable = {pair for pair in seen if pair[0] in accept and pair[1] in accept}
+    stack = list(co_reachable)
+    while stack:
+        for pair in backward.get(stack.pop(), ()):
+            if pair not in co_reachable:
+                co_reachable.add(pair)
+                stack.append(pair)
+    return all(p == q for p, q in co_reachable)
@@ -0,0 +1,68 @@
+from autolang.backend.machines.nfa_bitset import BitsetNFA, bits_of
+
+from collections import deque
+
+'''
+Antichain algorithms for NFA universality and language inclusion (De Wulf, Doyen, Henzinger, Raskin 2006)
+- both problems are about subsets of states, but instead of building the whole subset construction, subsets are explored on the fly
+- if subset S ⊆ T, then every word rejected from T is also rejected from S, so T can never give a *shorter* counterexample than S
+    - hence T is pruned if some S ⊆ T has already been seen, and only the minimal subsets (an antichain) are kept
+- exploration is breadth-first, so the counterexample returned is a shortest one
+- subsets are bitmasks of the compiled NFAs, which are already ε-closed, see nfa_bitset.py
+'''
+
+# Add `mask` to `antichain` unless it is subsumed, i.e. some existing element is a subset of it
+# Returns False if subsumed, otherwise removes the elements that `mask` itself subsumes and returns True
+def insert_minimal(antichain: list[int], mask: int) -> bool:
+    for other in antichain:
+        if other & ~mask == 0: # other ⊆ mask
+            return False
+    antichain[:] = [other for other in antichain if mask & ~other != 0]
+    antichain.append(mask)
+    return True
+
+
+# Shortest word over the alphabet of `nfa` that it rejects, or None if it accepts every word
+def _universality_counterexample(nfa: BitsetNFA) -> str | None:
+    accept = nfa.accept
+    antichain = []
+    insert_minimal(antichain, nfa.start)
+    queue = deque([(nfa.start, '')])
+    while queue:
+        mask, word = queue.popleft()
+        if not mask & accept:
+            return word
+        for letter in nfa.alphabet:
+            next_mask = nfa.step(mask, letter)
+            if insert_minimal(antichain, next_mask):
+                queue.append((next_mask, word + letter))
+    return None
+
+
+# Shortest word accepted by `nfa_a` but not `nfa_b`, or None if L(nfa_a) ⊆ L(nfa_b)
+def _inclusion_counterexample(nfa_a: BitsetNFA, nfa_b: BitsetNFA) -> str | None:
+    '''
+    - macrostates are pairs (p, S) of a single state p of `nfa_a` and a subset S of `nfa_b`
+        - (p, S) is a counterexample if p accepts but no state in S does
+    - (p, S) subsumes (p, T) if S ⊆ T, so there is one antichain for each state p
+    - letters of `nfa_a` missing from `nfa_b` lead to the empty subset, since `nfa_b` rejects any word containing them
+    '''
+    accept_a, accept_b = nfa_a.accept, nfa_b.accept
+    antichains = {} # p: minimal subsets seen with p
+    queue = deque()
+    for p in bits_of(nfa_a.start):
+        if insert_minimal(antichains.setdefault(p, []), nfa_b.start):
+            queue.append((p, nfa_b.start, ''))
+    while queue:
+        p, mask, word = queue.popleft()
+        if (accept_a >> p) & 1 and not mask & accept_b:
+            return word
+        for letter in nfa_a.alphabet:
+            next_ps = nfa_a.successors[letter][p]
+            if not next_ps:
+                continue
+            next_mask = nfa_b.step(mask, letter) if letter in nfa_b.successors else 0
+            for next_p in bits_of(next_ps):
+                if insert_minimal(antichains.setdefault(next_p, []), next_mask):
+                    queue.append((next_p, next_mask, word + letter))
+    return None
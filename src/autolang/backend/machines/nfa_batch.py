@@ -0,0 +1,78 @@
+from autolang.backend.machines.nfa_bitset import BitsetNFA
+
+from collections.abc import Iterable
+
+# NumPy is optional, and without it words are decided one at a time
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+'''
+Batch membership for NFAs, called by `NFA.accepts_many()`
+- words are bucketed by length, and each bucket is simulated together as a boolean matrix `current` of shape (words, states)
+    - row w is the active state set of word w, i.e. the bitmask of `BitsetNFA` unpacked into a row
+- the per-letter successor matrices already have ε-closures folded in, i.e. they are (adjacency @ closure)
+    - they are built once per compiled NFA and cached on it as `BitsetNFA.matrices`, so later batches reuse them
+    - at each letter position, rows are grouped by their letter, and each group is multiplied by only its letter's matrix
+    - so a position costs one (words, states) @ (states, states) product in total, however large the alphabet
+'''
+
+# Unpack list of bitmasks into boolean matrix, one row per mask
+def masks_to_matrix(masks: list[int], size: int):
+    width = (size + 7) // 8
+    packed = np.frombuffer(b''.join(mask.to_bytes(width, 'little') for mask in masks), dtype=np.uint8)
+    bits = np.unpackbits(packed.reshape(len(masks), width), axis=1, bitorder='little')
+    return bits[:, :size].astype(bool)
+
+# Successor matrix of each letter, in alphabet order, built on first use and cached on `compiled`
+def step_matrices(compiled: BitsetNFA) -> list:
+    if compiled.matrices is None:
+        size = len(compiled.states)
+        compiled.matrices = [masks_to_matrix(compiled.successors[letter], size) for letter in compiled.alphabet]
+    return compiled.matrices
+
+
+def _accepts_many_numpy(compiled: BitsetNFA, words: list[str]) -> list[bool]:
+    size = len(compiled.states)
+    letter_index = {letter: i for i, letter in enumerate(compiled.alphabet)}
+    step = step_matrices(compiled)
+    start = masks_to_matrix([compiled.start], size)[0]
+    accept = masks_to_matrix([compiled.accept], size)[0]
+
+    results = [False] * len(words)
+    buckets = {} # length: list of (position in `words`, letter indices)
+    for i, word in enumerate(words):
+        if not isinstance(word, str): raise TypeError(f'Input word \'{word}\' is not a string.')
+        indices = [letter_index.get(letter) for letter in word]
+        if None in indices: # Reject if unrecognised symbols in input
+            continue
+        buckets.setdefault(len(word), []).append((i, indices))
+
+    for length, bucket in buckets.items():
+        positions = [i for i, _ in bucket]
+        letters = np.array([indices for _, indices in bucket], dtype=np.intp).reshape(len(bucket), length)
+        current = np.tile(start, (len(bucket), 1))
+        for p in range(length):
+            if not current.any(): # Every word in bucket has died
+                break
+            next_current = np.zeros_like(current)
+            for k in np.unique(letters[:, p]):
+                rows = np.flatnonzero(letters[:, p] == k)
+                next_current[rows] = current[rows] @ step[k]
+            current = next_current
+        accepted = (current & accept).any(axis=1)
+        for i, flag in zip(positions, accepted):
+            results[i] = bool(flag)
+    return results
+
+
+def _accepts_many(compiled: BitsetNFA, words: Iterable[str], use_numpy: bool | None = None) -> tuple[bool, ...]:
+    words = list(words)
+    if use_numpy and np is None:
+        raise ImportError('NumPy is not installed, so `use_numpy` cannot be set.')
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        return tuple(_accepts_many_numpy(compiled, words))
+    return tuple(compiled.accepts(word) for word in words)
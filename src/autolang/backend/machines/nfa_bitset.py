@@ -0,0 +1,166 @@
+from autolang.backend.machines.structs_transition import TransitionNFA
+
+from collections.abc import Iterable, Generator
+
+'''
+Compiled form of an NFA, where sets of states are encoded as bits of a Python int
+- state i of `transition.states` is bit i, so a set of states is just the OR of their bits
+- ε-closures and per-letter successors are precomputed once, so simulation never looks up `(state, '')` again
+- this is not a separate automaton model, and is only created (and cached) by `NFA.compile()`
+- the accept states are kept by reference and only turned into a mask when queried, so changing the NFA's `accept` set
+  in place is still seen by its cached compiled form
+'''
+
+# Iterate over indices of set bits in `mask`, lowest first
+def bits_of(mask: int) -> Generator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitsetNFA:
+
+    def __init__(self,
+                 transition: TransitionNFA,
+                 start: str,
+                 accept: Iterable[str]):
+
+        self.states = transition.states
+        self.alphabet = transition.alphabet
+        self.index = {state: i for i, state in enumerate(self.states)} # Bit position of each state
+        self.closures = self.compute_closures(transition)
+        self.successors = self.compute_successors(transition)
+        self.start = self.closures[self.index[start]] # Start mask is already ε-closed
+        self.accept_states = accept # Same object as the NFA's `accept`, see `accept`
+        self.matrices = None # Per-letter successor matrices for batch simulation, built on first use, see nfa_batch.py
+
+    # Mask of accept states, rebuilt on each access so in-place changes to `accept_states` are seen
+    # Loops should read it once into a local
+    @property
+    def accept(self) -> int:
+        return self.to_mask(self.accept_states)
+
+    # Shallow copy with different accept states, sharing the precomputed closures and successors
+    def with_accept(self, accept: Iterable[str]) -> 'BitsetNFA':
+        new = type(self).__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        new.accept_states = accept
+        return new
+
+    def __repr__(self):
+        return f'<{len(self.states)}-state BitsetNFA with alphabet {"{" + ",".join(self.alphabet) + "}"}>'
+    def __str__(self):
+        return self.__repr__()
+
+    # Convert states to mask
+    def to_mask(self, states: Iterable[str]) -> int:
+        mask = 0
+        for state in states:
+            mask |= 1 << self.index[state]
+        return mask
+
+    # Convert state indices to mask
+    @staticmethod
+    def ids_to_mask(ids: Iterable[int]) -> int:
+        mask = 0
+        for i in ids:
+            mask |= 1 << i
+        return mask
+
+    # Convert mask to set of states
+    def to_states(self, mask: int) -> set[str]:
+        return {self.states[i] for i in bits_of(mask)}
+
+    # ε-closure mask of each individual state
+    def compute_closures(self, transition: TransitionNFA) -> list[int]:
+        if transition.compact: # Next state indices are already bit positions
+            k = transition.letter_index['']
+            epsilon = [self.ids_to_mask(transition.successors(i, k)) for i in range(len(self.states))]
+        else:
+            epsilon = [self.to_mask(transition.get((state, ''))) for state in self.states] # Direct ε-successors
+        closures = []
+        for i in range(len(self.states)):
+            closure = 1 << i
+            frontier = closure
+            while frontier: # Expand by one ε-step at a time until nothing new is added
+                reached = 0
+                for j in bits_of(frontier):
+                    reached |= epsilon[j]
+                frontier = reached & ~closure
+                closure |= reached
+            closures.append(closure)
+        return closures
+
+    # Per-letter list of ε-closed successor masks, indexed by state
+    def compute_successors(self, transition: TransitionNFA) -> dict[str, list[int]]:
+        if transition.compact:
+            return {letter: [self.closure(self.ids_to_mask(transition.successors(i, k))) for i in range(len(self.states))]
+                    for k, letter in enumerate(self.alphabet)}
+        successors = {letter: [0] * len(self.states) for letter in self.alphabet}
+        for (state, letter), next_states in transition.items():
+            if letter == '':
+                continue
+            mask = 0
+            for next_state in next_states:
+                mask |= self.closures[self.index[next_state]]
+            successors[letter][self.index[state]] |= mask
+        return successors
+
+    # ε-closure of an arbitrary mask
+    def closure(self, mask: int) -> int:
+        closed = 0
+        for i in bits_of(mask):
+            closed |= self.closures[i]
+        return closed
+
+    # Read a single letter from every state in `mask`, result is ε-closed
+    def step(self, mask: int, letter: str) -> int:
+        successors = self.successors[letter]
+        next_mask = 0
+        while mask:
+            low = mask & -mask
+            next_mask |= successors[low.bit_length() - 1]
+            mask ^= low
+        return next_mask
+
+    def accepts(self, word: str) -> bool:
+        return accepts_masks(self, word)
+
+    # Generate accepted words up to length n in len-lex order
+    def language(self, n: int) -> Generator[str]:
+        '''
+        - for each length, explore prefixes depth-first in alphabet order, so words come out in the same order as `words_to_length()`
+        - the mask of each prefix is computed once and shared by all of its extensions
+        - prefixes with an empty mask are dropped, since no extension of them can be accepted
+        '''
+        if n < 0:
+            raise ValueError('Argument \'n\' must be non-negative.')
+        return language_masks(self, n)
+
+
+# Simulations shared by `BitsetNFA` and `LazyDFA`, which only differ in how `step()` is computed
+def accepts_masks(simulator: BitsetNFA, word: str) -> bool:
+    current = simulator.start
+    for letter in word:
+        if letter not in simulator.successors: # Reject if unrecognised symbols in input
+            return False
+        current = simulator.step(current, letter)
+        if not current: # All branches have died
+            return False
+    return bool(current & simulator.accept)
+
+def language_masks(simulator: BitsetNFA, n: int) -> Generator[str]:
+    accept = simulator.accept
+    for length in range(n + 1):
+        stack = [('', simulator.start)]
+        while stack:
+            prefix, mask = stack.pop()
+            if len(prefix) == length:
+                if mask & accept:
+                    yield prefix
+                continue
+            for letter in reversed(simulator.alphabet): # Reversed so first letter is popped first
+                next_mask = simulator.step(mask, letter)
+                if next_mask:
+                    stack.append((prefix + letter, next_mask))
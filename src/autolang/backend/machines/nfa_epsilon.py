@@ -0,0 +1,66 @@
+from autolang.backend.utils import strongly_connected_components, sort_states
+from autolang.backend.machines.structs_transition import TransitionNFA, pad_transition_nfa
+
+from collections.abc import Iterable
+
+'''
+ε-removal for NFAs, called by `NFA.remove_epsilon()`
+- ε-closures are computed once for the whole NFA:
+    - states on a common ε-cycle form a strongly connected component (SCC) of the ε-graph, and all share one closure
+    - the SCCs form a DAG, so each closure is the component itself plus the closures of its successor components, built in reverse topological order
+- the ε-free NFA has the same states, with transitions `δ'(q, a) = ∪ δ(p, a)` for p in the closure of q
+    - q becomes an accept state if its closure contains an accept state
+- states in a common ε-SCC have identical closures, hence identical behaviour in the new NFA, so each SCC is collapsed to one representative
+- finally only states reachable from the start state are kept
+'''
+
+# ε-closure of every state, with SCCs of the ε-graph condensed
+# Returns the closure of each state, and the SCC representative of each state
+def epsilon_closures(transition: TransitionNFA) -> tuple[dict[str, frozenset[str]], dict[str, str]]:
+    epsilon = {state: transition.get((state, '')) for state in transition.states}
+    components = strongly_connected_components(transition.states, epsilon)
+    closures = {}
+    representative = {}
+    for component in components: # Successor components are always finished first
+        closure = set(component)
+        for state in component:
+            for next_state in epsilon[state]:
+                if next_state not in closure:
+                    closure.update(closures[next_state])
+        closure = frozenset(closure)
+        rep = sort_states(component)[0]
+        for state in component:
+            closures[state] = closure
+            representative[state] = rep
+    return closures, representative
+
+
+def _remove_epsilon(transition: TransitionNFA,
+                    start: str,
+                    accept: Iterable[str]) -> tuple[dict[tuple[str, str], tuple[str, ...]], str, set[str]]:
+    accept = set(accept)
+    closures, representative = epsilon_closures(transition)
+    start = representative[start]
+    new_transition = {}
+    new_accept = set()
+    visited = {start}
+    queue = [start]
+    while queue: # Explore only states reachable from start in the ε-free NFA
+        state = queue.pop()
+        closure = closures[state]
+        if not closure.isdisjoint(accept):
+            new_accept.add(state)
+        for letter in transition.alphabet:
+            next_states = set()
+            for closed_state in closure:
+                for next_state in transition.get((closed_state, letter)):
+                    next_states.add(representative[next_state])
+            if not next_states:
+                continue
+            new_transition[(state, letter)] = sort_states(next_states)
+            for next_state in next_states:
+                if next_state not in visited:
+                    visited.add(next_state)
+                    queue.append(next_state)
+    new_transition = pad_transition_nfa(new_transition, sort_states(visited), transition.alphabet)
+    return new_transition, start, new_accept
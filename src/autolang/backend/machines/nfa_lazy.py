@@ -0,0 +1,87 @@
+from autolang.backend.machines.nfa_bitset import BitsetNFA, accepts_masks, language_masks
+from autolang.backend.machines.settings_machines import DEFAULT_LAZY_DFA_CACHE_SIZE
+
+from collections.abc import Iterable, Generator
+
+'''
+On-the-fly subset construction for NFA membership
+- DFA-states are ε-closed bitmasks of NFA-states, exactly as in `BitsetNFA`
+- each (dfa-state, letter) transition is only computed the first time it is needed, and then stored in `cache`
+- the cache is bounded: once it holds `cache_size` transitions it is flushed entirely and rebuilt on demand
+    - this is a deliberate choice over evicting single entries, e.g. least recently used, which would need recency
+      bookkeeping on every hit, slowing down the common case to speed up the rare one
+    - after a flush, the transitions that matter are recomputed on their next use, each in one `BitsetNFA.step()`
+- wraps the `BitsetNFA` it is built from, sharing its precomputed closures and successors, rather than copying them
+- only created (and cached) by `NFA.lazy_dfa()`
+'''
+
+class LazyDFA:
+
+    def __init__(self,
+                 compiled: BitsetNFA,
+                 cache_size: int = DEFAULT_LAZY_DFA_CACHE_SIZE):
+
+        if cache_size < 1:
+            raise ValueError('Argument \'cache_size\' must be positive.')
+        self.compiled = compiled
+        # Unpack what the shared simulations in nfa_bitset.py read, without copying
+        self.states = compiled.states
+        self.alphabet = compiled.alphabet
+        self.successors = compiled.successors
+        self.start = compiled.start
+        self.cache_size = cache_size
+        self.cache = {} # (mask, letter): next_mask
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+
+    def __repr__(self):
+        return f'<LazyDFA over {len(self.states)}-state NFA with {len(self.cache)} cached transitions>'
+    def __str__(self):
+        return self.__repr__()
+
+    # Read from the compiled NFA on each access, so in-place changes to the NFA's accept states are seen
+    @property
+    def accept(self) -> int:
+        return self.compiled.accept
+
+    # Convert between masks and sets of states, as in `BitsetNFA`
+    def to_mask(self, states: Iterable[str]) -> int:
+        return self.compiled.to_mask(states)
+    def to_states(self, mask: int) -> set[str]:
+        return self.compiled.to_states(mask)
+
+    # Read a single letter, computing the subset transition only if it is not cached
+    def step(self, mask: int, letter: str) -> int:
+        key = (mask, letter)
+        next_mask = self.cache.get(key)
+        if next_mask is not None:
+            self.hits += 1
+            return next_mask
+        self.misses += 1
+        next_mask = self.compiled.step(mask, letter)
+        if len(self.cache) >= self.cache_size: # Out of budget, so start again from an empty cache
+            self.cache.clear()
+            self.flushes += 1
+        self.cache[key] = next_mask
+        return next_mask
+
+    def accepts(self, word: str) -> bool:
+        return accepts_masks(self, word)
+
+    # Generate accepted words up to length n in len-lex order, see `BitsetNFA.language()`
+    def language(self, n: int) -> Generator[str]:
+        if n < 0:
+            raise ValueError('Argument \'n\' must be non-negative.')
+        return language_masks(self, n)
+
+    # Statistics about cache usage
+    def cache_info(self) -> dict[str, int]:
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'flushes': self.flushes,
+                'size': len(self.cache),
+                'maxsize': self.cache_size}
+
+    def clear_cache(self):
+        self.cache.clear()
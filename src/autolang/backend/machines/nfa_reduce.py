@@ -0,0 +1,157 @@
+from autolang.backend.utils import sort_states
+from autolang.backend.machines.structs_transition import TransitionNFA, pad_transition_nfa
+
+from collections.abc import Iterable
+from itertools import islice
+
+'''
+Bisimulation-based state reduction for NFAs, called by `NFA.reduce()`
+- two states are forward bisimilar if they agree on accepting, and for every letter (incl. ε) each successor of one
+  has a bisimilar successor of the other. Merging bisimilar states never changes the language
+- backward bisimulation is the same on the reversed NFA, where the start state plays the role of the accept states
+- the coarsest bisimulation is found by Paige–Tarjan partition refinement:
+    - start from the partition {accept, non-accept} (or {start, non-start} for backward)
+    - blocks are grouped into *compound* blocks, such that every block is stable with respect to every compound block,
+      i.e. for each letter, either all or none of its members have a successor in the compound block
+    - a compound block with several blocks is refined by taking out a block B of at most half its size as a splitter, and splitting
+      every block by whether its members have a successor in B, and then by whether they have one in the rest of the
+      compound block. The second split uses per-state counts of successors in each compound block, so is free
+    - as in Hopcroft's algorithm, a state is only in a splitter O(log n) times, so the total work is O(m log n) for m transitions
+- unlike subset construction, no new states are ever created, so the result is never larger than the input
+'''
+
+# Coarsest partition of `states` that refines `initial` and is stable under `edges`
+# Returns the block id of each state
+def coarsest_bisimulation(states: tuple[str, ...],
+                          edges: dict[str, list[tuple[str, str]]],
+                          initial: dict[str, int]) -> dict[str, int]:
+    '''
+    - `edges` maps each state to its list of (letter, next_state) pairs, in whichever direction is being refined
+    - `initial` gives the starting block id of each state
+    '''
+    block_of = dict(initial)
+    blocks = {}
+    for state in states:
+        blocks.setdefault(block_of[state], set()).add(state)
+    next_id = max(blocks, default=-1) + 1
+    predecessors = {state: [] for state in states} # next_state: its (letter, state) pairs
+    count = {} # (state, letter, compound block): number of successors of state on letter in compound block
+    for state in states:
+        for letter, next_state in set(edges.get(state, ())):
+            predecessors[next_state].append((letter, state))
+            count[(state, letter, 0)] = count.get((state, letter, 0), 0) + 1
+    compounds = [set(blocks)] # Blocks in each compound block, starting with one compound block of all states
+    compound_of = dict.fromkeys(blocks, 0)
+    pending = {0} # Compound blocks that may contain several blocks
+
+    # Split every block into its members in `marked` and the rest, with the former taking a new id
+    def split(marked: set[str]):
+        nonlocal next_id
+        touched = {}
+        for state in marked:
+            touched.setdefault(block_of[state], set()).add(state)
+        for block, inside in touched.items():
+            if len(inside) == len(blocks[block]):
+                continue
+            blocks[block] -= inside
+            blocks[next_id] = inside
+            for state in inside:
+                block_of[state] = next_id
+            compound_of[next_id] = compound_of[block]
+            compounds[compound_of[block]].add(next_id)
+            pending.add(compound_of[block])
+            next_id += 1
+
+    # Make the initial blocks stable with respect to the compound block of all states
+    has_successor = {}
+    for state, letter, _ in count:
+        has_successor.setdefault(letter, set()).add(state)
+    for marked in has_successor.values():
+        split(marked)
+    while pending:
+        compound = pending.pop()
+        if len(compounds[compound]) < 2:
+            continue
+        first, second = islice(compounds[compound], 2)
+        splitter = first if len(blocks[first]) <= len(blocks[second]) else second # At most half the compound block
+        compounds[compound].discard(splitter)
+        pending.add(compound)
+        new = len(compounds)
+        compounds.append({splitter})
+        compound_of[splitter] = new
+        into = {} # (state, letter): number of successors of state on letter in splitter
+        for next_state in blocks[splitter]:
+            for letter, state in predecessors[next_state]:
+                into[(state, letter)] = into.get((state, letter), 0) + 1
+        by_letter = {}
+        for state, letter in into:
+            by_letter.setdefault(letter, set()).add(state)
+        for letter, marked in by_letter.items():
+            split(marked)
+            # States with every successor on letter inside the splitter, so none in the rest of the compound block
+            split({state for state in marked if into[(state, letter)] == count[(state, letter, compound)]})
+        for (state, letter), number in into.items():
+            count[(state, letter, new)] = number
+            count[(state, letter, compound)] -= number
+    return block_of
+
+# Merge states with the same block id, naming each block after its first member in len-lex order
+def quotient(transition: TransitionNFA,
+             start: str,
+             accept: set[str],
+             block_of: dict[str, int]) -> tuple[dict[tuple[str, str], tuple[str, ...]], str, set[str]]:
+    name = {}
+    for state in sort_states(transition.states):
+        name.setdefault(block_of[state], state)
+    rep = {state: name[block_of[state]] for state in transition.states}
+    new_transition = {}
+    for (state, letter), next_states in transition.items():
+        if next_states:
+            new_transition.setdefault((rep[state], letter), set()).update(rep[next_state] for next_state in next_states)
+    new_transition = {key: sort_states(val) for key, val in new_transition.items()}
+    new_transition = pad_transition_nfa(new_transition, sort_states(name.values()), transition.alphabet)
+    return new_transition, rep[start], {rep[state] for state in accept}
+
+# Forward bisimulation quotient
+def reduce_forward(transition: TransitionNFA,
+                   start: str,
+                   accept: set[str]) -> tuple[dict[tuple[str, str], tuple[str, ...]], str, set[str]]:
+    edges = {}
+    for (state, letter), next_states in transition.items():
+        edges.setdefault(state, []).extend((letter, next_state) for next_state in next_states)
+    initial = {state: int(state in accept) for state in transition.states}
+    block_of = coarsest_bisimulation(transition.states, edges, initial)
+    return quotient(transition, start, accept, block_of)
+
+# Backward bisimulation quotient
+def reduce_backward(transition: TransitionNFA,
+                    start: str,
+                    accept: set[str]) -> tuple[dict[tuple[str, str], tuple[str, ...]], str, set[str]]:
+    edges = {}
+    for (state, letter), next_states in transition.items():
+        for next_state in next_states:
+            edges.setdefault(next_state, []).append((letter, state))
+    initial = {state: int(state == start) for state in transition.states}
+    block_of = coarsest_bisimulation(transition.states, edges, initial)
+    return quotient(transition, start, accept, block_of)
+
+
+def _reduce_nfa(transition: TransitionNFA,
+                start: str,
+                accept: Iterable[str],
+                backward: bool = False) -> tuple[dict[tuple[str, str], tuple[str, ...]], str, set[str]]:
+    '''
+    - always merge forward bisimilar states
+    - if `backward`, alternate with backward bisimulation until neither removes any more states
+    '''
+    function, start, accept = reduce_forward(transition, start, set(accept))
+    if not backward:
+        return function, start, accept
+    size = len(transition.states) + 1
+    current = TransitionNFA(function)
+    while len(current.states) < size:
+        size = len(current.states)
+        function, start, accept = reduce_backward(current, start, accept)
+        function, start, accept = reduce_forward(TransitionNFA(function), start, accept)
+        current = TransitionNFA(function)
+    return function, start, accept
@@ -3,6 +3,17 @@
 # Max length to generate words up to if none given
 DEFAULT_LANGUAGE_LENGTH = 5
 
+# Strategies for simulating NFAs, see `NFA.accepts()`
+NFA_MODES = ('set', 'bitset', 'lazy')
+DEFAULT_NFA_MODE = 'bitset'
+
+# Largest NFA that uses `DEFAULT_NFA_MODE` by default, larger ones use 'set' mode
+# Compiling precomputes every ε-closure, which is O(n²) in the number of states, so only pays off for small NFAs
+NFA_COMPILE_MAX_STATES = 500
+
+# Max number of subset transitions stored by `LazyDFA` before its cache is flushed
+DEFAULT_LAZY_DFA_CACHE_SIZE = 10000
+
 # Characters forbidden from being alphabet letters or in state names
 '''
 NOTE this is a tricky problem and is not handled very well
@@ -6,6 +6,7 @@ from autolang.backend.machines.settings_machines import (DEFAULT_TM_ACCEPT,
                                                          FORBIDDEN_CHARS)
 
 from collections.abc import Iterable
+from array import array
 
 '''
 Wrapper classes for transition function dicts
@@ -112,23 +113,79 @@ class TransitionNFA:
     - each state and letter is a string, and letters expected to be length 1
     - next_states can be an empty tuple if no transitions exist
     - NOTE ε-transitions are simply encoded as an empty string, e.g. ('q0', '') instead of ('q0', 'a')
+
+    If `compact` is set, the dict is discarded after validation and replaced by compressed sparse row (CSR) arrays:
+    - states and letters are interned to ints, by their position in `states` and `alphabet` (ε is the last letter index)
+    - for letter k, the next states of state i are `targets[k][offsets[k][i]:offsets[k][i + 1]]`, stored as `array('i')`
+    - `present[k][i]` records whether the key existed at all, so empty entries and `__contains__` behave exactly as with the dict
+    - the duck-typed accessors below still take and return state names, and `function` rebuilds the original dict on first use
+    - hot loops should use `successors(i, k)` instead, which returns a slice of the arrays without building any tuples of names
     '''
-    def __init__(self, function: dict[tuple[str, str], tuple[str, ...]]):
-        self.function = function
+    def __init__(self, function: dict[tuple[str, str], tuple[str, ...]], compact: bool = False):
+        self._function = function
         self.validate_type() # Check types before extraction
         self.states, self.alphabet = self.extract()
+        self.compact = compact
+        if compact:
+            self.state_index = {state: i for i, state in enumerate(self.states)}
+            self.letter_index = {letter: k for k, letter in enumerate(self.alphabet + ('',))}
+            self.offsets, self.targets, self.present = self.to_csr()
+            self._function = None # Free dict, keeping only the arrays
 
     def __repr__(self):
         return f'{self.__class__.__name__}({repr(self.function)})'
     def __str__(self):
         return str(self.function)
 
+    # Original dict, rebuilt from arrays once in compact mode
+    # NOTE this keeps the dict alongside the arrays afterwards, giving up the memory saved by `compact`
+    @property
+    def function(self) -> dict[tuple[str, str], tuple[str, ...]]:
+        if self._function is None:
+            self._function = dict(self.items())
+        return self._function
+
+    # Build CSR arrays from dict
+    def to_csr(self) -> tuple[list[array], list[array], list[bytearray]]:
+        num_states = len(self.states)
+        num_letters = len(self.letter_index)
+        rows = [[None] * num_states for _ in range(num_letters)] # Next state indices for each letter and state
+        for (state, letter), next_states in self._function.items():
+            rows[self.letter_index[letter]][self.state_index[state]] = [self.state_index[s] for s in next_states]
+        offsets, targets, present = [], [], []
+        for k in range(num_letters):
+            offset = array('i', [0])
+            target = array('i')
+            flags = bytearray(num_states)
+            for i, row in enumerate(rows[k]):
+                if row is not None:
+                    flags[i] = 1
+                    target.extend(row)
+                offset.append(len(target))
+            offsets.append(offset)
+            targets.append(target)
+            present.append(flags)
+        return offsets, targets, present
+
+    # Next state indices for given state and letter indices, without building any tuples (compact mode only)
+    def successors(self, i: int, k: int) -> array:
+        return self.targets[k][self.offsets[k][i]:self.offsets[k][i + 1]]
+
+    # Interned indices of key, or None if key cannot be present (compact mode only)
+    def key_index(self, key: tuple[str, str]) -> tuple[int, int] | None:
+        state, letter = key
+        i = self.state_index.get(state)
+        k = self.letter_index.get(letter)
+        if i is None or k is None or not self.present[k][i]:
+            return None
+        return i, k
+
     # Deduce states and letters from transition `function`
     # Assumes `function` has been checked for valid types
     def extract(self) -> tuple[tuple[str, ...], tuple[str, ...]]: # returns `states, alphabet`
         states = set()
         alphabet = set()
-        for (state, letter), next_states in self.function.items():
+        for (state, letter), next_states in self._function.items():
             check_forbidden(state); check_forbidden(letter) # Check for forbidden chars
             for next_state in next_states:
                 check_forbidden(next_state)
@@ -142,9 +199,9 @@ class TransitionNFA:
 
     # Check `function` is a dict and all entries have the correct type
     def validate_type(self):
-        if not isinstance(self.function, dict):
+        if not isinstance(self._function, dict):
             raise TypeError('NFA transition function must be a dict.')
-        for key in self.function:
+        for key in self._function:
             if not isinstance(key, tuple):
                 raise TypeError(f'NFA transition key \'{key}\' must be a tuple, not {type(key)}.')
             if len(key) != 2:
@@ -154,7 +211,7 @@ class TransitionNFA:
                 raise TypeError(f'NFA state \'{state}\' must be a string, not {type(state)}.')
             if not isinstance(letter, str):
                 raise TypeError(f'NFA letter \'{letter}\' must be a string, not {type(letter)}.')
-        for next_states in self.function.values():
+        for next_states in self._function.values():
             if not isinstance(next_states, tuple):
                 raise TypeError(f'NFA next states must be a tuple for all keys, not {type(next_states)}.')
             for next_state in next_states:
@@ -165,15 +222,55 @@ class TransitionNFA:
     Duck typing to retrieve values
     '''
     def __getitem__(self, key: tuple[str, str]):
-        return self.function[key]
+        if not self.compact:
+            return self._function[key]
+        index = self.key_index(key)
+        if index is None:
+            raise KeyError(key)
+        return tuple(self.states[j] for j in self.successors(*index))
     def get(self, key: tuple[str, str], default = tuple()):
-        return self.function.get(key, default)
+        if not self.compact:
+            return self._function.get(key, default)
+        index = self.key_index(key)
+        if index is None:
+            return default
+        return tuple(self.states[j] for j in self.successors(*index))
     def __contains__(self, key: tuple[str, str]):
-        return key in self.function
+        if not self.compact:
+            return key in self._function
+        return self.key_index(key) is not None
     def items(self):
-        return self.function.items()
+        if not self.compact:
+            return self._function.items()
+        return (((state, letter), tuple(self.states[j] for j in self.successors(i, k)))
+                for k, letter in enumerate(self.alphabet + ('',))
+                for i, state in enumerate(self.states) if self.present[k][i])
     def values(self):
-        return self.function.values()
+        if not self.compact:
+            return self._function.values()
+        return (next_states for _, next_states in self.items())
+
+
+# Helper for algorithms that build new NFAs
+# States and letters are only inferred from the keys and values of `function`, so pad with empty entries to keep
+# states without transitions (e.g. a lone start state) and letters that no longer label any transition
+def pad_transition_nfa(function: dict[tuple[str, str], tuple[str, ...]], 
+                       states: Iterable[str], 
+                       alphabet: Iterable[str]) -> dict[tuple[str, str], tuple[str, ...]]:
+    states = list(states)
+    seen_states = set()
+    seen_letters = set()
+    for (state, letter), next_states in function.items():
+        seen_states.add(state)
+        seen_states.update(next_states)
+        seen_letters.add(letter)
+    for state in states:
+        if state not in seen_states:
+            function[(state, '')] = tuple() # Empty ε-entry adds state without adding a letter
+    for letter in alphabet:
+        if letter not in seen_letters and states:
+            function[(states[0], letter)] = tuple()
+    return function
 
 
 class TransitionPDA:
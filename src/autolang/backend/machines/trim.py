@@ -0,0 +1,82 @@
+from autolang.backend.utils import sort_states
+from autolang.backend.machines.structs_transition import TransitionDFA, TransitionNFA, pad_transition_nfa
+
+from collections.abc import Iterable, Hashable, Mapping
+
+'''
+Removal of useless states, called by `DFA.trim()` and `NFA.trim()`
+- a state is useful if it is reachable from the start state, and some accept state is reachable from it
+- both directions are a single graph search, so trimming is linear in the number of transitions
+- a DFA must stay complete, so all transitions into useless states are redirected to one remaining sink state
+'''
+
+# All nodes reachable from `sources` by following `edges`
+def reachable(sources: Iterable[Hashable],
+              edges: Mapping[Hashable, Iterable[Hashable]]) -> set[Hashable]:
+    seen = set(sources)
+    stack = list(seen)
+    while stack:
+        for node in edges.get(stack.pop(), ()):
+            if node not in seen:
+                seen.add(node)
+                stack.append(node)
+    return seen
+
+# Forward and backward adjacency of a transition function, ignoring letters
+def adjacency(items: Iterable[tuple[tuple[str, str], Iterable[str]]]) -> tuple[dict[str, set[str]], dict[str, set[str]]]:
+    forward = {}
+    backward = {}
+    for (state, _), next_states in items:
+        for next_state in next_states:
+            forward.setdefault(state, set()).add(next_state)
+            backward.setdefault(next_state, set()).add(state)
+    return forward, backward
+
+# Useful states in len-lex order, as well as all reachable states
+def useful_states(items: Iterable[tuple[tuple[str, str], Iterable[str]]],
+                  start: str,
+                  accept: Iterable[str]) -> tuple[tuple[str, ...], set[str]]:
+    forward, backward = adjacency(items)
+    forward_reach = reachable({start}, forward)
+    backward_reach = reachable(set(accept) & forward_reach, backward)
+    return sort_states(forward_reach & backward_reach), forward_reach
+
+
+def _trim_dfa(transition: TransitionDFA,
+              start: str,
+              accept: Iterable[str]) -> tuple[dict[tuple[str, str], str], str, set[str]]:
+    accept = set(accept)
+    items = [(key, (next_state,)) for key, next_state in transition.items()]
+    useful, forward_reach = useful_states(items, start, accept)
+    if start not in useful: # Empty language, so only a single sink start state is needed
+        return {(start, letter): start for letter in transition.alphabet}, start, set()
+    dead = sort_states(forward_reach.difference(useful))
+    sink = dead[0] if dead else None # Reuse name of a dead state, e.g. '{}' from subset construction
+    keep = set(useful)
+    new_transition = {}
+    for state in useful:
+        for letter in transition.alphabet:
+            next_state = transition[(state, letter)]
+            new_transition[(state, letter)] = next_state if next_state in keep else sink
+    if sink is not None:
+        for letter in transition.alphabet:
+            new_transition[(sink, letter)] = sink
+    return new_transition, start, accept & keep
+
+
+def _trim_nfa(transition: TransitionNFA,
+              start: str,
+              accept: Iterable[str]) -> tuple[dict[tuple[str, str], tuple[str, ...]], str, set[str]]:
+    accept = set(accept)
+    useful, _ = useful_states(transition.items(), start, accept)
+    keep = set(useful)
+    new_transition = {}
+    for (state, letter), next_states in transition.items():
+        if state not in keep:
+            continue
+        next_states = tuple(next_state for next_state in next_states if next_state in keep)
+        if next_states:
+            new_transition[(state, letter)] = next_states
+    states = useful if useful else (start,) # Start state is always kept, even if nothing is accepted
+    new_transition = pad_transition_nfa(new_transition, states, transition.alphabet)
+    return new_transition, start, accept & keep
@@ -0,0 +1,88 @@
+from autolang.backend.utils import sort_states
+from autolang.backend.regex.regex_ast import RegexNode, Epsilon, alphabet_of_node
+from autolang.backend.regex.derivatives import concat_of, repeat_rest, nullable, evaluate, dependencies
+from autolang.backend.machines.structs_transition import pad_transition_nfa
+
+'''
+Antimirov partial-derivative construction of an NFA from a regex AST, called by `regex_to_nfa()`
+- instead of one derivative per letter (see derivatives.py), R has a *set* of partial derivatives per letter,
+  whose union is the Brzozowski derivative
+- these are read off the linear form lf(R), i.e. the set of pairs (a, T) such that R = a.T1 + a.T2 + ... (+ ε if nullable):
+    - lf(a) = {(a, ε)}, and lf(ε) = lf(∅) = {}
+    - lf(R + S) = lf(R) ∪ lf(S)
+    - lf(R.S) = {(a, T.S) : (a, T) in lf(R)}, together with lf(S) if R is nullable
+    - lf(R*) = {(a, T.R*) : (a, T) in lf(R)}
+    - lf([abc]) = {(a, ε), (b, ε), (c, ε)}, so a character class adds no more states than a single letter
+    - lf(R{m,n}) = {(a, T.R{m-1,n-1}) : (a, T) in lf(R)}, see `repeat_rest()`
+- NFA states are the partial derivatives reachable from R, at most |regex letters| + 1 of them, with no ε-transitions
+    - a state accepts iff its term is nullable
+- terms are hash-consed AST nodes, so shared subterms are only expanded once, and linear forms are memoised per node
+- states are named 'd0' for R itself, then 'd1', 'd2', ... in order of discovery
+'''
+
+# Object that builds the partial-derivative NFA transition function from a regex AST
+class ConstructAntimirov:
+
+    def __init__(self, tree: RegexNode):
+        self.tree = tree
+        self.nullable = {} # node: nullable
+        self.linear_forms = {} # node: frozenset of (letter, term)
+        self.names = {} # term: state name
+        self.start = 'd0'
+        self.accept = set()
+
+    # Linear form of `node`, memoised for every subterm reached
+    def linear_form(self, node: RegexNode) -> frozenset[tuple[str, RegexNode]]:
+        nullable(node, self.nullable) # Fill nullable memo for every subterm
+        memo = self.linear_forms
+        def combine(n):
+            kind = n.kind
+            if kind == 'symbol':
+                return frozenset({(n.letter, Epsilon())})
+            if kind == 'class':
+                return frozenset((letter, Epsilon()) for letter in n.letters)
+            if kind in ('epsilon', 'empty'):
+                return frozenset()
+            if kind == 'star':
+                return frozenset((letter, concat_of(term, n)) for letter, term in memo[n.children[0]])
+            if kind == 'repeat':
+                rest = repeat_rest(n)
+                return frozenset((letter, concat_of(term, rest)) for letter, term in memo[n.children[0]])
+            left, right = n.children
+            if kind == 'union':
+                return memo[left] | memo[right]
+            result = {(letter, concat_of(term, right)) for letter, term in memo[left]}
+            if self.nullable[left]:
+                result.update(memo[right])
+            return frozenset(result)
+        return evaluate(node, memo, lambda n: n, lambda n: dependencies(n, self.nullable, True), combine)
+
+    # Name of `term`, adding it as a new state if unseen
+    def name(self, term: RegexNode, queue: list[RegexNode]) -> str:
+        if term not in self.names:
+            self.names[term] = 'd' + str(len(self.names))
+            queue.append(term)
+        return self.names[term]
+
+    def construct(self) -> dict[tuple[str, str], tuple[str, ...]]:
+        transition = {}
+        strings = {} # Stable sort key of each term, so that state names do not depend on node serials
+        queue = []
+        self.name(self.tree, queue)
+        i = 0
+        while i < len(queue): # Breadth-first, so names follow order of discovery
+            term = queue[i]
+            i += 1
+            state = self.names[term]
+            if nullable(term, self.nullable):
+                self.accept.add(state)
+            targets = {}
+            for letter, next_term in self.linear_form(term):
+                targets.setdefault(letter, []).append(next_term)
+            for letter in sorted(targets):
+                next_terms = targets[letter]
+                if len(next_terms) > 1:
+                    next_terms.sort(key=lambda t: strings.setdefault(t, str(t)))
+                transition[(state, letter)] = sort_states(self.name(next_term, queue) for next_term in next_terms)
+        states = [self.names[term] for term in queue]
+        return pad_transition_nfa(transition, states, alphabet_of_node(self.tree)) # Keep letters only under ∅, as Thompson does
@@ -0,0 +1,93 @@
+from autolang.backend.regex.settings_regex import DEFAULT_COMPILE_CACHE_SIZE
+from autolang.backend.regex.disk_cache import DiskCache
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from threading import Lock
+import copy
+
+'''
+Process-wide LRU cache of machines built by `regex_to_nfa()` and `regex_to_dfa()`
+- keys are the kind of machine, the whitespace-normalised regex, and every construction option
+- when full, the least recently used machine is evicted
+- the cached machine is never handed out itself, since `start` and `accept` can be reassigned or changed in place
+    - every call returns a shallow copy instead, see `DFA.__copy__()` and `NFA.__copy__()`
+    - the copy shares the transition function, which is read-only, so a hit costs O(accept states) rather than a rebuild
+- access is guarded by a lock, so the cache can be shared between threads
+    - building happens outside the lock, so two threads missing on the same key may both build it, which is harmless
+- if a `DiskCache` is set, it is checked after a memory miss and before building, and every built machine is written to it
+'''
+
+class CompileCache:
+
+    def __init__(self, maxsize: int = DEFAULT_COMPILE_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError('Argument \'maxsize\' must be positive.')
+        self.maxsize = maxsize
+        self.machines = OrderedDict() # key: machine, least recently used first
+        self.disk = None # Optional `DiskCache`, see disk_cache.py
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f'<CompileCache with {len(self.machines)} of {self.maxsize} machines>'
+
+    # Return a shallow copy of the machine for `key`, calling `build()` to make it on a miss
+    def lookup(self, key: Hashable, build: Callable[[], object]) -> object:
+        with self.lock:
+            machine = self.machines.get(key)
+            if machine is not None:
+                self.machines.move_to_end(key)
+                self.hits += 1
+                return copy.copy(machine)
+            self.misses += 1
+        disk = self.disk # Read once, in case another thread calls `set_disk_cache()` meanwhile
+        machine = disk.load(key) if disk is not None else None
+        if machine is None:
+            machine = build()
+            if disk is not None:
+                disk.store(key, machine)
+        with self.lock:
+            self.machines[key] = machine
+            self.machines.move_to_end(key)
+            while len(self.machines) > self.maxsize:
+                self.machines.popitem(last=False)
+        return copy.copy(machine)
+
+    # Statistics about cache usage
+    def cache_info(self) -> dict[str, int]:
+        disk = self.disk
+        with self.lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'size': len(self.machines),
+                    'maxsize': self.maxsize,
+                    'disk_hits': disk.hits if disk is not None else 0}
+
+    def clear(self) -> None:
+        with self.lock:
+            self.machines.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+compile_cache = CompileCache()
+
+# Cache key for a regex, ignoring spaces as `RegexParserInput` does
+# NOTE a regex of only spaces is invalid, unlike '', so it is left as it is
+def normalise_regex(regex: str) -> str:
+    return regex.replace(' ', '') or regex
+
+# Statistics of the process-wide cache
+def cache_info() -> dict[str, int]:
+    return compile_cache.cache_info()
+
+# Empty the process-wide cache and reset its statistics
+# NOTE the disk cache, if any, is left as it is, see `DiskCache.clear()`
+def clear_cache() -> None:
+    compile_cache.clear()
+
+# Use a persistent cache at `path` as well, which is a SQLite file or a directory to create one in, or stop if None
+def set_disk_cache(path: str | None) -> None:
+    compile_cache.disk = DiskCache(path) if path is not None else None
@@ -0,0 +1,157 @@
+from autolang.backend.regex.regex_ast import RegexNode, alphabet_of_node
+from autolang.backend.regex.derivatives import evaluate
+from autolang.backend.machines.dfa_minimise import minimise_int
+from autolang.backend.machines.nfa_bitset import bits_of
+
+from collections.abc import Callable, Hashable
+
+'''
+Compositional construction of the minimal DFA of a regex AST, called by `regex_to_dfa()`
+- instead of one big NFA and one big subset construction, every subtree is built bottom-up as its own minimal DFA:
+    - letters, classes, ε and ∅ are written down directly
+    - union: product construction of the two children, accepting if either component does
+    - concat: pairs (p, S) of a state p of the left child and a set S of states of the right child, entered whenever p accepts
+    - star: sets of states of the child, restarting the child whenever an accept state is reached
+    - repetition R{m,n}: m copies of R concatenated one at a time, followed by n-m copies of (ε+R), or by R* if unbounded
+- each result is minimised by Hopcroft's algorithm straight away, see dfa_minimise.py, so no intermediate DFA is much larger
+  than the minimal DFA of its subtree
+    - the dead state of a child is left out of the sets above, which keeps the unminimised products smaller still
+- all DFAs are complete over the alphabet of the whole regex, with states 0, 1, 2, ... and start state 0
+- shared subtrees of the AST are only built once, since results are memoised by node
+'''
+
+# `(delta, accept)` of a complete DFA with start state 0, see dfa_minimise.py
+IntDFA = tuple[list[tuple[int, ...]], list[bool]]
+
+# Object that builds the minimal DFA of a regex AST, one subtree at a time
+class ConstructCompositional:
+
+    def __init__(self, tree: RegexNode):
+        self.tree = tree
+        self.alphabet = sorted(alphabet_of_node(tree))
+        self.memo = {} # node: (delta, accept) of its minimal DFA
+        self.largest = 0 # Most states in any DFA before minimisation, to see how big intermediate results get
+
+    # Minimal DFA of the states reachable from `start` under `step`, where states are any hashable keys
+    def explore(self,
+                start: Hashable,
+                step: Callable[[Hashable], tuple[Hashable, ...]],
+                accepting: Callable[[Hashable], bool]) -> IntDFA:
+        index = {start: 0}
+        keys = [start]
+        delta = []
+        i = 0
+        while i < len(keys):
+            next_states = []
+            for next_key in step(keys[i]):
+                if next_key not in index:
+                    index[next_key] = len(keys)
+                    keys.append(next_key)
+                next_states.append(index[next_key])
+            delta.append(tuple(next_states))
+            i += 1
+        self.largest = max(self.largest, len(keys))
+        return minimise_int(delta, 0, [accepting(key) for key in keys])
+
+    # DFA accepting exactly the single letters in `letters`, or only the empty word if `letters` is None
+    def atom(self, letters: set[str] | None) -> IntDFA:
+        k = len(self.alphabet)
+        if letters is None:
+            return self.explore(0, lambda state: (1,) * k, lambda state: state == 0)
+        first = tuple(1 if letter in letters else 2 for letter in self.alphabet)
+        return self.explore(0, lambda state: first if state == 0 else (2,) * k, lambda state: state == 1)
+
+    # Non-accepting states with only self-loops, of which a minimal DFA has at most one
+    @staticmethod
+    def dead_mask(dfa: IntDFA) -> int:
+        delta, accept = dfa
+        dead = 0
+        for state, next_states in enumerate(delta):
+            if not accept[state] and all(next_state == state for next_state in next_states):
+                dead |= 1 << state
+        return dead
+
+    # Image of a set of states under each letter, as bitmasks
+    @staticmethod
+    def image(delta: list[tuple[int, ...]], mask: int, keep: int) -> list[int]:
+        images = [0] * (len(delta[0]) if delta else 0)
+        for state in bits_of(mask):
+            for i, next_state in enumerate(delta[state]):
+                images[i] |= 1 << next_state
+        return [image & keep for image in images]
+
+    def union(self, left: IntDFA, right: IntDFA) -> IntDFA:
+        (delta1, accept1), (delta2, accept2) = left, right
+        return self.explore((0, 0),
+                            lambda key: tuple(zip(delta1[key[0]], delta2[key[1]])),
+                            lambda key: accept1[key[0]] or accept2[key[1]])
+
+    def concat(self, left: IntDFA, right: IntDFA) -> IntDFA:
+        delta1, accept1 = left
+        delta2, accept2 = right
+        keep = ((1 << len(delta2)) - 1) & ~self.dead_mask(right)
+        accept_mask = sum(1 << state for state, flag in enumerate(accept2) if flag)
+        entry = 1 & keep # Start state of the right child, unless it is dead
+        def step(key):
+            state, mask = key
+            images = self.image(delta2, mask, keep)
+            return tuple((next_state, image | entry if accept1[next_state] else image)
+                         for next_state, image in zip(delta1[state], images))
+        start = (0, entry if accept1[0] else 0)
+        return self.explore(start, step, lambda key: bool(key[1] & accept_mask))
+
+    def star(self, child: IntDFA) -> IntDFA:
+        delta, accept = child
+        keep = ((1 << len(delta)) - 1) & ~self.dead_mask(child)
+        accept_mask = sum(1 << state for state, flag in enumerate(accept) if flag)
+        entry = 1 & keep
+        # Start is -1, which behaves as the child's start state {0} but also accepts the empty word
+        def step(mask):
+            images = self.image(delta, 1 if mask == -1 else mask, keep)
+            return tuple(image | entry if image & accept_mask else image for image in images)
+        return self.explore(-1, step, lambda mask: mask == -1 or bool(mask & accept_mask))
+
+    def repeat(self, child: IntDFA, low: int, high: int | None) -> IntDFA:
+        result = self.atom(None)
+        for _ in range(low):
+            result = self.concat(result, child)
+        if high is None:
+            return self.concat(result, self.star(child))
+        optional = self.union(self.atom(None), child)
+        for _ in range(high - low):
+            result = self.concat(result, optional)
+        return result
+
+    def combine(self, node: RegexNode) -> IntDFA:
+        kind = node.kind
+        memo = self.memo
+        if kind == 'symbol':
+            return self.atom({node.letter})
+        if kind == 'class':
+            return self.atom(set(node.letters))
+        if kind == 'epsilon':
+            return self.atom(None)
+        if kind == 'empty':
+            return self.atom(set())
+        if kind == 'star':
+            return self.star(memo[node.children[0]])
+        if kind == 'repeat':
+            return self.repeat(memo[node.children[0]], node.low, node.high)
+        left, right = (memo[child] for child in node.children)
+        if kind == 'union':
+            return self.union(left, right)
+        if kind == 'concat':
+            return self.concat(left, right)
+        raise ValueError(f'Regex node of kind \'{kind}\' is not recognised.')
+
+    def construct(self) -> IntDFA:
+        return evaluate(self.tree, self.memo, lambda n: n, lambda n: n.children, self.combine)
+
+    # Returns `transition, start, accept` with states 'q0', 'q1', ..., ready to pass to `DFA`
+    def to_dfa_args(self) -> tuple[dict[tuple[str, str], str], str, set[str]]:
+        delta, accept = self.construct()
+        transition = {}
+        for state, next_states in enumerate(delta):
+            for letter, next_state in zip(self.alphabet, next_states):
+                transition[('q' + str(state), letter)] = 'q' + str(next_state)
+        return transition, 'q0', {'q' + str(state) for state, flag in enumerate(accept) if flag}
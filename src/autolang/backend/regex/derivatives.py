@@ -0,0 +1,221 @@
+from autolang.backend.regex.regex_ast import RegexNode, Epsilon, Empty, Union, Concat, Star, repeat_of
+from autolang.backend.regex.regex_input import parse_regex
+from autolang.backend.regex.settings_regex import DEFAULT_DERIVATIVE_CACHE_SIZE
+
+from collections.abc import Callable, Hashable
+
+'''
+Brzozowski derivatives of regexes, and a matcher built on them
+- the derivative of R by letter a matches exactly the words w such that aw is matched by R
+    - so R matches a word iff the derivative by each of its letters in turn is nullable
+- derivatives are normalised by the smart constructors below, so that only finitely many distinct derivatives exist:
+    - union is associative, commutative and idempotent (ACI): terms are flattened, deduplicated and sorted by serial
+    - ∅ is dropped from unions and annihilates concats, ε is dropped from concats
+    - concat is nested to the right, and stars of stars or of ε/∅ are collapsed by `star_of()`, as (R*)* = R* and ε* = ∅* = ε
+        - so the derivatives of (R*)* and (R*){m,n} are just those of R*, and R{m,} counts down to `star_of(R)`
+- the extended syntax needs no expansion:
+    - the derivative of a character class is ε if it contains the letter, and ∅ otherwise
+    - the derivative of R{m,n} is d(R).R{m-1,n-1}, with m-1 floored at 0 and n-1 unbounded if n is, so a count
+      is just decremented and the repeated subtree R stays shared
+- since nodes are hash-consed, normalised derivatives are their own memo keys, and memoising `(regex, letter) -> regex`
+  builds a DFA lazily, one input at a time, whose states are regexes
+- deep regexes are handled with explicit stacks instead of recursion
+'''
+
+# Smart constructors
+
+def union_of(left: RegexNode, right: RegexNode) -> RegexNode:
+    terms = {}
+    stack = [left, right]
+    while stack: # Flatten nested unions on either side, not just the right spine
+        node = stack.pop()
+        if node.kind == 'union':
+            stack.extend(node.children)
+        else:
+            terms[node.serial] = node
+    terms = [terms[serial] for serial in sorted(terms) if terms[serial].kind != 'empty']
+    if not terms:
+        return Empty()
+    node = terms[-1]
+    for term in reversed(terms[:-1]):
+        node = Union(term, node)
+    return node
+
+def concat_of(left: RegexNode, right: RegexNode) -> RegexNode:
+    if left.kind == 'empty' or right.kind == 'empty':
+        return Empty()
+    if left.kind == 'epsilon':
+        return right
+    if right.kind == 'epsilon':
+        return left
+    factors = []
+    while left.kind == 'concat': # Re-nest to the right
+        factors.append(left.children[0])
+        left = left.children[1]
+    node = Concat(left, right)
+    for factor in reversed(factors):
+        node = Concat(factor, node)
+    return node
+
+def star_of(child: RegexNode) -> RegexNode:
+    if child.kind in ('epsilon', 'empty'):
+        return Epsilon()
+    if child.kind == 'star':
+        return child
+    return Star(child)
+
+
+# Remaining copies of repetition R{m,n} after one copy of R has started, i.e. R{m-1,n-1}
+def repeat_rest(node: RegexNode) -> RegexNode:
+    high = None if node.high is None else node.high - 1
+    low = max(node.low - 1, 0)
+    if (low, high) == (0, None): # R{0,} is R*, collapsed if R is itself a star
+        return star_of(node.children[0])
+    return repeat_of(node.children[0], low, high)
+
+
+# Children whose values are needed to compute a value for `node`
+def dependencies(node: RegexNode, nullable: dict[RegexNode, bool], derivative: bool) -> tuple[RegexNode, ...]:
+    if derivative and node.kind == 'concat' and not nullable[node.children[0]]:
+        return node.children[:1] # Right child is only reached if left child can match ε
+    return node.children
+
+# Evaluate `combine` bottom-up over `node`, storing results in `memo` under `key(n)`
+def evaluate(node: RegexNode,
+             memo: dict,
+             key: Callable[[RegexNode], Hashable],
+             deps: Callable[[RegexNode], tuple[RegexNode, ...]],
+             combine: Callable[[RegexNode], object]) -> object:
+    stack = [node]
+    while stack:
+        n = stack[-1]
+        if key(n) in memo:
+            stack.pop()
+            continue
+        missing = [child for child in deps(n) if key(child) not in memo]
+        if missing:
+            stack.extend(missing)
+            continue
+        stack.pop()
+        memo[key(n)] = combine(n)
+    return memo[key(node)]
+
+
+# Whether `node` matches the empty word, memoised in `memo`
+def nullable(node: RegexNode, memo: dict[RegexNode, bool]) -> bool:
+    def combine(n):
+        kind = n.kind
+        if kind in ('epsilon', 'star'):
+            return True
+        if kind in ('symbol', 'empty', 'class'):
+            return False
+        if kind == 'repeat':
+            return n.low == 0 or memo[n.children[0]]
+        left, right = n.children
+        if kind == 'union':
+            return memo[left] or memo[right]
+        return memo[left] and memo[right]
+    return evaluate(node, memo, lambda n: n, lambda n: n.children, combine)
+
+
+# Derivative of `node` by `letter`, memoised in `memo` under `(node, letter)`
+def derivative(node: RegexNode,
+               letter: str,
+               memo: dict[tuple[RegexNode, str], RegexNode],
+               nullable_memo: dict[RegexNode, bool]) -> RegexNode:
+    nullable(node, nullable_memo) # Fill nullable memo for every subterm that the derivative might need
+    def combine(n):
+        kind = n.kind
+        if kind == 'symbol':
+            return Epsilon() if n.letter == letter else Empty()
+        if kind == 'class':
+            return Epsilon() if letter in n.letters else Empty()
+        if kind in ('epsilon', 'empty'):
+            return Empty()
+        if kind == 'star':
+            child = n.children[0]
+            if star_of(child) is child: # (R*)* is R*, so has the same derivative
+                return memo[(child, letter)]
+            return concat_of(memo[(child, letter)], star_of(child))
+        if kind == 'repeat':
+            child = n.children[0]
+            if star_of(child) is child: # (R*){m,n} is R* for any n > 0
+                return memo[(child, letter)]
+            return concat_of(memo[(child, letter)], repeat_rest(n))
+        left, right = n.children
+        if kind == 'union':
+            return union_of(memo[(left, letter)], memo[(right, letter)])
+        result = concat_of(memo[(left, letter)], right)
+        if nullable_memo[left]:
+            result = union_of(result, memo[(right, letter)])
+        return result
+    return evaluate(node, memo, lambda n: (n, letter), lambda n: dependencies(n, nullable_memo, True), combine)
+
+
+class RegexMatcher:
+    '''
+    Decide membership of words in a regex without building any automaton up front
+    - each word is matched by taking derivatives letter by letter, see module docstring
+    - derivatives are memoised across calls, so repeated queries reuse the states and transitions already explored
+    - the memo is flushed entirely once it reaches `cache_size` entries, as for `LazyDFA`
+    '''
+
+    def __init__(self,
+                 regex: str | RegexNode,
+                 cache_size: int = DEFAULT_DERIVATIVE_CACHE_SIZE):
+        if isinstance(regex, RegexNode):
+            self.tree = regex
+        else:
+            try:
+                self.tree = parse_regex(regex)
+            except SyntaxError:
+                raise ValueError(f'Input regex \'{regex}\' is invalid. Please check regex syntax.')
+        if cache_size < 1:
+            raise ValueError('Argument \'cache_size\' must be positive.')
+        self.regex = regex
+        self.cache_size = cache_size
+        self.cache = {} # (regex, letter): derivative, for every subterm reached
+        self.nullable_cache = {}
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+
+    def __repr__(self):
+        return f'<RegexMatcher for \'{self.tree}\' with {len(self.cache)} cached derivatives>'
+
+    # Derivative of `node` by `letter`, using and filling the memo
+    def step(self, node: RegexNode, letter: str) -> RegexNode:
+        result = self.cache.get((node, letter))
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = derivative(node, letter, self.cache, self.nullable_cache)
+        # One derivative can memoise many subterms, so the budget is checked after computing it
+        if len(self.cache) > self.cache_size: # Out of budget, so start again with only this result
+            self.clear_cache()
+            self.flushes += 1
+            self.cache[(node, letter)] = result
+        return result
+
+    # Read `word` one letter at a time, stopping early once the derivative is ∅
+    def accepts(self, word: str) -> bool:
+        node = self.tree
+        for letter in word:
+            node = self.step(node, letter)
+            if node.kind == 'empty': # Nothing can be matched any more
+                return False
+        return nullable(node, self.nullable_cache)
+
+    # Statistics about cache usage
+    def cache_info(self) -> dict[str, int]:
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'flushes': self.flushes,
+                'size': len(self.cache),
+                'maxsize': self.cache_size}
+
+    # Drop all memoised derivatives, e.g. to free memory
+    def clear_cache(self) -> None:
+        self.cache.clear()
+        self.nullable_cache.clear()
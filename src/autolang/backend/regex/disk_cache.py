@@ -0,0 +1,154 @@
+from autolang.backend.machines.dfa import DFA
+from autolang.backend.machines.nfa import NFA
+
+from collections.abc import Hashable
+from contextlib import closing
+from array import array
+import hashlib
+import json
+import os
+import sqlite3
+from threading import Lock
+
+from importlib.metadata import version, PackageNotFoundError
+
+try:
+    AUTOLANG_VERSION = version('autolang')
+except PackageNotFoundError: # Running from source without installing
+    AUTOLANG_VERSION = 'unknown'
+
+'''
+Opt-in persistent cache of machines built by `regex_to_nfa()` and `regex_to_dfa()`, stored in a single SQLite file
+- enabled with `regex_to_dfa.set_disk_cache(path)`, where `path` is a SQLite file, or a directory to create one in
+- an entry's key is the sha256 of the in-memory cache key (kind, regex, options), the autolang version and the format version
+    - so upgrading autolang, or changing the encoding below, never loads stale machines
+- machines are stored as compact binary tables, not pickles:
+    - states and alphabet are interned to ints, and only the names, start and accept are kept as JSON
+    - DFA: one `array('i')` of next state indices, row-major over (state, letter)
+    - NFA: CSR arrays, i.e. for each present (state, letter) entry in turn, its key index, and the offset of its next states in `targets`
+- SQLite handles locking, so several processes can share one file
+    - write-ahead logging lets readers continue while another process writes, and a busy timeout waits out short locks
+    - writes use `INSERT OR REPLACE`, so two processes building the same machine at once both succeed
+- the cache is only an optimisation, so any SQLite error while loading or storing (e.g. a locked, full or corrupt file),
+  or a row that fails to decode, is counted in `errors` and treated as a miss, and the machine is built as if there were no disk cache
+'''
+
+FORMAT_VERSION = 1
+DEFAULT_DISK_CACHE_FILE = 'autolang_cache.sqlite3'
+DISK_CACHE_TIMEOUT = 30 # Seconds to wait for another process to release a lock
+# Raised by `decode()` on corrupt or truncated rows, incl. `json.JSONDecodeError` which is a ValueError
+DECODE_ERRORS = (ValueError, TypeError, KeyError, IndexError)
+
+# Encode machine as (kind, meta JSON, table bytes, offsets bytes)
+def encode(machine: DFA | NFA) -> tuple[str, str, bytes, bytes]:
+    states = list(machine.states) if isinstance(machine, DFA) else list(machine.transition.states)
+    alphabet = list(machine.alphabet) if isinstance(machine, DFA) else list(machine.transition.alphabet) + ['']
+    state_index = {state: i for i, state in enumerate(states)}
+    meta = {'states': states,
+            'alphabet': alphabet,
+            'start': state_index[machine.start],
+            'accept': sorted(state_index[state] for state in machine.accept)}
+    if isinstance(machine, DFA):
+        table = array('i', (state_index[machine.transition[(state, letter)]] for state in states for letter in alphabet))
+        return 'dfa', json.dumps(meta), table.tobytes(), b''
+    letter_index = {letter: k for k, letter in enumerate(alphabet)}
+    keys = array('i')
+    offsets = array('i', [0])
+    targets = array('i')
+    for (state, letter), next_states in machine.transition.items():
+        keys.append(state_index[state] * len(alphabet) + letter_index[letter])
+        targets.extend(state_index[next_state] for next_state in next_states)
+        offsets.append(len(targets))
+    meta['keys'] = len(keys)
+    return 'nfa', json.dumps(meta), (keys + targets).tobytes(), offsets.tobytes()
+
+# Rebuild machine from output of `encode()`
+def decode(kind: str, meta: str, table: bytes, offsets: bytes) -> DFA | NFA:
+    meta = json.loads(meta)
+    states = meta['states']
+    alphabet = meta['alphabet']
+    start = states[meta['start']]
+    accept = {states[i] for i in meta['accept']}
+    values = array('i')
+    values.frombytes(table)
+    if kind == 'dfa':
+        m = len(alphabet)
+        transition = {(state, letter): states[values[i * m + k]]
+                      for i, state in enumerate(states) for k, letter in enumerate(alphabet)}
+        return DFA(transition, start, accept)
+    bounds = array('i')
+    bounds.frombytes(offsets)
+    num_keys = meta['keys']
+    keys, targets = values[:num_keys], values[num_keys:]
+    m = len(alphabet)
+    transition = {}
+    for n, key in enumerate(keys):
+        i, k = divmod(key, m)
+        transition[(states[i], alphabet[k])] = tuple(states[j] for j in targets[bounds[n]:bounds[n + 1]])
+    return NFA(transition, start, accept)
+
+
+class DiskCache:
+
+    def __init__(self, path: str):
+        if os.path.isdir(path):
+            path = os.path.join(path, DEFAULT_DISK_CACHE_FILE)
+        self.path = path
+        self.lock = Lock() # Guards the statistics below, which threads sharing the cache all update
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        with closing(self.connect()) as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            with connection:
+                connection.execute('CREATE TABLE IF NOT EXISTS machines ('
+                                   'key TEXT PRIMARY KEY, kind TEXT NOT NULL, meta TEXT NOT NULL, '
+                                   '"table" BLOB NOT NULL, offsets BLOB NOT NULL)')
+
+    def __repr__(self):
+        return f'<DiskCache at \'{self.path}\'>'
+
+    # New connection for each operation, so the cache is safe to use after forking and across threads
+    def connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=DISK_CACHE_TIMEOUT)
+
+    # Stable hash of in-memory key together with versions
+    @staticmethod
+    def digest(key: Hashable) -> str:
+        return hashlib.sha256(repr((key, AUTOLANG_VERSION, FORMAT_VERSION)).encode()).hexdigest()
+
+    # Stored machine for `key`, or None if absent
+    def load(self, key: Hashable) -> DFA | NFA | None:
+        try:
+            with closing(self.connect()) as connection:
+                row = connection.execute('SELECT kind, meta, "table", offsets FROM machines WHERE key = ?',
+                                         (self.digest(key),)).fetchone()
+            machine = decode(*row) if row is not None else None
+        except (sqlite3.Error, *DECODE_ERRORS):
+            with self.lock:
+                self.errors += 1
+                self.misses += 1
+            return None
+        with self.lock:
+            if machine is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return machine
+
+    # Write machine for `key`, silently skipped if the file cannot be written to
+    def store(self, key: Hashable, machine: DFA | NFA) -> None:
+        try:
+            with closing(self.connect()) as connection:
+                with connection:
+                    connection.execute('INSERT OR REPLACE INTO machines VALUES (?, ?, ?, ?, ?)',
+                                       (self.digest(key), *encode(machine)))
+        except sqlite3.Error:
+            with self.lock:
+                self.errors += 1
+
+    # Delete every stored machine
+    def clear(self) -> None:
+        with closing(self.connect()) as connection:
+            with connection:
+                connection.execute('DELETE FROM machines')
@@ -0,0 +1,47 @@
+from autolang.backend.regex.regex_ast import RegexNode, alphabet_of_node
+from autolang.backend.regex.regex_input import parse_regex
+from autolang.backend.regex.derivatives import derivative, nullable
+
+from collections import deque
+
+'''
+Equivalence of regexes by bisimulation over Brzozowski derivatives
+- two regexes match the same words iff they agree on nullability, and for every letter their derivatives are again equivalent
+- so pairs of derivatives are explored breadth-first from the pair of input regexes, and the first pair that disagrees on
+  nullability gives a shortest distinguishing word
+- derivatives are normalised and hash-consed (see derivatives.py), so there are finitely many pairs, and a pair of
+  identical nodes is equivalent without exploring further
+- this only ever builds the parts of the two derivative DFAs that are reached together, with no NFA or subset construction
+'''
+
+# Shortest word matched by exactly one of the two regexes, or None if they are equivalent
+def distinguishing_word(tree1: RegexNode, tree2: RegexNode) -> str | None:
+    alphabet = sorted(set(alphabet_of_node(tree1)) | set(alphabet_of_node(tree2)))
+    memo = {} # Derivatives are shared between both regexes
+    nullable_memo = {}
+    seen = {(tree1, tree2)}
+    queue = deque([(tree1, tree2, '')])
+    while queue:
+        node1, node2, word = queue.popleft()
+        if node1 is node2:
+            continue # Identical regexes
+        if nullable(node1, nullable_memo) != nullable(node2, nullable_memo):
+            return word
+        for letter in alphabet:
+            pair = (derivative(node1, letter, memo, nullable_memo), derivative(node2, letter, memo, nullable_memo))
+            if pair not in seen:
+                seen.add(pair)
+                queue.append((*pair, word + letter))
+    return None
+
+# Returns True if the regexes match exactly the same words, otherwise a shortest word matched by only one of them
+# NOTE the word may be '', so compare the result with `is True` rather than by truthiness
+def regex_equivalent(regex1: str, regex2: str) -> bool | str:
+    trees = []
+    for regex in (regex1, regex2):
+        try:
+            trees.append(parse_regex(regex))
+        except SyntaxError:
+            raise ValueError(f'Input regex \'{regex}\' is invalid. Please check regex syntax.')
+    word = distinguishing_word(*trees)
+    return True if word is None else word
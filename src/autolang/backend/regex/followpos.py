@@ -0,0 +1,64 @@
+from autolang.backend.regex.regex_ast import RegexNode
+from autolang.backend.regex.positions import Positions
+from autolang.backend.machines.nfa_bitset import bits_of
+
+'''
+Direct construction of a DFA from a regex AST via followpos (Aho, Sethi, Ullman), called by `regex_to_dfa()`
+- the regex is augmented with an end marker, i.e. R becomes R.#, and # is given the free position 0, see positions.py
+    - so 0 is in first(R.#) if R is nullable, and in follow(p) if p is in last(R)
+- DFA states are sets of positions, stored as int bitmasks, starting from first(R.#)
+- reading letter a from set S goes to the union of follow(p) over positions p in S holding a
+- a set is an accept state iff it contains the end marker 0
+- no intermediate NFA, ε-closure, or sorting of subsets is needed
+'''
+
+# Object that handles the followpos construction of a DFA from a regex AST
+class ConstructFollowpos:
+
+    def __init__(self, tree: RegexNode):
+        self.tree = tree
+        self.positions = Positions(tree)
+        self.alphabet = self.positions.alphabet
+        self.follow = list(self.positions.follow) # Augmented with end marker
+        for position in bits_of(self.positions.last):
+            self.follow[position] |= 1
+        self.start_mask = self.positions.first | int(self.positions.nullable)
+
+    # Encode set of positions as a state name, e.g. '{0,2,3}', in the same style as subset construction
+    @staticmethod
+    def mask_to_str(mask: int) -> str:
+        return '{' + ','.join(str(position) for position in bits_of(mask)) + '}'
+
+    # Successor sets of `mask` for each letter of the alphabet, with missing letters going to the empty set
+    def step(self, mask: int) -> dict[str, int]:
+        next_masks = dict.fromkeys(self.alphabet, 0)
+        for letter, positions in self.positions.by_letter(mask & ~1).items(): # End marker reads no letter
+            for position in bits_of(positions):
+                next_masks[letter] |= self.follow[position]
+        return next_masks
+
+    # Explore all position sets reachable from the start, returning transitions on masks
+    def construct(self) -> dict[tuple[int, str], int]:
+        transition = {}
+        visited = {self.start_mask}
+        queue = [self.start_mask]
+        while queue:
+            mask = queue.pop()
+            for letter, next_mask in self.step(mask).items():
+                transition[(mask, letter)] = next_mask
+                if next_mask not in visited:
+                    visited.add(next_mask)
+                    queue.append(next_mask)
+        return transition
+
+    # Returns `transition, start, accept` with string state names, ready to pass to `DFA`
+    def to_dfa_args(self) -> tuple[dict[tuple[str, str], str], str, set[str]]:
+        mask_transition = self.construct()
+        names = {}
+        for (mask, _), next_mask in mask_transition.items():
+            for m in (mask, next_mask):
+                if m not in names:
+                    names[m] = self.mask_to_str(m)
+        transition = {(names[mask], letter): names[next_mask] for (mask, letter), next_mask in mask_transition.items()}
+        accept = {name for mask, name in names.items() if mask & 1}
+        return transition, self.mask_to_str(self.start_mask), accept
@@ -0,0 +1,34 @@
+from autolang.backend.regex.regex_ast import RegexNode
+from autolang.backend.regex.positions import Positions
+from autolang.backend.machines.nfa_bitset import bits_of
+from autolang.backend.machines.structs_transition import pad_transition_nfa
+
+'''
+Glushkov (position automaton) construction of an NFA from a regex AST, called by `regex_to_nfa()`
+- one state 'q0' for the start, and one state 'qi' for each position i, so |regex letters| + 1 states in total
+- reading letter a from 'q0' goes to every position in first(regex) holding a, and from 'qi' to every position in follow(i) holding a
+- 'qi' accepts if i is in last(regex), and 'q0' accepts if the regex is nullable
+- there are no ε-transitions at all, and every transition into 'qi' reads the letter at position i
+    - or one of the letters, if position i is a character class, so a class only ever adds a single state
+'''
+
+# Object that builds the Glushkov NFA transition function from a regex AST
+class ConstructGlushkov:
+
+    def __init__(self, tree: RegexNode):
+        self.tree = tree
+        self.positions = Positions(tree)
+        self.states = ['q' + str(i) for i in range(len(self.positions.letters))]
+        self.start = 'q0'
+        self.accept = {self.states[i] for i in bits_of(self.positions.last)}
+        if self.positions.nullable:
+            self.accept.add(self.start)
+
+    def construct(self) -> dict[tuple[str, str], tuple[str, ...]]:
+        transition = {}
+        # Position 0 is the start state, whose successors are the first positions
+        successors = [self.positions.first] + self.positions.follow[1:]
+        for i, mask in enumerate(successors):
+            for letter, targets in self.positions.by_letter(mask).items():
+                transition[(self.states[i], letter)] = tuple(self.states[j] for j in bits_of(targets))
+        return pad_transition_nfa(transition, self.states, self.positions.alphabet)
@@ -1,6 +1,8 @@
-from autolang.backend.regex.regex_input import alphabet_of
+from autolang.backend.regex.regex_input import alphabet_of, EPSILON, EMPTY
+from autolang.backend.regex.regex_ast import RegexNode, Epsilon, alphabet_of_node
 from autolang.backend.regex.regex_eliminate import RegexParserEliminate
 from autolang.backend.machines.nfa import NFA
+from autolang.backend.machines.structs_transition import pad_transition_nfa
 
 class GNFA:
 
@@ -10,12 +12,14 @@ class GNFA:
     Also, GNFA edges can be labelled by arbitrary strings, not just letters from the alphabet.
     Aside from that the structure is more or less the same as that of the NFA. 
     Instead of methods for computing input words, it has methods for iteratively eliminating compound edge-labels.
+    Labels are either preprocessed regex strings, or AST nodes from `RegexParserInput.parse()`.
+    AST labels are split by reading their children, so no substring is ever re-parsed.
     '''
 
-    def __init__(self, regex: str):
+    def __init__(self, regex: str | RegexNode):
         self.regex = regex # NOTE regex is already preprocessed and assumed valid when passed here
         self.states = ['s0', 't'] # Only start and accept states initially
-        self.alphabet = alphabet_of(regex)
+        self.alphabet = alphabet_of_node(regex) if isinstance(regex, RegexNode) else alphabet_of(regex)
         self.edges = [('s0', 't', regex)] # Encode edges as (first state, second state, label)
         self.start = 's0'
         self.accept = 't'
@@ -61,11 +65,19 @@ class GNFA:
         self.edges.remove((state1, state2, original_regex))
         state3 = self.new_state()
         self.states.append(state3)
-        self.edges.append((state1, state3, ''))
-        self.edges.append((state3, state2, ''))
+        epsilon = Epsilon() if isinstance(regex1, RegexNode) else '' # Keep labels of one type
+        self.edges.append((state1, state3, epsilon))
+        self.edges.append((state3, state2, epsilon))
         self.edges.append((state3, state3, regex1))
         return True
 
+    # Elimination type and child labels of a label, in the format of `RegexParserEliminate.parse`
+    @staticmethod
+    def split(regex: str | RegexNode) -> tuple[str, tuple[str | RegexNode, ...]]:
+        if isinstance(regex, RegexNode):
+            return (regex.kind, regex.children) if regex.children else ('primitive', tuple())
+        return RegexParserEliminate.parse(regex) # Call parser on string label
+
     # Run elimination loop until all edges primitive
     def eliminate(self):
         all_primitive = False # If all edges are either letters or empty
@@ -78,7 +90,7 @@ class GNFA:
                 problems, and the parent loop will still terminate only when all edges are primitive.
                 '''
                 state1, state2, regex = edge[0], edge[1], edge[2] # Unpack edge
-                elim_type, regexes = RegexParserEliminate.parse(regex) # Call parser to decide elimination type
+                elim_type, regexes = self.split(regex) # Decide elimination type
                 if elim_type == 'union':
                     seen_operator = True # Flag that another for loop is needed after current one
                     regex1 = regexes[0]
@@ -109,12 +121,19 @@ class GNFA:
         # NOTE next states is initially a list for mutability, then converted to tuple
         transition = {}
         for state1, state2, letter in self.edges:
+            if isinstance(letter, RegexNode):
+                letter = str(letter) # Primitive node is a letter, ε or ∅
             # Ensure no brackets in labels, in case not caught in elimination loop
             letter = RegexParserEliminate.trim_enclosing_brackets(letter) # '(a)' -> 'a'
+            if letter == EMPTY: # Edge that can never be taken
+                continue
+            if letter == EPSILON:
+                letter = ''
             if (state1, letter) in transition:
                 transition[(state1, letter)].append(state2)
             else:
                 transition[(state1, letter)] = [state2]
         transition = {key: tuple(sorted(val)) for key, val in transition.items()} # Convert next_states to tuples
+        transition = pad_transition_nfa(transition, self.states, self.alphabet) # Keep states only joined by ∅-edges
         return NFA(transition, self.start, self.accept) # Create and return NFA
 
@@ -1,5 +1,6 @@
 from autolang.backend.machines.dfa import DFA
 from autolang.backend.machines.nfa import NFA
+from autolang.backend.machines.settings_machines import NFA_COMPILE_MAX_STATES
 from collections.abc import Iterable
 
 # Object that handles subset construction of a DFA from an NFA
@@ -20,21 +21,14 @@ class ConstructDFA:
     # Close list of states by recursively including all epsilon transitions
     def epsilon_closure(self, states: set[str]) -> set[str]:
         '''
-        - Iteratively add states yielded by epsilon-transitions
-        - Use a queue to keep track of paths to explore for new states to add, similar to `NFA.compute()` in nfa.py
+        - Look up the precomputed ε-closure of each state in the compiled NFA, instead of re-exploring ε-transitions for every subset
+        - See `BitsetNFA` in nfa_bitset.py
+        - Large NFAs are not compiled, since precomputing every closure costs more than exploring the ones needed
         '''
-        closure = set(states) # All states to be returned
-        queue = list(states) # Queue of states to explore e-transitions from
-        while queue:
-            current = queue.pop()
-            new_states = self.nfa.transition.get((current, '')) # Get new potential states in closure via nfa ε-transitions, NOTE will return empty list if no transitions (I hope)
-            for new_state in new_states:
-                if new_state in closure:
-                    continue # Nothing to do if state already added, move on to next `new_state` to avoid infinite loops
-                else:
-                    closure.add(new_state)
-                    queue.append(new_state) # Remember to explore new transitions starting at this state
-        return closure
+        if len(self.nfa.states) > NFA_COMPILE_MAX_STATES:
+            return self.nfa.epsilon_closure(states)
+        compiled = self.nfa.compile()
+        return compiled.to_states(compiled.closure(compiled.to_mask(states)))
 
     # Construct temporary transition function of DFA
     def construct(self) -> dict[tuple[tuple[str, ...], str], tuple[str, ...]]:
@@ -94,7 +88,7 @@ class ConstructDFA:
 
 # Carries out state-minimisation to optimise existing DFA
 def minimise_dfa(dfa: DFA) -> DFA:
-    raise NotImplementedError
+    return dfa.minimise()
 
 # Wrapper for above construction
 def nfa_to_dfa(nfa: NFA) -> DFA:
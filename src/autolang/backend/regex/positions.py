@@ -0,0 +1,72 @@
+from autolang.backend.regex.regex_ast import RegexNode, postorder, expand_extended
+from autolang.backend.machines.nfa_bitset import bits_of
+
+'''
+Position sets of a regex, shared by the Glushkov and followpos constructions
+- every occurrence of a letter in the regex is a *position*, numbered 1, 2, 3, ... from left to right
+    - position 0 is left free, for the initial state or end marker of whichever construction uses these sets
+    - shared subtrees of the AST are numbered separately for each occurrence, since they match different parts of a word
+- sets of positions are int bitmasks, with bit i set for position i
+- for each subexpression E:
+    - `nullable`: whether E matches the empty word
+    - `first`: positions that can match the first letter of a word in L(E)
+    - `last`: positions that can match the last letter of a word in L(E)
+- `follow[p]`: positions that can match the letter straight after position p, over the whole regex
+- a character class is a single position holding all of its letters, but each copy of a repetition needs its own positions,
+  so repetitions are expanded first, see `expand_extended()`
+'''
+
+class Positions:
+
+    def __init__(self, tree: RegexNode):
+        self.tree = expand_extended(tree, classes=False)
+        self.letters = [None] # Letters at each position, position 0 unused
+        self.follow = [0]
+        self.nullable, self.first, self.last = self.compute()
+        self.alphabet = sorted({letter for letters in self.letters[1:] for letter in letters})
+
+    # Single bottom-up pass over the AST, filling `letters` and `follow` and returning the sets of the root
+    def compute(self) -> tuple[bool, int, int]:
+        stack = [] # (nullable, first, last) of finished children
+        for node in postorder(self.tree):
+            kind = node.kind
+            if kind in ('symbol', 'class'):
+                position = len(self.letters)
+                self.letters.append(node.letters if kind == 'class' else (node.letter,))
+                self.follow.append(0)
+                bit = 1 << position
+                stack.append((False, bit, bit))
+            elif kind == 'epsilon':
+                stack.append((True, 0, 0))
+            elif kind == 'empty':
+                stack.append((False, 0, 0))
+            elif kind == 'star':
+                _, first, last = stack.pop()
+                self.add_follow(last, first) # Loop back from end to start of child
+                stack.append((True, first, last))
+            else:
+                nullable2, first2, last2 = stack.pop()
+                nullable1, first1, last1 = stack.pop()
+                if kind == 'union':
+                    stack.append((nullable1 or nullable2, first1 | first2, last1 | last2))
+                elif kind == 'concat':
+                    self.add_follow(last1, first2) # End of left child is followed by start of right child
+                    first = first1 | first2 if nullable1 else first1
+                    last = last1 | last2 if nullable2 else last2
+                    stack.append((nullable1 and nullable2, first, last))
+                else:
+                    raise ValueError(f'Regex node of kind \'{kind}\' is not recognised.')
+        return stack[0]
+
+    # Add `targets` to the follow set of every position in `sources`
+    def add_follow(self, sources: int, targets: int) -> None:
+        for position in bits_of(sources):
+            self.follow[position] |= targets
+
+    # Split a set of positions by letter
+    def by_letter(self, mask: int) -> dict[str, int]:
+        groups = {}
+        for position in bits_of(mask):
+            for letter in self.letters[position]:
+                groups[letter] = groups.get(letter, 0) | (1 << position)
+        return groups
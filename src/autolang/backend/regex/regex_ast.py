@@ -0,0 +1,284 @@
+from collections.abc import Iterator
+from weakref import WeakValueDictionary
+from itertools import count
+
+'''
+Abstract syntax tree for regular expressions, built once by `RegexParserInput.parse()` and consumed by every construction
+- nodes are immutable and hash-consed: constructing a node equal to an existing one returns the existing object
+    - so equal subtrees are shared, and structural equality is just identity, which makes nodes cheap dict keys
+    - each node also gets a `serial` number when first created, giving a cheap total order, e.g. for sorting the terms of a union
+- `Union` and `Concat` are binary, and the parser nests them to the right, e.g. 'a+b+c' is `Union(a, Union(b, c))`
+    - this matches the split that `RegexParserEliminate` makes at the leftmost top-level operator
+- long regexes give deep trees, so traversals here are iterative rather than recursive
+- the extended syntax has two more node types, which stay compact instead of being expanded into the core ones:
+    - `Repeat(R, low, high)` for 'R{low,high}', where `high` is None if unbounded, and 'R?' is 'R{0,1}'
+    - `CharClass(letters)` for '[...]', a single atom matching any one of its letters
+    - constructions that need the core types only call `expand_extended()`, which shares the repeated subtree between copies
+'''
+
+# Every live node, keyed by its contents
+_interned = WeakValueDictionary()
+_serials = count()
+
+
+class RegexNode:
+    '''
+    - `kind` names the node type, one of 'symbol', 'epsilon', 'empty', 'union', 'concat', 'star', 'repeat', 'class'
+    - `letter` holds the letter of `Symbol`, the letters of `CharClass`, or the bounds of `Repeat`, and is None otherwise
+    - `children` is empty for leaves
+    - do not construct directly, use the subclasses below
+    '''
+    __slots__ = ('letter', 'children', 'serial', '__weakref__')
+    kind = None
+
+    def __new__(cls, letter: str | None, children: tuple['RegexNode', ...]):
+        key = (cls, letter, children)
+        node = _interned.get(key)
+        if node is None:
+            node = object.__new__(cls)
+            object.__setattr__(node, 'letter', letter)
+            object.__setattr__(node, 'children', children)
+            object.__setattr__(node, 'serial', next(_serials))
+            _interned[key] = node
+        return node
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'\'{type(self).__name__}\' is immutable.')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'\'{type(self).__name__}\' is immutable.')
+
+    # Immutable, so copies can share the original
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __str__(self):
+        return to_string(self)
+
+    def __repr__(self):
+        return f'{type(self).__name__}(\'{to_string(self)}\')'
+
+
+class Symbol(RegexNode):
+    __slots__ = ()
+    kind = 'symbol'
+
+    def __new__(cls, letter: str):
+        return super().__new__(cls, letter, ())
+
+    def __reduce__(self):
+        return (Symbol, (self.letter,))
+
+
+# Regex matching only the empty word, written 'ε'
+# NOTE the empty input regex '' is also parsed to `Epsilon`
+class Epsilon(RegexNode):
+    __slots__ = ()
+    kind = 'epsilon'
+
+    def __new__(cls):
+        return super().__new__(cls, None, ())
+
+    def __reduce__(self):
+        return (Epsilon, ())
+
+
+# Regex matching no words at all, written '∅'
+class Empty(RegexNode):
+    __slots__ = ()
+    kind = 'empty'
+
+    def __new__(cls):
+        return super().__new__(cls, None, ())
+
+    def __reduce__(self):
+        return (Empty, ())
+
+
+class Union(RegexNode):
+    __slots__ = ()
+    kind = 'union'
+
+    def __new__(cls, left: RegexNode, right: RegexNode):
+        return super().__new__(cls, None, (left, right))
+
+    def __reduce__(self):
+        return (Union, self.children)
+
+
+class Concat(RegexNode):
+    __slots__ = ()
+    kind = 'concat'
+
+    def __new__(cls, left: RegexNode, right: RegexNode):
+        return super().__new__(cls, None, (left, right))
+
+    def __reduce__(self):
+        return (Concat, self.children)
+
+
+class Star(RegexNode):
+    __slots__ = ()
+    kind = 'star'
+
+    def __new__(cls, child: RegexNode):
+        return super().__new__(cls, None, (child,))
+
+    def __reduce__(self):
+        return (Star, self.children)
+
+
+# Bounded or unbounded repetition of `child`, see `repeat_of()` for the normalised form the parser builds
+class Repeat(RegexNode):
+    __slots__ = ()
+    kind = 'repeat'
+
+    def __new__(cls, child: RegexNode, low: int, high: int | None):
+        return super().__new__(cls, (low, high), (child,))
+
+    def __reduce__(self):
+        return (Repeat, (self.children[0], *self.letter))
+
+    @property
+    def low(self) -> int:
+        return self.letter[0]
+
+    @property
+    def high(self) -> int | None:
+        return self.letter[1]
+
+
+# Any single letter from `letters`, stored sorted and without repeats
+class CharClass(RegexNode):
+    __slots__ = ()
+    kind = 'class'
+
+    def __new__(cls, letters):
+        return super().__new__(cls, tuple(sorted(set(letters))), ())
+
+    def __reduce__(self):
+        return (CharClass, (self.letter,))
+
+    @property
+    def letters(self) -> tuple[str, ...]:
+        return self.letter
+
+
+# Repetition with trivial cases simplified, e.g. 'R{0,}' is 'R*' and 'R{1,1}' is 'R'
+def repeat_of(child: RegexNode, low: int, high: int | None) -> RegexNode:
+    if high == 0:
+        return Epsilon()
+    if (low, high) == (0, None):
+        return Star(child)
+    if (low, high) == (1, 1):
+        return child
+    return Repeat(child, low, high)
+
+
+# Visit every occurrence of every subtree, children before parents, left to right
+def postorder(node: RegexNode) -> Iterator[RegexNode]:
+    stack = [(node, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded or not node.children:
+            yield node
+        else:
+            stack.append((node, True))
+            for child in reversed(node.children):
+                stack.append((child, False))
+
+
+# Letters occurring in `node`, in order of first occurrence
+def alphabet_of_node(node: RegexNode) -> tuple[str, ...]:
+    alphabet = {}
+    for n in postorder(node):
+        if n.kind == 'symbol':
+            alphabet.setdefault(n.letter)
+        elif n.kind == 'class':
+            for letter in n.letters:
+                alphabet.setdefault(letter)
+    return tuple(alphabet)
+
+
+# Regex string of `node`, with only the brackets needed to re-parse to the same tree
+# Concat is written as an explicit '.' as in preprocessed regexes, or omitted as in input regexes if not `explicit_concat`
+def to_string(node: RegexNode, explicit_concat: bool = True) -> str:
+    dot = '.' if explicit_concat else ''
+    stack = [] # (string, node) of finished children
+    for n in postorder(node):
+        if n.kind == 'symbol':
+            stack.append((n.letter, n))
+            continue
+        if n.kind == 'epsilon':
+            stack.append(('ε', n))
+            continue
+        if n.kind == 'empty':
+            stack.append(('∅', n))
+            continue
+        if n.kind == 'class':
+            letters = sorted(n.letters, key=lambda letter: letter != '-') # Literal '-' goes first so it is not read as a range
+            stack.append(('[' + ''.join(letters) + ']', n))
+            continue
+        if n.kind in ('star', 'repeat'):
+            string, child = stack.pop()
+            if child.kind not in ('symbol', 'class'):
+                string = '(' + string + ')'
+            if n.kind == 'star':
+                suffix = '*'
+            elif (n.low, n.high) == (0, 1):
+                suffix = '?'
+            elif n.low == n.high:
+                suffix = '{' + str(n.low) + '}'
+            else:
+                suffix = '{' + str(n.low) + ',' + ('' if n.high is None else str(n.high)) + '}'
+            stack.append((string + suffix, n))
+            continue
+        right, right_node = stack.pop()
+        left, left_node = stack.pop()
+        if n.kind == 'union':
+            if left_node.kind == 'union':
+                left = '(' + left + ')'
+            stack.append((left + '+' + right, n))
+        else: # concat
+            if left_node.kind in ('union', 'concat'):
+                left = '(' + left + ')'
+            if right_node.kind == 'union':
+                right = '(' + right + ')'
+            stack.append((left + dot + right, n))
+    return stack[0][0]
+
+
+# Equivalent AST using only the core node types, for constructions that need one position or state per letter occurrence
+# Repeated copies share the same child node, and optional copies are nested, e.g. 'R{2,4}' is 'RR(ε+R(ε+R))'
+# Character classes are kept if not `classes`, for constructions that handle them natively
+def expand_extended(node: RegexNode, classes: bool = True) -> RegexNode:
+    memo = {}
+    for n in postorder(node):
+        if n in memo:
+            continue
+        if n.kind == 'class' and classes:
+            letters = n.letters
+            result = Symbol(letters[-1])
+            for letter in reversed(letters[:-1]):
+                result = Union(Symbol(letter), result)
+        elif n.kind == 'repeat':
+            child = memo[n.children[0]]
+            if n.high is None:
+                result = Star(child)
+            else:
+                result = None
+                for _ in range(n.high - n.low): # Optional copies, innermost first
+                    result = Union(Epsilon(), child if result is None else Concat(child, result))
+            for _ in range(n.low): # Required copies
+                result = child if result is None else Concat(child, result)
+            if result is None: # 'R{0,0}'
+                result = Epsilon()
+        elif n.children:
+            result = type(n)(*(memo[child] for child in n.children))
+        else:
+            result = n
+        memo[n] = result
+    return memo[node]
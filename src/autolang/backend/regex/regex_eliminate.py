@@ -18,23 +18,22 @@ class RegexParserEliminate:
         pass
 
     # Remove brackets enclosing entire string, if present
+    # Brackets are matched once up front, so peeling off each layer is constant time and the whole trim is O(n)
     @staticmethod
     def trim_enclosing_brackets(R: str) -> str:
         if R == '': return R # Empty string edge case
-        while R.startswith('(') and R.endswith(')'): # Run loop once for each pair of enclosing brackets
-            depth = 0
-            for i, c in enumerate(R):
-                if c == '(':
-                    depth += 1
-                elif c == ')':
-                    depth -= 1
-                if depth == 0: # If top-level bracket has closed
-                    if i == len(R) - 1: # If top bracket is totally-enclosing
-                        R = R[1:-1] # Trim and return to check for another layer
-                        break
-                    else: # If top bracket doesn't enclose whole string
-                        return R # There can be no other totally-enclosing layers
-        return R
+        match = {} # Position of each '(': position of its ')'
+        stack = []
+        for i, c in enumerate(R):
+            if c == '(':
+                stack.append(i)
+            elif c == ')' and stack:
+                match[stack.pop()] = i
+        start, end = 0, len(R) - 1
+        while start < end and R[start] == '(' and match.get(start) == end: # Outermost bracket encloses whole remaining string
+            start += 1
+            end -= 1
+        return R[start:end + 1]
 
     # Main parse method
     @staticmethod
@@ -1,70 +1,152 @@
+from autolang.backend.regex.regex_ast import RegexNode, Symbol, Epsilon, Empty, Union, Concat, Star, CharClass, repeat_of
+
+from collections.abc import Callable
+
 # Special chars forbidden from being in an alphabet
-OP_CHARS = '()+*. '
+# Machines may still use them as letters, but then cannot be converted by `to_regex()`, see state_elimination.py
+OP_CHARS = '()+*. ε∅[]{}?'
+
+# Literals for the empty word and the empty language, which are atoms but not letters
+EPSILON = 'ε'
+EMPTY = '∅'
 
-# Recursive descent parser to handle input regex and ensure syntax is valid
+# Operator-precedence (shunting-yard) parser to handle input regex, ensure syntax is valid, and build its AST
 class RegexParserInput:
 
     # NOTE this parser will *reejct* the empty regex ''
     # But `is_valid_regex` will not call `RegexParserInput` in this case, so '' is still valid globally
 
     '''
-    Each method below corresponds to a rule in the grammar of the language of regular expressions
+    Single left-to-right pass over the regex, with no recursion, so very long or deeply nested regexes are fine
+    - `operands` holds finished subtrees, and `operators` holds pending binary operators and open brackets
+    - concatenation has no symbol, so it is inserted as the operator '.' whenever an operand follows another operand
+    - '*' is postfix with the highest precedence, so it is applied to the last operand straight away
+    - before pushing a binary operator, pending operators of *strictly* higher precedence are applied
+        - so repeated '+' or concatenation is nested to the right, e.g. 'abc' gives `Concat(a, Concat(b, c))`
+    - `expect_operand` tracks whether the next symbol must start a new operand, which catches every syntax error
+      such as 'a+', '*a', 'a()b' or 'a+*b'
+    - extended syntax, kept as single nodes rather than expanded:
+        - '[...]' is a character class atom, listing letters and ranges 'x-y', e.g. '[a-cx]' matches one of 'a', 'b', 'c', 'x'
+        - 'R{m,n}', 'R{m}' and 'R{m,}' are postfix repetition, and 'R?' is 'R{0,1}'
+        - postfix operators cannot follow each other, e.g. 'a**' and 'a?*' are invalid, so use brackets as in '(a*)*'
+        - NOTE 'R+' for one or more is not available since '+' is union, use 'R{1,}' instead
     '''
 
+    PRECEDENCE = {'+': 1, '.': 2}
+    OPERATORS = {'+': Union, '.': Concat}
+
     def __init__(self, R: str):
         self.R = R.replace(' ', '') # Remove spaces from input regex
-        self.alphabet = alphabet_of(R)
-        self.pos = 0
-
-    def parse(self) -> bool:
-        result = self.parse_union()
-        if self.pos != len(self.R):
-            raise SyntaxError('Unexpected characters in regular expression.')
-        return result
-
-    def parse_union(self) -> bool:
-        self.parse_concat()
-        while self.peek() == '+':
-            self.consume('+')
-            self.parse_concat()
-        return True
-
-    def parse_concat(self) -> bool:
-        if not self.parse_star():
-            raise SyntaxError('Expected expression in concatenation, but none seen.')
-        while True:
-            if not self.peek() or self.peek() in ')+': # Exit if next symbol cannot start new atom
-                break
-            if not self.parse_star():
-                break
-        return True
-
-    def parse_star(self) -> bool:
-        self.parse_atom()
-        if self.peek() == '*':
-            self.consume('*')
-        return True
-
-    def parse_atom(self) -> bool:
-        if self.peek() == '(':
-            self.consume('(')
-            self.parse_union() # Parse newly opened bracket
-            if self.peek() != ')':
-                raise SyntaxError('Expected closing bracket \')\'.')
-            self.consume(')')
-        elif self.peek() in self.alphabet:
-            self.consume(self.peek())
-        else:
-            raise SyntaxError(f'Unexpected symbol \'{self.peek()}\' at position \'{self.pos}\'.')
-        return True
-
-    def peek(self) -> str:
-        return self.R[self.pos] if self.pos < len(self.R) else None
-
-    def consume(self, letter) -> None:
-        if self.peek() != letter:
-            raise SyntaxError(f'Expected \'{letter}\' at position {self.pos} but saw \'{self.peek()}\'.')
-        self.pos += 1
+        self.operands = []
+        self.operators = [] # '+', '.' or the position of an open bracket
+
+    def parse(self) -> RegexNode:
+        expect_operand = True
+        previous_postfix = False # Whether the last symbol was a postfix operator
+        pos = 0
+        while pos < len(self.R):
+            char = self.R[pos]
+            postfix = char in '*?{'
+            if char not in OP_CHARS or char in (EPSILON, EMPTY, '(', '['):
+                if not expect_operand:
+                    self.push_operator('.') # Implicit concat
+                if char == '(':
+                    self.operators.append(pos)
+                    expect_operand = True
+                else:
+                    if char == '[':
+                        node, pos = self.char_class(pos)
+                    else:
+                        node = self.atom(char)
+                    self.operands.append(node)
+                    expect_operand = False
+            elif char == ')':
+                if expect_operand:
+                    raise SyntaxError(f'Expected expression before \')\' at position \'{pos}\'.')
+                self.close_bracket(pos)
+            elif postfix:
+                if expect_operand or previous_postfix:
+                    raise SyntaxError(f'Unexpected symbol \'{char}\' at position \'{pos}\'.')
+                operand = self.operands.pop()
+                if char == '*':
+                    self.operands.append(Star(operand))
+                elif char == '?':
+                    self.operands.append(repeat_of(operand, 0, 1))
+                else:
+                    low, high, pos = self.bounds(pos)
+                    self.operands.append(repeat_of(operand, low, high))
+            elif char == '+':
+                if expect_operand:
+                    raise SyntaxError(f'Unexpected symbol \'+\' at position \'{pos}\'.')
+                self.push_operator('+')
+                expect_operand = True
+            else:
+                raise SyntaxError(f'Unexpected symbol \'{char}\' at position \'{pos}\'.')
+            previous_postfix = postfix
+            pos += 1
+        if expect_operand:
+            raise SyntaxError('Expected expression at end of regular expression.')
+        self.apply_operators()
+        if self.operators:
+            raise SyntaxError('Expected closing bracket \')\'.')
+        return self.operands.pop()
+
+    @staticmethod
+    def atom(char: str) -> RegexNode:
+        if char == EPSILON:
+            return Epsilon()
+        if char == EMPTY:
+            return Empty()
+        return Symbol(char)
+
+    # Character class starting with '[' at `pos`, returning it and the position of its ']'
+    def char_class(self, pos: int) -> tuple[RegexNode, int]:
+        end = self.R.find(']', pos + 1)
+        if end == -1:
+            raise SyntaxError(f'Expected closing bracket \']\' for \'[\' at position \'{pos}\'.')
+        letters = class_letters(self.R[pos + 1:end])
+        if not letters:
+            raise SyntaxError(f'Empty character class at position \'{pos}\'.')
+        forbidden = sorted(letters.intersection(OP_CHARS))
+        if forbidden:
+            raise SyntaxError(f'Character class at position \'{pos}\' contains special symbol \'{forbidden[0]}\'.')
+        return CharClass(letters), end
+
+    # Repetition bounds starting with '{' at `pos`, returning low, high (None if unbounded), and the position of its '}'
+    def bounds(self, pos: int) -> tuple[int, int | None, int]:
+        end = self.R.find('}', pos + 1)
+        if end == -1:
+            raise SyntaxError(f'Expected closing bracket \'}}\' for \'{{\' at position \'{pos}\'.')
+        low, comma, high = self.R[pos + 1:end].partition(',')
+        if not low.isdecimal() or (high and not high.isdecimal()):
+            raise SyntaxError(f'Invalid repetition bounds at position \'{pos}\'.')
+        low = int(low)
+        high = (None if high == '' else int(high)) if comma else low
+        if high is not None and high < low:
+            raise SyntaxError(f'Invalid repetition bounds at position \'{pos}\', \'{low}\' is more than \'{high}\'.')
+        return low, high, end
+
+    # Apply pending binary operators of precedence above `precedence`, stopping at an open bracket
+    def apply_operators(self, precedence: int = 0) -> None:
+        while self.operators:
+            operator = self.operators[-1]
+            if isinstance(operator, int) or self.PRECEDENCE[operator] <= precedence:
+                return
+            self.operators.pop()
+            right = self.operands.pop()
+            left = self.operands.pop()
+            self.operands.append(self.OPERATORS[operator](left, right))
+
+    def push_operator(self, operator: str) -> None:
+        self.apply_operators(self.PRECEDENCE[operator])
+        self.operators.append(operator)
+
+    # Finish the group of the innermost open bracket, leaving its subtree as the last operand
+    def close_bracket(self, pos: int) -> None:
+        self.apply_operators()
+        if not self.operators:
+            raise SyntaxError(f'Unmatched closing bracket \')\' at position \'{pos}\'.')
+        self.operators.pop() # Open bracket
 
 # Wrapper that calls `RegexParserInput` to validate syntax of regex
 def is_valid_regex(R: str) -> bool:
@@ -76,12 +158,46 @@ def is_valid_regex(R: str) -> bool:
         # print(f'Regex {R} is invalid: {e}')
         return False
 
+# Parse regex into its AST, raising `SyntaxError` if invalid
+def parse_regex(R: str) -> RegexNode:
+    if R == '': return Epsilon() # Edge case for empty regex, as in `is_valid_regex`
+    return RegexParserInput(R).parse()
+
+# Letters listed between the brackets of a character class, expanding each range 'x-y'
+# NOTE a reversed range such as 'z-a' is empty, so '-' is only a literal letter at the start or end, e.g. '[-a]'
+def class_letters(body: str) -> set[str]:
+    letters = set()
+    i = 0
+    while i < len(body):
+        if i + 2 < len(body) and body[i + 1] == '-': # Range 'x-y'
+            letters.update(chr(code) for code in range(ord(body[i]), ord(body[i + 2]) + 1))
+            i += 3
+        else:
+            letters.add(body[i])
+            i += 1
+    return letters
+
+# Combine nodes with a binary operator, nesting to the right
+def fold_right(operator: Callable[[RegexNode, RegexNode], RegexNode], nodes: list[RegexNode]) -> RegexNode:
+    node = nodes[-1]
+    for other in reversed(nodes[:-1]):
+        node = operator(other, node)
+    return node
+
 # Extracts and returns the alphabet of a regex
 def alphabet_of(R: str) -> tuple[str, ...]:
     alphabet = set()
-    for letter in R:
-        if letter not in OP_CHARS: # Brackets and operators and spaces cannot be in alphabet, but assume every other character is
+    pos = 0
+    while pos < len(R):
+        letter = R[pos]
+        end = R.find(']' if letter == '[' else '}', pos + 1) if letter in '[{' else -1
+        if end != -1: # Bounds of a repetition are not letters, and a character class may list ranges
+            if letter == '[':
+                alphabet.update(class_letters(R[pos + 1:end]).difference(OP_CHARS))
+            pos = end
+        elif letter not in OP_CHARS: # Brackets and operators and spaces cannot be in alphabet, but assume every other character is
             alphabet.add(letter)
+        pos += 1
     return tuple(alphabet)
 
 # Preprocess regex by explicitly adding concat operator `.`
@@ -94,15 +210,16 @@ def add_concat(R: str) -> str:
     4 - ) . (
     5 - * . letter
     6 - * . (
+    The literals 'ε' and '∅' count as letters here.
     Other places, such as 'letter . +', or 'letter . *', should not have a concat added.
     '''
-    alphabet = alphabet_of(R) # Get alphabet
+    alphabet = set(alphabet_of(R)) # Get alphabet, as a set for fast lookup
     result = [] # Final processed regex
     for i, char in enumerate(R):
         result.append(char)
         if i + 1 < len(R): # Only proceed if there is a next char in regex
             next_char = R[i + 1]
-            if (char in alphabet or char in ')*') and (next_char in alphabet or next_char == '('):
+            if (char in alphabet or char in ')*ε∅') and (next_char in alphabet or next_char in '(ε∅'):
                 result.append('.') # Add `.` between current and next character, if one of the six conditions in docstring is true
     return ''.join(result) # Return re-assembled regex
 
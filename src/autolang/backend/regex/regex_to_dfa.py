@@ -1,8 +1,47 @@
-from autolang.backend.regex.regex_to_nfa import regex_to_nfa
+from autolang.backend.regex.regex_to_nfa import build_nfa
 from autolang.backend.regex.nfa_to_dfa import nfa_to_dfa
+from autolang.backend.regex.regex_input import parse_regex
+from autolang.backend.regex.followpos import ConstructFollowpos
+from autolang.backend.regex.compositional import ConstructCompositional
+from autolang.backend.regex.simplify import simplify_tree
+from autolang.backend.regex.compile_cache import compile_cache, normalise_regex, cache_info, clear_cache, set_disk_cache
+from autolang.backend.regex.settings_regex import REGEX_TO_DFA_METHODS, DEFAULT_REGEX_TO_DFA_METHOD, DEFAULT_REGEX_TO_NFA_METHOD
 
 from autolang.backend.machines.dfa import DFA
 
-# Just a wrapper of existing funcs for user convenience
-def regex_to_dfa(regex: str) -> DFA:
-    return nfa_to_dfa(regex_to_nfa(regex))
\ No newline at end of file
+# Convert input regex to DFA object
+def regex_to_dfa(regex: str, method: str | None = None, simplify: bool = False) -> DFA:
+    '''
+    - `method` is one of:
+        - 'followpos': build the DFA directly from position sets of the regex, see followpos.py
+        - 'subset': subset construction on the NFA from `regex_to_nfa()`, see nfa_to_dfa.py
+        - 'compositional': minimal DFA built bottom-up, minimising every subexpression as it goes, see compositional.py
+            - slower for small regexes, but intermediate DFAs stay near the size of the final minimal one
+    - if `simplify`, the regex is first rewritten with Kleene algebra identities, see simplify.py
+    - results are kept in the same process-wide LRU cache as `regex_to_nfa()`, and returned as copies
+    '''
+    if method is None:
+        method = DEFAULT_REGEX_TO_DFA_METHOD
+    if method not in REGEX_TO_DFA_METHODS:
+        raise ValueError(f'Regex to DFA method \'{method}\' is not recognised, must be one of {REGEX_TO_DFA_METHODS}.')
+    key = ('dfa', normalise_regex(regex), method, simplify)
+    return compile_cache.lookup(key, lambda: build_dfa(regex, method, simplify))
+
+# Build DFA with no caching, assuming `method` is valid
+def build_dfa(regex: str, method: str, simplify: bool) -> DFA:
+    if method == 'subset':
+        return nfa_to_dfa(build_nfa(regex, DEFAULT_REGEX_TO_NFA_METHOD, simplify))
+    try:
+        tree = parse_regex(regex)
+    except SyntaxError:
+        raise ValueError(f'Input regex \'{regex}\' is invalid. Please check regex syntax.')
+    if simplify:
+        tree = simplify_tree(tree)
+    if method == 'compositional':
+        return DFA(*ConstructCompositional(tree).to_dfa_args())
+    return DFA(*ConstructFollowpos(tree).to_dfa_args())
+
+# Same cache is shared with `regex_to_nfa()`
+regex_to_dfa.cache_info = cache_info
+regex_to_dfa.clear_cache = clear_cache
+regex_to_dfa.set_disk_cache = set_disk_cache
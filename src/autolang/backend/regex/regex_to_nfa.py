@@ -1,11 +1,57 @@
-from autolang.backend.regex.regex_input import is_valid_regex, add_concat
+from autolang.backend.regex.regex_input import parse_regex
+from autolang.backend.regex.regex_ast import expand_extended
 from autolang.backend.regex.gnfa import GNFA
+from autolang.backend.regex.thompson import ConstructThompson
+from autolang.backend.regex.glushkov import ConstructGlushkov
+from autolang.backend.regex.antimirov import ConstructAntimirov
+from autolang.backend.regex.simplify import simplify_tree
+from autolang.backend.regex.compile_cache import compile_cache, normalise_regex, cache_info, clear_cache, set_disk_cache
+from autolang.backend.regex.settings_regex import REGEX_TO_NFA_METHODS, DEFAULT_REGEX_TO_NFA_METHOD
 from autolang.backend.machines.nfa import NFA
 
-# Convert input regex to NFA object - glues together everything regex.py, regex_eliminate.py, gnfa.py
-def regex_to_nfa(regex: str) -> NFA:
-    if not is_valid_regex(regex):
+# Convert input regex to NFA object - glues together everything regex.py, regex_ast.py, gnfa.py, thompson.py, glushkov.py, antimirov.py
+# The regex is parsed once, and the chosen construction reads the resulting AST
+def regex_to_nfa(regex: str, method: str | None = None, simplify: bool = False) -> NFA:
+    '''
+    - `method` is one of:
+        - 'thompson': single pass over the AST, linear in the length of the regex, see thompson.py
+        - 'glushkov': ε-free position automaton with one state per letter occurrence, plus a start state, see glushkov.py
+        - 'antimirov': ε-free partial-derivative automaton, usually no larger than the Glushkov one, see antimirov.py
+        - 'gnfa': iterative operator elimination on a `GNFA`, see gnfa.py
+    - 'thompson' and 'gnfa' give NFAs of the same shape, up to the numbering of the added states
+    - repetitions 'R{m,n}' and character classes '[a-z]' are built directly by every method except 'gnfa',
+      which expands them first, see `expand_extended()`
+    - if `simplify`, the regex is first rewritten with Kleene algebra identities, see simplify.py
+    - results are kept in a process-wide LRU cache and returned as copies, see compile_cache.py
+        - `regex_to_nfa.cache_info()` and `regex_to_nfa.clear_cache()` inspect and empty it
+        - `regex_to_nfa.set_disk_cache(path)` opts in to also keeping them on disk between processes, see disk_cache.py
+    '''
+    if method is None:
+        method = DEFAULT_REGEX_TO_NFA_METHOD
+    if method not in REGEX_TO_NFA_METHODS:
+        raise ValueError(f'Regex to NFA method \'{method}\' is not recognised, must be one of {REGEX_TO_NFA_METHODS}.')
+    key = ('nfa', normalise_regex(regex), method, simplify)
+    return compile_cache.lookup(key, lambda: build_nfa(regex, method, simplify))
+
+# Build NFA with no caching, assuming `method` is valid
+def build_nfa(regex: str, method: str, simplify: bool) -> NFA:
+    try:
+        tree = parse_regex(regex)
+    except SyntaxError:
         raise ValueError(f'Input regex \'{regex}\' is invalid. Please check regex syntax.')
-    regex = add_concat(regex)
-    gnfa = GNFA(regex)
-    return gnfa.to_nfa()
\ No newline at end of file
+    if simplify:
+        tree = simplify_tree(tree)
+    if method == 'gnfa':
+        return GNFA(expand_extended(tree)).to_nfa()
+    if method == 'glushkov':
+        construction = ConstructGlushkov(tree)
+    elif method == 'antimirov':
+        construction = ConstructAntimirov(tree)
+    else:
+        construction = ConstructThompson(tree)
+    return NFA(construction.construct(), construction.start, construction.accept)
+
+# Same cache is shared with `regex_to_dfa()`
+regex_to_nfa.cache_info = cache_info
+regex_to_nfa.clear_cache = clear_cache
+regex_to_nfa.set_disk_cache = set_disk_cache
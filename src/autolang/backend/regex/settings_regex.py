@@ -0,0 +1,18 @@
+
+# Constructions available to `regex_to_nfa()`
+REGEX_TO_NFA_METHODS = ('thompson', 'glushkov', 'antimirov', 'gnfa')
+DEFAULT_REGEX_TO_NFA_METHOD = 'thompson'
+
+# Constructions available to `regex_to_dfa()`
+REGEX_TO_DFA_METHODS = ('followpos', 'subset', 'compositional')
+DEFAULT_REGEX_TO_DFA_METHOD = 'followpos'
+
+# Max number of memoised derivatives stored by `RegexMatcher` before its cache is flushed
+DEFAULT_DERIVATIVE_CACHE_SIZE = 10000
+
+# Orders in which `DFA.to_regex()` and `NFA.to_regex()` eliminate states
+TO_REGEX_HEURISTICS = ('degree', 'weight', 'naive')
+DEFAULT_TO_REGEX_HEURISTIC = 'degree'
+
+# Max number of machines kept by the process-wide compile cache of `regex_to_nfa()` and `regex_to_dfa()`
+DEFAULT_COMPILE_CACHE_SIZE = 1024
@@ -0,0 +1,132 @@
+from autolang.backend.regex.regex_ast import RegexNode, Epsilon, Empty, Union, Concat, Star, to_string, repeat_of
+from autolang.backend.regex.regex_input import parse_regex, fold_right
+from autolang.backend.regex.derivatives import nullable, evaluate
+
+'''
+Algebraic simplification of regexes, using identities of Kleene algebra
+- each pass rebuilds the AST bottom-up, simplifying every node once its children are simplified
+    - shared subtrees are only simplified once, since results are memoised by node
+- passes repeat until the AST stops changing, i.e. a fixpoint is reached
+- unions:
+    - nested unions are flattened, and duplicate terms removed, e.g. 'a+(b+a)' -> 'a+b'
+    - ∅ is dropped, e.g. 'a+∅' -> 'a'
+    - R is dropped if R* is also a term, e.g. 'a+a*' -> 'a*'
+    - ε is dropped if another term is nullable, e.g. 'ε+a*' -> 'a*'
+    - terms keep their order of first appearance, so output stays close to the input
+- concats:
+    - ∅ annihilates and ε is dropped, e.g. 'a∅' -> '∅', 'aε' -> 'a'
+    - adjacent equal stars are merged, e.g. 'a*a*' -> 'a*'
+- stars:
+    - 'ε*' and '∅*' -> 'ε', and '(R*)*' -> 'R*'
+    - inside a star, ε terms are dropped and stars are removed from terms, e.g. '(ε+a*+b)*' -> '(a+b)*'
+    - a star of a concat of nullable factors becomes a star of their union, e.g. '(a*b*)*' -> '(a+b)*'
+- repetitions:
+    - 'ε{m,n}' -> 'ε', and '∅{m,n}' -> '∅' unless m is 0, when it is 'ε'
+    - otherwise only the repeated subtree is simplified, and character classes are left as they are
+'''
+
+# Terms of a union, flattening nested unions
+def union_terms(node: RegexNode) -> list[RegexNode]:
+    terms = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.kind == 'union':
+            stack.extend(reversed(node.children))
+        else:
+            terms.append(node)
+    return terms
+
+# Factors of a concat, flattening nested concats
+def concat_factors(node: RegexNode) -> list[RegexNode]:
+    factors = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.kind == 'concat':
+            stack.extend(reversed(node.children))
+        else:
+            factors.append(node)
+    return factors
+
+
+class Simplifier:
+
+    def __init__(self):
+        self.nullable = {} # node: nullable, shared across passes
+
+    def simplify_union(self, terms: list[RegexNode]) -> RegexNode:
+        terms = list(dict.fromkeys(term for node in terms for term in union_terms(node) if term.kind != 'empty'))
+        present = set(terms)
+        terms = [term for term in terms if Star(term) not in present] # R + R* = R*
+        if any(term.kind != 'epsilon' and nullable(term, self.nullable) for term in terms):
+            terms = [term for term in terms if term.kind != 'epsilon'] # ε + R = R if R is nullable
+        return fold_right(Union, terms) if terms else Empty()
+
+    def simplify_concat(self, left: RegexNode, right: RegexNode) -> RegexNode:
+        factors = []
+        for factor in concat_factors(left) + concat_factors(right):
+            if factor.kind == 'empty':
+                return Empty()
+            if factor.kind == 'epsilon':
+                continue
+            if factors and factor.kind == 'star' and factors[-1] is factor: # R*R* = R*
+                continue
+            factors.append(factor)
+        return fold_right(Concat, factors) if factors else Epsilon()
+
+    def simplify_star(self, child: RegexNode) -> RegexNode:
+        if child.kind == 'concat' and all(nullable(factor, self.nullable) for factor in concat_factors(child)):
+            child = self.simplify_union(concat_factors(child)) # (R*S*)* = (R+S)* when all factors are nullable
+        if child.kind == 'union':
+            terms = [term.children[0] if term.kind == 'star' else term for term in union_terms(child)] # (R*+S)* = (R+S)*
+            child = self.simplify_union([term for term in terms if term.kind != 'epsilon']) # (ε+R)* = R*
+        if child.kind in ('epsilon', 'empty'):
+            return Epsilon()
+        if child.kind == 'star':
+            return child
+        return Star(child)
+
+    def simplify_repeat(self, child: RegexNode, low: int, high: int | None) -> RegexNode:
+        if child.kind == 'epsilon' or (child.kind == 'empty' and low == 0):
+            return Epsilon()
+        if child.kind == 'empty':
+            return Empty()
+        return repeat_of(child, low, high)
+
+    # One bottom-up pass
+    def simplify_once(self, node: RegexNode) -> RegexNode:
+        memo = {}
+        def combine(n):
+            kind = n.kind
+            if kind == 'star':
+                return self.simplify_star(memo[n.children[0]])
+            if kind == 'repeat':
+                return self.simplify_repeat(memo[n.children[0]], n.low, n.high)
+            if kind == 'union':
+                return self.simplify_union([memo[child] for child in n.children])
+            if kind == 'concat':
+                return self.simplify_concat(*(memo[child] for child in n.children))
+            return n
+        return evaluate(node, memo, lambda n: n, lambda n: n.children, combine)
+
+    # Repeat passes until nothing changes
+    def simplify(self, node: RegexNode) -> RegexNode:
+        while True:
+            simplified = self.simplify_once(node)
+            if simplified is node:
+                return node
+            node = simplified
+
+
+# Simplify an AST
+def simplify_tree(node: RegexNode) -> RegexNode:
+    return Simplifier().simplify(node)
+
+# Simplify an input regex string, returning a regex string in the same syntax
+def simplify_regex(regex: str) -> str:
+    try:
+        tree = parse_regex(regex)
+    except SyntaxError:
+        raise ValueError(f'Input regex \'{regex}\' is invalid. Please check regex syntax.')
+    return to_string(simplify_tree(tree), explicit_concat=False)
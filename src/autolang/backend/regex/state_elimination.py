@@ -0,0 +1,124 @@
+from autolang.backend.regex.regex_ast import RegexNode, Symbol, Epsilon, Empty, postorder, to_string
+from autolang.backend.regex.simplify import Simplifier
+from autolang.backend.regex.settings_regex import TO_REGEX_HEURISTICS, DEFAULT_TO_REGEX_HEURISTIC
+from autolang.backend.regex.regex_input import OP_CHARS
+from autolang.backend.machines.trim import useful_states
+
+from collections.abc import Iterable
+
+'''
+Conversion of an automaton to a regex by state elimination, called by `DFA.to_regex()` and `NFA.to_regex()`
+- the automaton is viewed as a GNFA whose edges are labelled by regex ASTs, with a new start and a new accept state
+- eliminating state q replaces every path p -> q -> r by an edge p -> r labelled `in.loop*.out`, unioned with any existing p -> r edge
+- once every original state is gone, the single remaining edge is the regex
+- the order of elimination does not change the language, but has a huge effect on the size of the regex, so it is chosen by a heuristic:
+    - 'degree': next state minimises (number of in-edges) * (number of out-edges), i.e. the number of new edges created
+    - 'weight': next state minimises the total size of labels created minus the size of labels removed (Delgado & Morais 2004)
+    - 'naive': states in len-lex order
+- every new label is simplified as it is built, see simplify.py, and useless states are removed before starting
+- letters that are regex syntax, e.g. '(' or 'ε', are rejected, since the regex would not parse back to the same language
+- this module works on plain transition items, so it does not import `DFA` or `NFA`
+'''
+
+# Number of nodes in each label, memoised
+def label_size(node: RegexNode, sizes: dict[RegexNode, int]) -> int:
+    size = sizes.get(node)
+    if size is None:
+        size = sum(1 for _ in postorder(node))
+        sizes[node] = size
+    return size
+
+
+class StateEliminator:
+
+    def __init__(self,
+                 items: Iterable[tuple[tuple[str, str], Iterable[str]]],
+                 start: str,
+                 accept: Iterable[str],
+                 heuristic: str | None = None):
+        if heuristic is None:
+            heuristic = DEFAULT_TO_REGEX_HEURISTIC
+        if heuristic not in TO_REGEX_HEURISTICS:
+            raise ValueError(f'State elimination heuristic \'{heuristic}\' is not recognised, must be one of {TO_REGEX_HEURISTICS}.')
+        self.heuristic = heuristic
+        self.simplifier = Simplifier()
+        self.sizes = {}
+        items = [(key, tuple(next_states)) for key, next_states in items]
+        for (_, letter), _ in items:
+            if letter and letter in OP_CHARS:
+                raise ValueError(f'Letter \'{letter}\' is regex syntax, so the machine cannot be written as a regex.')
+        accept = set(accept)
+        self.states = useful_states(items, start, accept)[0] # Len-lex order
+        keep = set(self.states)
+        # Original states are 0, 1, ..., n - 1, with new start n and new accept n + 1
+        index = {state: i for i, state in enumerate(self.states)}
+        self.start = len(self.states)
+        self.accept = len(self.states) + 1
+        self.succ = {i: {} for i in range(len(self.states) + 2)} # p: {r: label}
+        self.pred = {i: set() for i in range(len(self.states) + 2)} # r: {p}
+        if start in keep:
+            self.add_edge(self.start, index[start], Epsilon())
+        for state in accept & keep:
+            self.add_edge(index[state], self.accept, Epsilon())
+        for (state, letter), next_states in items:
+            if state not in keep:
+                continue
+            label = Symbol(letter) if letter else Epsilon()
+            for next_state in next_states:
+                if next_state in keep:
+                    self.add_edge(index[state], index[next_state], label)
+
+    # Add edge p -> r, unioning with any existing label
+    def add_edge(self, p: int, r: int, label: RegexNode) -> None:
+        existing = self.succ[p].get(r)
+        if existing is not None:
+            label = self.simplifier.simplify_union([existing, label])
+        self.succ[p][r] = label
+        self.pred[r].add(p)
+
+    # Cost of eliminating `q` under the chosen heuristic
+    def cost(self, q: int) -> int:
+        ins = [p for p in self.pred[q] if p != q]
+        outs = [r for r in self.succ[q] if r != q]
+        if self.heuristic == 'degree':
+            return len(ins) * len(outs)
+        # 'weight'
+        loop = self.succ[q].get(q)
+        loop_size = label_size(loop, self.sizes) if loop is not None else 0
+        in_sizes = sum(label_size(self.succ[p][q], self.sizes) for p in ins)
+        out_sizes = sum(label_size(self.succ[q][r], self.sizes) for r in outs)
+        return in_sizes * (len(outs) - 1) + out_sizes * (len(ins) - 1) + loop_size * (len(ins) * len(outs) - 1)
+
+    def eliminate(self, q: int) -> None:
+        simplifier = self.simplifier
+        loop = self.succ[q].pop(q, None)
+        self.pred[q].discard(q)
+        middle = simplifier.simplify_star(loop) if loop is not None else Epsilon()
+        outs = self.succ.pop(q)
+        ins = self.pred.pop(q)
+        for r in outs:
+            self.pred[r].discard(q)
+        for p in ins:
+            in_label = self.succ[p].pop(q)
+            prefix = simplifier.simplify_concat(in_label, middle)
+            for r, out_label in outs.items():
+                self.add_edge(p, r, simplifier.simplify_concat(prefix, out_label))
+
+    def to_regex(self) -> RegexNode:
+        remaining = list(range(len(self.states)))
+        while remaining:
+            if self.heuristic == 'naive':
+                q = remaining.pop(0)
+            else:
+                q = min(remaining, key=self.cost) # Ties broken by len-lex order of original states
+                remaining.remove(q)
+            self.eliminate(q)
+        return self.succ[self.start].get(self.accept, Empty())
+
+
+def _to_regex(items: Iterable[tuple[tuple[str, str], Iterable[str]]],
+              start: str,
+              accept: Iterable[str],
+              heuristic: str | None = None) -> str:
+    tree = StateEliminator(items, start, accept, heuristic).to_regex()
+    return to_string(tree, explicit_concat=False)
@@ -0,0 +1,89 @@
+from autolang.backend.regex.regex_ast import RegexNode, alphabet_of_node
+from autolang.backend.machines.structs_transition import pad_transition_nfa
+
+'''
+Single-pass construction of an NFA from a regex AST, called by `regex_to_nfa()`
+- gives the same shape of NFA as eliminating operators from a `GNFA`, but without ever storing compound edge labels:
+    - union: both children become parallel edges between the same two states
+    - concat: a new state is placed between the two children
+    - star: a new state is joined to both ends by ε-transitions, and the child becomes a loop on it
+- character class: one edge per letter between the same two states, as for a union of letters but with no extra states
+- repetition R{m,n}: a chain of n copies of the child with new states in between, where each state after the m-th copy
+  also has an ε-transition to the end, or if unbounded, a chain of m copies followed by a star
+    - copies all refer to the same child node, so only the states, not the regex, are duplicated
+- instead, every (state1, state2, node) "edge" waiting to be expanded lives on a stack, and is expanded exactly once
+- each occurrence of each node is visited once, and does constant work, so the whole construction is O(|regex|)
+'''
+
+# Object that builds a Thompson-style NFA transition function from a regex AST
+class ConstructThompson:
+
+    def __init__(self, tree: RegexNode):
+        self.tree = tree
+        self.states = ['s0', 't'] # Only start and accept states initially, as for `GNFA`
+        self.start = 's0'
+        self.accept = 't'
+
+    # Helper for naming added states - s0, s1, s2, ..., t
+    def new_state(self) -> str:
+        state = 's' + str(len(self.states) - 1)
+        self.states.append(state)
+        return state
+
+    def construct(self) -> dict[tuple[str, str], tuple[str, ...]]:
+        transition = {} # (state, letter): list of next states
+        stack = [(self.start, self.accept, self.tree)] # Edges still to be expanded
+        while stack:
+            state1, state2, node = stack.pop()
+            kind = node.kind
+            if kind == 'symbol':
+                transition.setdefault((state1, node.letter), []).append(state2)
+            elif kind == 'class':
+                for letter in node.letters:
+                    transition.setdefault((state1, letter), []).append(state2)
+            elif kind == 'epsilon':
+                transition.setdefault((state1, ''), []).append(state2)
+            elif kind == 'empty':
+                pass # No edge at all
+            elif kind == 'union':
+                left, right = node.children
+                stack.append((state1, state2, right)) # Push right first so left is expanded first
+                stack.append((state1, state2, left))
+            elif kind == 'concat':
+                left, right = node.children
+                state3 = self.new_state()
+                stack.append((state3, state2, right))
+                stack.append((state1, state3, left))
+            elif kind == 'star':
+                state3 = self.new_state()
+                transition.setdefault((state1, ''), []).append(state3)
+                transition.setdefault((state3, ''), []).append(state2)
+                stack.append((state3, state3, node.children[0]))
+            elif kind == 'repeat':
+                stack.extend(reversed(self.repeat(state1, state2, node, transition))) # Reversed so first copy is expanded first
+            else:
+                raise ValueError(f'Regex node of kind \'{kind}\' is not recognised.')
+        transition = {key: tuple(sorted(val)) for key, val in transition.items()} # Convert next_states to tuples
+        return pad_transition_nfa(transition, self.states, alphabet_of_node(self.tree)) # Keep states only joined by ∅-edges
+
+    # Chain the copies of a repetition from `state1` to `state2`, returning the edges of the copies still to be expanded
+    def repeat(self, state1: str, state2: str, node: RegexNode, transition: dict) -> list[tuple[str, str, RegexNode]]:
+        child = node.children[0]
+        low, high = node.low, node.high
+        copies = low if high is None else high
+        edges = []
+        if high == 0:
+            transition.setdefault((state1, ''), []).append(state2)
+        state = state1
+        for i in range(copies):
+            if i >= low: # Optional copy, so can skip straight to the end
+                transition.setdefault((state, ''), []).append(state2)
+            next_state = state2 if i == copies - 1 and high is not None else self.new_state()
+            edges.append((state, next_state, child))
+            state = next_state
+        if high is None: # Unbounded, so finish with a star as above
+            loop = self.new_state()
+            transition.setdefault((state, ''), []).append(loop)
+            transition.setdefault((loop, ''), []).append(state2)
+            edges.append((loop, loop, child))
+        return edges
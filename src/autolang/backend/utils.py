@@ -1,9 +1,10 @@
-from collections.abc import Iterable, Generator
+from collections.abc import Iterable, Generator, Hashable, Mapping
 import re
 
 '''
 General utility functions for autolang
 - Primarily generating words over alphabets
+- Also small graph helpers shared by automaton algorithms
 '''
 
 # Maximum size of tuple of generated words before raising error to prevent memory overflow
@@ -104,4 +105,53 @@ def words_to_length_from_regex(n: int,
             if re.fullmatch(py_regex, word):
                 yield word
 
-    return _gen() if lazy else tuple(_gen())
\ No newline at end of file
+    return _gen() if lazy else tuple(_gen())
+
+# Sort state names in len-lex order, the canonical order used throughout autolang
+def sort_states(states: Iterable[str]) -> tuple[str, ...]:
+    return tuple(sorted(states, key=lambda s: (len(s), s)))
+
+# Strongly connected components of a directed graph, via iterative Tarjan's algorithm
+# Components are returned in reverse topological order, i.e. every component appears after all components reachable from it
+def strongly_connected_components(nodes: Iterable[Hashable], 
+                                  successors: Mapping[Hashable, Iterable[Hashable]]) -> list[list[Hashable]]:
+    '''
+    - `successors` maps each node to the nodes it has an edge to, and missing nodes are treated as having no edges
+    - uses an explicit stack instead of recursion, so long chains of nodes cannot hit the recursion limit
+    '''
+    index = {} # Order in which nodes were first visited
+    low = {} # Smallest index reachable from node within its current DFS subtree
+    stack = [] # Visited nodes not yet assigned to a component
+    on_stack = set()
+    components = []
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(successors.get(root, ())))] # DFS call stack of (node, remaining successors)
+        index[root] = low[root] = counter; counter += 1
+        stack.append(root); on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index: # Descend into unvisited child
+                    index[child] = low[child] = counter; counter += 1
+                    stack.append(child); on_stack.add(child)
+                    work.append((child, iter(successors.get(child, ()))))
+                    break
+                elif child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else: # All children done, so return from `node`
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]: # `node` is the root of a component
+                    component = []
+                    while True:
+                        member = stack.pop(); on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
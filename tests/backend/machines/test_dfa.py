@@ -56,6 +56,18 @@ class TestDFA(unittest.TestCase):
         with self.assertRaises(ValueError):
             dfa = DFA(self.tran, self.start, 'qx') # Not wrapped in container
 
+    def test_regex_syntax_letters(self):
+        # Balanced brackets of depth at most 2, with a sink
+        tran = {('q0', '('): 'q1', ('q0', ')'): 'qd',
+                ('q1', '('): 'q2', ('q1', ')'): 'q0',
+                ('q2', '('): 'qd', ('q2', ')'): 'q1',
+                ('qd', '('): 'qd', ('qd', ')'): 'qd'}
+        dfa = DFA(tran, 'q0', ['q0'])
+        self.assertEqual(dfa.alphabet, ('(', ')'))
+        self.assertEqual(dfa.L(4), ('', '()', '(())', '()()'))
+        with self.assertRaises(ValueError): # Not possible to write as a regex
+            dfa.to_regex()
+
     def test_transition_table(self):
         pass
 
@@ -0,0 +1,65 @@
+import unittest
+from autolang import DFA, DFABank
+from autolang.backend.machines import dfa_bank
+from autolang.backend.utils import words_to_length
+
+class TestDFABank(unittest.TestCase):
+
+    def setUp(self):
+        # Example 1 in examples/dfa_examples.py
+        dfa1 = DFA({
+            ('q1', '0'): 'q1',
+            ('q1', '1'): 'q2',
+            ('q2', '0'): 'q3',
+            ('q2', '1'): 'q2',
+            ('q3', '0'): 'q2',
+            ('q3', '1'): 'q2'
+        }, 'q1', ['q2'])
+        # Even number of 0s
+        dfa2 = DFA({
+            ('e', '0'): 'o',
+            ('e', '1'): 'e',
+            ('o', '0'): 'e',
+            ('o', '1'): 'o'
+        }, 'e', ['e'])
+        # Words over {0, a}, to check letters missing from other alphabets
+        dfa3 = DFA({
+            ('p', '0'): 'p',
+            ('p', 'a'): 'p'
+        }, 'p', ['p'])
+        self.dfas = [dfa1, dfa2, dfa3]
+
+    def check_against_dfas(self, bank: DFABank):
+        for word in words_to_length(6, ('0', '1', 'a')):
+            expected = tuple(i for i, dfa in enumerate(self.dfas) if dfa.accepts(word))
+            self.assertEqual(bank.accepting_indices(word), expected)
+            self.assertEqual(bank.accepts_mask(word), sum(1 << i for i in expected))
+
+    def test_init(self):
+        bank = DFABank(self.dfas, use_numpy=False)
+        self.assertEqual(len(bank), 3)
+        self.assertEqual(bank.alphabet, ('0', '1', 'a'))
+
+    def test_pure_python(self):
+        self.check_against_dfas(DFABank(self.dfas, use_numpy=False))
+
+    @unittest.skipIf(dfa_bank.np is None, 'NumPy not installed')
+    def test_numpy(self):
+        self.check_against_dfas(DFABank(self.dfas, use_numpy=True))
+
+    def test_unrecognised_letter(self):
+        bank = DFABank(self.dfas, use_numpy=False)
+        self.assertEqual(bank.accepts_mask('01x'), 0)
+        self.assertEqual(bank.accepting_indices('01x'), tuple())
+
+    def test_empty_bank(self):
+        bank = DFABank([], use_numpy=False)
+        self.assertEqual(bank.accepts_mask(''), 0)
+
+    def test_invalid_machine(self):
+        with self.assertRaises(TypeError):
+            DFABank(['not a dfa'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from autolang import DFA, regex_to_dfa
+from autolang.backend.machines.dfa_minimise import hopcroft, minimise_int
+from autolang.backend.regex.nfa_to_dfa import minimise_dfa
+
+class TestHopcroft(unittest.TestCase):
+
+    def test_partition(self):
+        # States 1 and 2 both accept and loop on each other, 3 is unreachable but equivalent to 0
+        delta = [(1,), (2,), (1,), (1,)]
+        block_of = hopcroft(delta, [False, True, True, False])
+        self.assertEqual(block_of[1], block_of[2])
+        self.assertEqual(block_of[0], block_of[3])
+        self.assertNotEqual(block_of[0], block_of[1])
+
+    def test_minimise_int(self):
+        delta, accept = minimise_int([(1,), (2,), (1,), (1,)], 0, [False, True, True, False])
+        self.assertEqual(delta, [(1,), (1,)])
+        self.assertEqual(accept, [False, True])
+
+    def test_canonical(self):
+        # Same language with states in a different order gives the same numbering
+        self.assertEqual(minimise_int([(1, 2), (1, 2), (2, 2)], 0, [False, True, False]),
+                         minimise_int([(2, 1), (1, 1), (2, 1)], 0, [False, False, True]))
+
+
+class TestMinimiseDFA(unittest.TestCase):
+
+    def test_minimise(self):
+        dfa = DFA({
+            ('s0', 'a'): 's1', ('s0', 'b'): 's2',
+            ('s1', 'a'): 's3', ('s1', 'b'): 's3',
+            ('s2', 'a'): 's3', ('s2', 'b'): 's3',
+            ('s3', 'a'): 's3', ('s3', 'b'): 's3',
+            ('u', 'a'): 's1', ('u', 'b'): 'u'
+        }, 's0', {'s1', 's2'})
+        minimal = dfa.minimise()
+        self.assertEqual(minimal.states, ('s0', 's1', 's3'))
+        self.assertEqual(minimal.accept, {'s1'})
+        self.assertEqual(set(minimal.L(4)), {'a', 'b'})
+
+    def test_regex(self):
+        for regex in ('(a+b)*abb', '(ab)*(ba)*', 'a(b+c)*d', '((a*)+(b*))*'):
+            dfa = regex_to_dfa(regex, method='subset')
+            minimal = minimise_dfa(dfa)
+            self.assertEqual(minimal.L(6), dfa.L(6))
+            self.assertLessEqual(len(minimal.states), len(dfa.states))
+        self.assertEqual(len(minimise_dfa(regex_to_dfa('(a+b)*abb')).states), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
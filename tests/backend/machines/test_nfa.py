@@ -60,6 +60,46 @@ class TestNFA(unittest.TestCase):
         with self.assertRaises(ValueError):
             nfa = NFA(self.tran, self.start, 'qx') # Not wrapped in container
 
+    def test_epsilon_closure(self):
+        nfa = NFA(self.tran, self.start, self.accept)
+        self.assertEqual(nfa.epsilon_closure({'q1'}), {'q1'})
+        self.assertEqual(nfa.epsilon_closure({'q2'}), {'q2', 'q3'})
+        self.assertEqual(nfa.epsilon_closure(set()), set())
+
+    def test_accepts_epsilon_cycle(self):
+        # ε-cycle between q0 and q1 must not loop forever
+        nfa = NFA({('q0', ''): ('q1',), ('q1', ''): ('q0',), ('q1', 'a'): ('q2',)}, 'q0', ['q2'])
+        self.assertTrue(nfa.accepts('a'))
+        self.assertFalse(nfa.accepts(''))
+        self.assertFalse(nfa.accepts('aa'))
+
+    def test_accepts_long_word(self):
+        nfa = NFA(self.tran, self.start, self.accept)
+        self.assertTrue(nfa.accepts('0' * 5000 + '11'))
+        self.assertFalse(nfa.accepts('0' * 5000))
+
+    def test_compact(self):
+        nfa = NFA(self.tran, self.start, self.accept, compact=True)
+        self.assertEqual(nfa.transition.function, self.tran)
+        self.assertEqual(nfa.L(8, mode='set'), NFA(self.tran, self.start, self.accept).L(8, mode='set'))
+        self.assertEqual(nfa.L(8), nfa.L(8, mode='set'))
+
+    def test_compact_ids(self):
+        nfa = NFA(self.tran, self.start, self.accept, compact=True)
+        plain = NFA(self.tran, self.start, self.accept)
+        self.assertIs(nfa.transition.function, nfa.transition.function) # Rebuilt once
+        self.assertEqual(nfa.epsilon_closure({'q2'}), plain.epsilon_closure({'q2'}))
+        self.assertEqual(nfa.compile().successors, plain.compile().successors)
+        self.assertEqual(nfa.compile().closures, plain.compile().closures)
+        for word in ('', '1', '11', '0110', '1010', '0001'):
+            self.assertEqual(nfa.accepts_set(word), plain.accepts_set(word))
+
+    def test_regex_syntax_letters(self):
+        nfa = NFA({('q0', 'ε'): ('q1',), ('q1', '?'): ('q0', 'q1')}, 'q0', ['q1'])
+        self.assertEqual(nfa.L(3), ('ε', 'ε?', 'ε??', 'ε?ε'))
+        with self.assertRaises(ValueError):
+            nfa.to_regex()
+
     def test_next_states(self):
         pass
 
@@ -0,0 +1,79 @@
+import unittest
+import math
+from autolang import NFA, regex_to_nfa
+from autolang.backend.utils import words_to_length
+
+class TestCountRuns(unittest.TestCase):
+
+    def setUp(self):
+        # Example 1 in examples/nfa_examples.py
+        self.nfa = NFA({
+            ('q1', '0'): ('q1',), 
+            ('q1', '1'): ('q1', 'q2'), 
+            ('q2', ''): ('q3',),
+            ('q2', '0'): ('q3',),
+            ('q3', '1'): ('q4',),
+            ('q4', '0'): ('q4',),
+            ('q4', '1'): ('q4',) 
+        }, 'q1', ['q4'])
+
+    def test_counts(self):
+        self.assertEqual(self.nfa.count_runs(''), 0)
+        self.assertEqual(self.nfa.count_runs('11'), 1)
+        self.assertEqual(self.nfa.count_runs('111'), 2) # Substring '11' at positions 0 and 1
+        self.assertEqual(self.nfa.count_runs('1011'), 2) # '101' and '11'
+        self.assertEqual(self.nfa.count_runs('1x'), 0)
+
+    def test_agrees_with_accepts(self):
+        for word in words_to_length(6, '01'):
+            self.assertEqual(self.nfa.count_runs(word) > 0, self.nfa.accepts(word))
+
+    def test_overlapping_union(self):
+        self.assertEqual(regex_to_nfa('a*+a').count_runs('a'), 2)
+        self.assertEqual(regex_to_nfa('a*+a').count_runs('aa'), 1)
+        self.assertEqual(regex_to_nfa('(a*+a)(a*+a)').count_runs('a'), 4) # 'a' from either half, in either branch
+
+    def test_repeated_next_state(self):
+        # Next states are a set, so listing 'q1' twice is still one run
+        nfa = NFA({('q0', 'a'): ('q1', 'q1')}, 'q0', ['q1'])
+        self.assertEqual(nfa.count_runs('a'), 1)
+
+    def test_epsilon_cycle(self):
+        nfa = NFA({('q0', ''): ('q1',), ('q1', ''): ('q0',), ('q1', 'a'): ('q2',)}, 'q0', ['q2'])
+        self.assertEqual(nfa.count_runs('a'), math.inf)
+        self.assertEqual(nfa.count_runs('aa'), 0) # Infinite branches that die are not counted
+
+    def test_distinct_epsilon_paths(self):
+        nfa = NFA({('q0', ''): ('q1', 'q2'), ('q1', ''): ('q3',), ('q2', ''): ('q3',)}, 'q0', ['q3'])
+        self.assertEqual(nfa.count_runs(''), 2)
+
+
+class TestIsUnambiguous(unittest.TestCase):
+
+    def test_unambiguous(self):
+        self.assertTrue(regex_to_nfa('a').is_unambiguous())
+        self.assertTrue(regex_to_nfa('ab*').is_unambiguous())
+        self.assertTrue(regex_to_nfa('a+b').is_unambiguous())
+        self.assertTrue(NFA({('q0', 'a'): ('q1',)}, 'q0', []).is_unambiguous()) # Empty language
+
+    def test_ambiguous(self):
+        self.assertFalse(regex_to_nfa('a*+a').is_unambiguous())
+        self.assertFalse(regex_to_nfa('a*a*').is_unambiguous())
+        self.assertFalse(regex_to_nfa('(a+b)*a(a+b)*').is_unambiguous())
+
+    def test_epsilon_cycle(self):
+        nfa = NFA({('q0', ''): ('q1',), ('q1', ''): ('q0',), ('q1', 'a'): ('q2',)}, 'q0', ['q2'])
+        self.assertFalse(nfa.is_unambiguous())
+        # Same cycle, but useless since it can never reach an accept state
+        nfa = NFA({('q0', 'a'): ('q2',), ('q0', 'b'): ('q3',), ('q3', ''): ('q3',)}, 'q0', ['q2'])
+        self.assertTrue(nfa.is_unambiguous())
+
+    def test_agrees_with_count_runs(self):
+        for regex in ('a*b*', '(a+b)*', '(ab+a)(ba+a)', 'a*(b+c)*', '(a+ab)(b+bb)', '((a*)+(b*))*'):
+            nfa = regex_to_nfa(regex)
+            max_runs = max(nfa.count_runs(word) for word in words_to_length(4, nfa.alphabet))
+            self.assertEqual(nfa.is_unambiguous(), max_runs <= 1, regex)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from autolang import NFA, regex_to_nfa
+from autolang.backend.machines.nfa_antichain import insert_minimal
+
+class TestInsertMinimal(unittest.TestCase):
+
+    def test_insert_minimal(self):
+        antichain = []
+        self.assertTrue(insert_minimal(antichain, 0b110))
+        self.assertFalse(insert_minimal(antichain, 0b111)) # Superset is subsumed
+        self.assertTrue(insert_minimal(antichain, 0b001)) # Incomparable
+        self.assertTrue(insert_minimal(antichain, 0b010)) # Subset replaces 0b110
+        self.assertEqual(set(antichain), {0b001, 0b010})
+
+
+class TestUniversality(unittest.TestCase):
+
+    def test_universal(self):
+        self.assertTrue(regex_to_nfa('(a+b)*').is_universal())
+        self.assertTrue(regex_to_nfa('(a*b*)*').is_universal())
+        self.assertTrue(regex_to_nfa('').is_universal()) # Empty alphabet, accepts ''
+
+    def test_not_universal(self):
+        self.assertFalse(regex_to_nfa('a*b*').is_universal())
+        self.assertEqual(regex_to_nfa('a*b*').universal_counterexample(), 'ba')
+        self.assertEqual(regex_to_nfa('a(a+b)*').universal_counterexample(), '')
+        self.assertEqual(regex_to_nfa('(a+b)*a').universal_counterexample(), '')
+
+    def test_counterexample_is_rejected(self):
+        nfa = regex_to_nfa('(a+b)*a(a+b)(a+b)+b*')
+        word = nfa.universal_counterexample()
+        self.assertIsNotNone(word)
+        self.assertFalse(nfa.accepts(word))
+
+
+class TestInclusion(unittest.TestCase):
+
+    def test_subset(self):
+        self.assertTrue(regex_to_nfa('ab*').is_subset_of(regex_to_nfa('(a+b)*')))
+        self.assertTrue(regex_to_nfa('(ab)*').is_subset_of(regex_to_nfa('(a+b)*')))
+        self.assertTrue(regex_to_nfa('a*').is_subset_of(regex_to_nfa('(aa)*+a(aa)*')))
+
+    def test_not_subset(self):
+        self.assertFalse(regex_to_nfa('(a+b)*').is_subset_of(regex_to_nfa('ab*')))
+        self.assertEqual(regex_to_nfa('(a+b)*').subset_counterexample(regex_to_nfa('ab*')), '')
+        self.assertEqual(regex_to_nfa('a*b').subset_counterexample(regex_to_nfa('b+ab')), 'aab')
+
+    def test_letters_missing_from_other(self):
+        self.assertEqual(regex_to_nfa('a+c').subset_counterexample(regex_to_nfa('a+b')), 'c')
+
+    def test_epsilon_transitions(self):
+        # Example 1 in examples/nfa_examples.py
+        nfa = NFA({
+            ('q1', '0'): ('q1',), 
+            ('q1', '1'): ('q1', 'q2'), 
+            ('q2', ''): ('q3',),
+            ('q2', '0'): ('q3',),
+            ('q3', '1'): ('q4',),
+            ('q4', '0'): ('q4',),
+            ('q4', '1'): ('q4',) 
+        }, 'q1', ['q4'])
+        self.assertTrue(nfa.is_subset_of(regex_to_nfa('(0+1)*((11)+(101))(0+1)*')))
+        self.assertTrue(regex_to_nfa('(0+1)*((11)+(101))(0+1)*').is_subset_of(nfa))
+        self.assertEqual(nfa.subset_counterexample(regex_to_nfa('(0+1)*11(0+1)*')), '101')
+
+    def test_invalid_other(self):
+        with self.assertRaises(TypeError):
+            regex_to_nfa('a').is_subset_of('a')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from autolang import NFA
+from setup_automata import nfa1
+from autolang.backend.machines import nfa_batch
+from autolang.backend.utils import words_to_length
+from autolang.backend.machines.settings_machines import NFA_COMPILE_MAX_STATES
+
+class TestAcceptsMany(unittest.TestCase):
+
+    def setUp(self):
+        self.nfa = NFA(nfa1.transition.function, nfa1.start, nfa1.accept) # Fresh copy, since tests change it
+        # Mixed lengths, plus unrecognised letters
+        self.words = list(words_to_length(6, '01')) + ['0x11', 'x', '11' * 20]
+
+    def expected(self):
+        return tuple(self.nfa.accepts(word, mode='set') for word in self.words)
+
+    def test_pure_python(self):
+        self.assertEqual(self.nfa.accepts_many(self.words, use_numpy=False), self.expected())
+
+    @unittest.skipIf(nfa_batch.np is None, 'NumPy not installed')
+    def test_numpy(self):
+        self.assertEqual(self.nfa.accepts_many(self.words, use_numpy=True), self.expected())
+
+    @unittest.skipIf(nfa_batch.np is None, 'NumPy not installed')
+    def test_numpy_epsilon_only(self):
+        nfa = NFA({('q0', ''): ('q1',)}, 'q0', ['q1']) # Empty alphabet
+        self.assertEqual(nfa.accepts_many(['', 'a'], use_numpy=True), (True, False))
+
+    @unittest.skipIf(nfa_batch.np is None, 'NumPy not installed')
+    def test_matrices_cached(self):
+        self.nfa.accepts_many(self.words, use_numpy=True)
+        matrices = self.nfa.compile().matrices
+        self.assertEqual(len(matrices), len(self.nfa.alphabet))
+        self.nfa.accepts_many(['0110'], use_numpy=True)
+        self.assertIs(self.nfa.compile().matrices, matrices)
+
+    def test_large_not_compiled(self):
+        n = NFA_COMPILE_MAX_STATES + 1
+        chain = NFA({('s' + str(i), 'a'): ('s' + str(i + 1),) for i in range(n)}, 's0', ['s' + str(n)])
+        self.assertEqual(chain.accepts_many(['a' * n, 'a']), (True, False))
+        self.assertIsNone(chain._compiled)
+
+    def test_empty_batch(self):
+        self.assertEqual(self.nfa.accepts_many([]), tuple())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from autolang import NFA
+from setup_automata import nfa1
+from autolang.backend.machines.nfa_bitset import BitsetNFA, bits_of
+from autolang.backend.machines.settings_machines import DEFAULT_NFA_MODE, NFA_COMPILE_MAX_STATES
+
+class TestBitsOf(unittest.TestCase):
+
+    def test_bits_of(self):
+        self.assertEqual(list(bits_of(0)), [])
+        self.assertEqual(list(bits_of(0b1)), [0])
+        self.assertEqual(list(bits_of(0b10110)), [1, 2, 4])
+
+
+class TestBitsetNFA(unittest.TestCase):
+
+    def setUp(self):
+        self.nfa = NFA(nfa1.transition.function, nfa1.start, nfa1.accept) # Fresh copy, since tests change it
+
+    def test_compile_cached(self):
+        compiled = self.nfa.compile()
+        self.assertIsInstance(compiled, BitsetNFA)
+        self.assertIs(self.nfa.compile(), compiled)
+
+    def test_masks(self):
+        compiled = self.nfa.compile()
+        self.assertEqual(compiled.to_states(compiled.to_mask({'q1', 'q3'})), {'q1', 'q3'})
+        self.assertEqual(compiled.to_states(compiled.closure(compiled.to_mask({'q2'}))), {'q2', 'q3'})
+        self.assertEqual(compiled.to_states(compiled.start), {'q1'})
+
+    def test_step(self):
+        compiled = self.nfa.compile()
+        # Successors are ε-closed, so reading '1' from q1 also reaches q3
+        self.assertEqual(compiled.to_states(compiled.step(compiled.start, '1')), {'q1', 'q2', 'q3'})
+
+    def test_accepts_matches_set_mode(self):
+        for word in self.nfa.L(8, mode='set'):
+            self.assertTrue(self.nfa.accepts(word, mode='bitset'))
+        for word in ('', '0', '1', '01', '10', '0x11'):
+            self.assertFalse(self.nfa.accepts(word, mode='bitset'))
+
+    def test_language_order(self):
+        self.assertEqual(self.nfa.L(8, mode='bitset'), self.nfa.L(8, mode='set'))
+        self.assertEqual(tuple(self.nfa.L(8, lazy=True, mode='bitset')), self.nfa.L(8, mode='set'))
+
+    def test_accept_changed_in_place(self):
+        nfa = NFA({('q0', 'a'): ('q1',), ('q1', 'b'): ('q2',)}, 'q0', {'q2'})
+        self.assertFalse(nfa.accepts('a'))
+        nfa.accept.add('q1')
+        self.assertTrue(nfa.accepts('a'))
+        self.assertTrue(nfa.accepts('a', mode='lazy'))
+        self.assertEqual(nfa.L(2), ('a', 'ab'))
+        self.assertEqual(nfa.L(2), nfa.L(2, mode='set'))
+        nfa.accept.clear()
+        self.assertTrue(nfa.is_subset_of(NFA({('q0', 'a'): tuple()}, 'q0', set())))
+
+    def test_reassignment_invalidates(self):
+        compiled = self.nfa.compile()
+        self.assertTrue(self.nfa.accepts('11'))
+        self.nfa.accept = {'q1'}
+        self.assertIsNot(self.nfa.compile(), compiled)
+        self.assertTrue(self.nfa.accepts('0'))
+        compiled = self.nfa.compile()
+        self.nfa.start = 'q4'
+        self.nfa.accept = {'q4'}
+        self.assertIsNot(self.nfa.compile(), compiled)
+        self.assertTrue(self.nfa.accepts('', mode='bitset'))
+        self.assertEqual(self.nfa.L(6, mode='bitset'), self.nfa.L(6, mode='set'))
+
+    def test_default_mode_by_size(self):
+        self.assertEqual(self.nfa.check_mode(None), DEFAULT_NFA_MODE)
+        n = NFA_COMPILE_MAX_STATES + 1
+        chain = NFA({('s' + str(i), 'a'): ('s' + str(i + 1),) for i in range(n)}, 's0', ['s' + str(n)])
+        self.assertEqual(chain.check_mode(None), 'set')
+        self.assertTrue(chain.accepts('a' * n))
+        self.assertIsNone(chain._compiled) # Not compiled unless asked for
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            self.nfa.accepts('11', mode='xyz')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from autolang import NFA, regex_to_nfa
+from autolang.backend.machines.structs_transition import TransitionNFA
+from autolang.backend.machines.nfa_epsilon import epsilon_closures
+
+class TestEpsilonClosures(unittest.TestCase):
+
+    def test_closures(self):
+        transition = TransitionNFA({
+            ('q0', ''): ('q1',),
+            ('q1', ''): ('q0', 'q2'), # ε-cycle q0 <-> q1
+            ('q2', 'a'): ('q3',)
+        })
+        closures, representative = epsilon_closures(transition)
+        self.assertEqual(closures['q0'], {'q0', 'q1', 'q2'})
+        self.assertEqual(closures['q1'], {'q0', 'q1', 'q2'})
+        self.assertEqual(closures['q2'], {'q2'})
+        self.assertEqual(closures['q3'], {'q3'})
+        self.assertEqual(representative['q0'], representative['q1'])
+        self.assertNotEqual(representative['q2'], representative['q0'])
+
+
+class TestRemoveEpsilon(unittest.TestCase):
+
+    def assert_epsilon_free(self, nfa: NFA):
+        for (state, letter), next_states in nfa.transition.items():
+            if letter == '':
+                self.assertEqual(next_states, tuple())
+
+    def test_nfa_1(self):
+        # Example 1 in examples/nfa_examples.py
+        nfa = NFA({
+            ('q1', '0'): ('q1',), 
+            ('q1', '1'): ('q1', 'q2'), 
+            ('q2', ''): ('q3',),
+            ('q2', '0'): ('q3',),
+            ('q3', '1'): ('q4',),
+            ('q4', '0'): ('q4',),
+            ('q4', '1'): ('q4',) 
+        }, 'q1', ['q4'])
+        new = nfa.remove_epsilon()
+        self.assert_epsilon_free(new)
+        self.assertEqual(new.L(8), nfa.L(8))
+
+    def test_from_regex(self):
+        for regex in ('', 'a*', '(a+b)*', '((a*)+(b*))*', '(a(b+c)*)d', 'a*(b+c)*'):
+            nfa = regex_to_nfa(regex)
+            new = nfa.remove_epsilon()
+            self.assert_epsilon_free(new)
+            self.assertEqual(new.alphabet, nfa.alphabet)
+            self.assertLessEqual(len(new.states), len(nfa.states))
+            self.assertEqual(new.L(5), nfa.L(5))
+
+    def test_drops_unreachable(self):
+        nfa = NFA({
+            ('q0', ''): ('q1',),
+            ('q1', 'a'): ('q2',),
+            ('q3', 'a'): ('q2',) # q3 is never reached
+        }, 'q0', ['q2'])
+        new = nfa.remove_epsilon()
+        self.assertNotIn('q3', new.states)
+        self.assertNotIn('q1', new.states) # Only reachable via ε
+        self.assertEqual(new.L(3), ('a',))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from autolang import NFA
+from setup_automata import nfa1
+from autolang.backend.machines.nfa_lazy import LazyDFA
+
+class TestLazyDFA(unittest.TestCase):
+
+    def setUp(self):
+        self.nfa = NFA(nfa1.transition.function, nfa1.start, nfa1.accept) # Fresh copy, since tests change it
+
+    def test_lazy_dfa_cached(self):
+        lazy = self.nfa.lazy_dfa()
+        self.assertIsInstance(lazy, LazyDFA)
+        self.assertIs(self.nfa.lazy_dfa(), lazy)
+
+    def test_accepts_matches_set_mode(self):
+        self.assertEqual(self.nfa.L(8, mode='lazy'), self.nfa.L(8, mode='set'))
+        self.assertTrue(self.nfa.accepts('0110', mode='lazy'))
+        self.assertFalse(self.nfa.accepts('0x11', mode='lazy'))
+
+    def test_wraps_compiled(self):
+        compiled = self.nfa.compile()
+        lazy = LazyDFA(compiled)
+        self.assertIs(lazy.compiled, compiled)
+        self.assertIs(lazy.successors, compiled.successors) # Shared, not copied
+        self.assertEqual(lazy.to_states(lazy.step(lazy.start, '1')), compiled.to_states(compiled.step(compiled.start, '1')))
+
+    def test_cache_reused(self):
+        lazy = LazyDFA(self.nfa.compile())
+        lazy.accepts('0101')
+        misses = lazy.cache_info()['misses']
+        lazy.accepts('0101')
+        self.assertEqual(lazy.cache_info()['misses'], misses) # Second run only hits the cache
+        self.assertEqual(lazy.cache_info()['hits'], 4)
+
+    def test_cache_flush(self):
+        lazy = LazyDFA(self.nfa.compile(), cache_size=2)
+        self.assertTrue(lazy.accepts('0110101'))
+        info = lazy.cache_info()
+        self.assertLessEqual(info['size'], 2)
+        self.assertGreater(info['flushes'], 0)
+        self.assertEqual(tuple(lazy.language(6)), self.nfa.L(6, mode='set')) # Still correct after flushing
+
+    def test_invalid_cache_size(self):
+        with self.assertRaises(ValueError):
+            LazyDFA(self.nfa.compile(), cache_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from autolang import NFA, regex_to_nfa
+from autolang.backend.machines.nfa_reduce import coarsest_bisimulation
+
+class TestCoarsestBisimulation(unittest.TestCase):
+
+    def test_partition(self):
+        # q1 and q2 both loop on 'a' into accepting q3, q0 must stay separate
+        states = ('q0', 'q1', 'q2', 'q3')
+        edges = {'q0': [('a', 'q1'), ('b', 'q2')], 'q1': [('a', 'q3')], 'q2': [('a', 'q3')]}
+        block_of = coarsest_bisimulation(states, edges, {'q0': 0, 'q1': 0, 'q2': 0, 'q3': 1})
+        self.assertEqual(block_of['q1'], block_of['q2'])
+        self.assertNotEqual(block_of['q0'], block_of['q1'])
+        self.assertNotEqual(block_of['q3'], block_of['q1'])
+
+    def test_split_into_several_parts(self):
+        # q1 and q4 look alike until q5 splits off from q2 and q3, which must then be reflected back through q4
+        states = tuple(f'q{i}' for i in range(7))
+        edges = {'q1': [('a', 'q0')],
+                 'q2': [('b', 'q3'), ('b', 'q2'), ('a', 'q3'), ('b', 'q5')],
+                 'q3': [('a', 'q5'), ('b', 'q5'), ('b', 'q2'), ('b', 'q3')],
+                 'q4': [('a', 'q2')],
+                 'q5': [('a', 'q4'), ('b', 'q0')]}
+        block_of = coarsest_bisimulation(states, edges, dict.fromkeys(states, 0))
+        self.assertEqual(len(set(block_of.values())), 6)
+        self.assertEqual(block_of['q0'], block_of['q6'])
+
+    def test_long_chain(self):
+        # Every state is distinguished by its distance to the accept state, which needs n rounds of splitting
+        n = 5000
+        states = tuple(f'q{i}' for i in range(n))
+        edges = {states[i]: [('a', states[i + 1])] for i in range(n - 1)}
+        block_of = coarsest_bisimulation(states, edges, {state: int(state == states[-1]) for state in states})
+        self.assertEqual(len(set(block_of.values())), n)
+
+
+class TestReduce(unittest.TestCase):
+
+    def test_forward(self):
+        # Two identical branches after 'a'
+        nfa = NFA({
+            ('q0', 'a'): ('q1', 'q2'),
+            ('q1', 'b'): ('q3',),
+            ('q2', 'b'): ('q4',),
+        }, 'q0', ['q3', 'q4'])
+        reduced = nfa.reduce()
+        self.assertEqual(set(reduced.states), {'q0', 'q1', 'q3'})
+        self.assertEqual(reduced.L(4), nfa.L(4))
+
+    def test_backward(self):
+        # Not forward bisimilar, but q1 and q2 are both only reached by 'a' from start
+        nfa = NFA({
+            ('q0', 'a'): ('q1', 'q2'),
+            ('q1', 'b'): ('q3',),
+            ('q2', 'c'): ('q3',),
+        }, 'q0', ['q3'])
+        self.assertEqual(len(nfa.reduce().states), 4)
+        reduced = nfa.reduce(backward=True)
+        self.assertEqual(len(reduced.states), 3)
+        self.assertEqual(reduced.L(4), nfa.L(4))
+
+    def test_from_regex(self):
+        for regex in ('', 'a*', '(a+b)*', '((a*)+(b*))*', '(a(b+c)*)d', 'ab+ab', 'a*(b+c)*'):
+            nfa = regex_to_nfa(regex)
+            for backward in (False, True):
+                reduced = nfa.reduce(backward)
+                self.assertLessEqual(len(reduced.states), len(nfa.states))
+                self.assertEqual(reduced.alphabet, nfa.alphabet)
+                self.assertEqual(reduced.L(5), nfa.L(5))
+
+    def test_epsilon_transitions(self):
+        nfa = NFA({
+            ('q0', ''): ('q1', 'q2'),
+            ('q1', 'a'): ('q3',),
+            ('q2', 'a'): ('q3',)
+        }, 'q0', ['q3'])
+        reduced = nfa.reduce()
+        self.assertEqual(len(reduced.states), 3)
+        self.assertEqual(reduced.L(3), ('a',))
+
+
+if __name__ == '__main__':
+    unittest.main()
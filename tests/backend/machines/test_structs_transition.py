@@ -1,5 +1,5 @@
 import unittest
-from autolang.backend.machines.structs_transition import TransitionDFA, TransitionNFA, TransitionPDA, TransitionTM
+from autolang.backend.machines.structs_transition import TransitionDFA, TransitionNFA, TransitionPDA, TransitionTM, pad_transition_nfa
 
 class TestTransitionDFA(unittest.TestCase):
 
@@ -211,6 +211,63 @@ class TestTransitionNFA(unittest.TestCase):
         self.assertIn(('q1',), tran.values())
 
 
+class TestCompactTransitionNFA(unittest.TestCase):
+
+    def setUp(self):
+        self.function = {
+            ('q0', 'a'): ('q0', 'q1'),
+            ('q0', ''): ('q2',),
+            ('q1', 'b'): tuple(), # Empty entry must still be present
+            ('q2', 'a'): ('q1',)
+        }
+
+    def test_matches_dict(self):
+        compact = TransitionNFA(self.function, compact=True)
+        plain = TransitionNFA(self.function)
+        self.assertEqual(compact.states, plain.states)
+        self.assertEqual(compact.alphabet, plain.alphabet)
+        self.assertEqual(compact.function, self.function)
+        self.assertEqual(dict(compact.items()), dict(plain.items()))
+        self.assertEqual(sorted(compact.values()), sorted(plain.values()))
+
+    def test_lookup(self):
+        compact = TransitionNFA(self.function, compact=True)
+        self.assertEqual(compact[('q0', 'a')], ('q0', 'q1'))
+        self.assertEqual(compact.get(('q0', '')), ('q2',))
+        self.assertEqual(compact.get(('q1', 'b')), tuple())
+        self.assertEqual(compact.get(('q1', 'a')), tuple())
+        self.assertEqual(compact.get(('qx', 'a'), None), None)
+        self.assertIn(('q1', 'b'), compact)
+        self.assertNotIn(('q1', 'a'), compact)
+        with self.assertRaises(KeyError):
+            compact[('q1', 'a')]
+
+    def test_successors(self):
+        compact = TransitionNFA(self.function, compact=True)
+        i = compact.state_index['q0']
+        k = compact.letter_index['a']
+        self.assertEqual(list(compact.successors(i, k)), [compact.state_index['q0'], compact.state_index['q1']])
+
+    def test_invalid(self):
+        with self.assertRaises(TypeError):
+            TransitionNFA({('q0', 'a'): 'q1'}, compact=True)
+
+
+class TestPadTransitionNFA(unittest.TestCase):
+
+    def test_pad(self):
+        function = pad_transition_nfa({('q0', 'a'): ('q1',)}, ('q0', 'q1', 'q2'), ('a', 'b'))
+        transition = TransitionNFA(function)
+        self.assertEqual(set(transition.states), {'q0', 'q1', 'q2'})
+        self.assertEqual(set(transition.alphabet), {'a', 'b'})
+        self.assertEqual(transition.get(('q0', 'b')), tuple())
+
+    def test_lone_state(self):
+        transition = TransitionNFA(pad_transition_nfa({}, ('q0',), tuple()))
+        self.assertEqual(transition.states, ('q0',))
+        self.assertEqual(transition.alphabet, tuple())
+
+
 class TestTransitionPDA(unittest.TestCase):
     
     def setUp(self):
@@ -0,0 +1,72 @@
+import unittest
+from autolang import DFA, NFA, regex_to_nfa, nfa_to_dfa
+
+class TestTrimDFA(unittest.TestCase):
+
+    def setUp(self):
+        # q3 is unreachable, d1 and d2 are dead
+        self.dfa = DFA({
+            ('q0', 'a'): 'q1',
+            ('q0', 'b'): 'd1',
+            ('q1', 'a'): 'q1',
+            ('q1', 'b'): 'd2',
+            ('d1', 'a'): 'd2',
+            ('d1', 'b'): 'd1',
+            ('d2', 'a'): 'd1',
+            ('d2', 'b'): 'd2',
+            ('q3', 'a'): 'q0',
+            ('q3', 'b'): 'q3'
+        }, 'q0', ['q1', 'q3'])
+
+    def test_trim(self):
+        trimmed = self.dfa.trim()
+        self.assertEqual(set(trimmed.states), {'q0', 'q1', 'd1'}) # Single sink kept
+        self.assertEqual(trimmed.accept, {'q1'})
+        self.assertEqual(trimmed.L(6), self.dfa.L(6))
+
+    def test_no_sink_needed(self):
+        dfa = DFA({('q0', 'a'): 'q0', ('q1', 'a'): 'q0'}, 'q0', ['q0'])
+        self.assertEqual(dfa.trim().states, ('q0',))
+
+    def test_empty_language(self):
+        dfa = DFA({('q0', 'a'): 'q1', ('q1', 'a'): 'q0'}, 'q0', [])
+        trimmed = dfa.trim()
+        self.assertEqual(trimmed.states, ('q0',))
+        self.assertEqual(trimmed.alphabet, ('a',))
+        self.assertEqual(trimmed.L(4), tuple())
+
+    def test_subset_construction(self):
+        dfa = nfa_to_dfa(regex_to_nfa('ab*'))
+        trimmed = dfa.trim()
+        self.assertLessEqual(len(trimmed.states), len(dfa.states))
+        self.assertEqual(trimmed.L(6), dfa.L(6))
+
+
+class TestTrimNFA(unittest.TestCase):
+
+    def test_trim(self):
+        nfa = NFA({
+            ('q0', 'a'): ('q1', 'q2'),
+            ('q1', ''): ('q3',),
+            ('q2', 'b'): ('q2',), # q2 is dead
+            ('q4', 'a'): ('q3',) # q4 is unreachable
+        }, 'q0', ['q3'])
+        trimmed = nfa.trim()
+        self.assertEqual(set(trimmed.states), {'q0', 'q1', 'q3'})
+        self.assertEqual(trimmed.alphabet, nfa.alphabet)
+        self.assertEqual(trimmed.L(4), nfa.L(4))
+
+    def test_empty_language(self):
+        nfa = NFA({('q0', 'a'): ('q1',)}, 'q0', [])
+        trimmed = nfa.trim()
+        self.assertEqual(trimmed.states, ('q0',))
+        self.assertEqual(trimmed.L(3), tuple())
+
+    def test_from_regex(self):
+        for regex in ('', 'a*', '(a+b)*', 'a(b+c)'):
+            nfa = regex_to_nfa(regex)
+            self.assertEqual(nfa.trim().L(5), nfa.L(5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from autolang import regex_to_nfa
+from autolang.backend.regex.antimirov import ConstructAntimirov
+from autolang.backend.regex.regex_ast import Symbol, Epsilon, Concat, Star
+from autolang.backend.regex.regex_input import parse_regex
+
+REGEXES = ['', 'a', 'a+b', 'ab', 'a*', '(a+b)*', 'a(b+c)*d', '((a*)+(b*))*', '(ab+c)*(a+b)', 'a+a', '(a+b)*a(a+b)(a+b)']
+
+class TestConstructAntimirov(unittest.TestCase):
+
+    def test_linear_form(self):
+        construction = ConstructAntimirov(parse_regex('a*b'))
+        a, b = Symbol('a'), Symbol('b')
+        self.assertEqual(construction.linear_form(parse_regex('a*b')), {('a', Concat(Star(a), b)), ('b', Epsilon())})
+
+    def test_construct(self):
+        construction = ConstructAntimirov(parse_regex('(a+b)*a'))
+        self.assertEqual(construction.construct(), {
+            ('d0', 'a'): ('d0', 'd1'),
+            ('d0', 'b'): ('d0',)
+        })
+        self.assertEqual(construction.accept, {'d1'})
+
+    def test_no_larger_than_glushkov(self):
+        for regex in REGEXES:
+            antimirov = regex_to_nfa(regex, method='antimirov')
+            glushkov = regex_to_nfa(regex, method='glushkov')
+            self.assertLessEqual(len(antimirov.transition.states), len(glushkov.transition.states))
+            self.assertFalse(any(antimirov.transition.get((state, '')) for state in antimirov.transition.states))
+            self.assertEqual(antimirov.L(5), glushkov.L(5))
+
+    def test_deep(self):
+        nfa = regex_to_nfa('a' * 3000, method='antimirov')
+        self.assertEqual(len(nfa.transition.states), 3001)
+        self.assertTrue(nfa.accepts('a' * 3000))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
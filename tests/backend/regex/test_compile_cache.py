@@ -0,0 +1,81 @@
+import unittest
+import copy
+from autolang import regex_to_nfa, regex_to_dfa
+from autolang.backend.regex.compile_cache import CompileCache, normalise_regex
+
+class TestCompileCache(unittest.TestCase):
+
+    def setUp(self):
+        regex_to_nfa.clear_cache()
+
+    def tearDown(self):
+        regex_to_nfa.clear_cache()
+
+    def test_hits_and_misses(self):
+        regex_to_nfa('(a+b)*c')
+        regex_to_nfa('( a + b ) * c') # Same regex up to spaces
+        regex_to_nfa('(a+b)*c', method='glushkov') # Different options
+        regex_to_dfa('(a+b)*c')
+        info = regex_to_nfa.cache_info()
+        self.assertEqual((info['hits'], info['misses'], info['size']), (1, 3, 3))
+        self.assertEqual(regex_to_dfa.cache_info(), info) # Shared cache
+        regex_to_dfa.clear_cache()
+        self.assertEqual(regex_to_nfa.cache_info()['size'], 0)
+
+    def test_copies(self):
+        nfa1 = regex_to_nfa('ab*')
+        nfa1.start = 't'
+        nfa2 = regex_to_nfa('ab*')
+        self.assertIsNot(nfa1, nfa2)
+        self.assertEqual(nfa2.start, 's0')
+        self.assertEqual(set(nfa2.L(3)), {'a', 'ab', 'abb'})
+        nfa2.accept.clear()
+        self.assertEqual(set(regex_to_nfa('ab*').L(3)), {'a', 'ab', 'abb'})
+        dfa1 = regex_to_dfa('ab*')
+        dfa1.accept.clear()
+        self.assertEqual(set(regex_to_dfa('ab*').L(3)), {'a', 'ab', 'abb'})
+
+    def test_copies_share_transition(self):
+        nfa1 = regex_to_nfa('(a+b)*c')
+        nfa2 = regex_to_nfa('(a+b)*c')
+        self.assertIs(nfa1.transition, nfa2.transition)
+        self.assertIsNot(nfa1.accept, nfa2.accept)
+        compiled = nfa1.compile()
+        nfa3 = copy.copy(nfa1)
+        self.assertIs(nfa3.compile().successors, compiled.successors) # Precomputed part is shared
+        nfa3.accept.add(nfa3.start)
+        self.assertTrue(nfa3.accepts(''))
+        self.assertFalse(nfa1.accepts(''))
+        nfa3.start = nfa3.states[-1]
+        self.assertIsNot(nfa3.compile(), compiled)
+        self.assertIs(nfa1.compile(), compiled)
+
+    def test_invalid_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                regex_to_nfa('a+')
+        self.assertEqual(regex_to_nfa.cache_info()['size'], 0)
+        with self.assertRaises(ValueError):
+            regex_to_nfa(' ')
+        regex_to_nfa('')
+        with self.assertRaises(ValueError):
+            regex_to_nfa(' ')
+
+    def test_lru_eviction(self):
+        cache = CompileCache(maxsize=2)
+        cache.lookup('a', lambda: ['a'])
+        cache.lookup('b', lambda: ['b'])
+        cache.lookup('a', lambda: ['a']) # 'a' is now most recent
+        cache.lookup('c', lambda: ['c']) # Evicts 'b'
+        self.assertEqual(list(cache.machines), ['a', 'c'])
+        with self.assertRaises(ValueError):
+            CompileCache(maxsize=0)
+
+    def test_normalise(self):
+        self.assertEqual(normalise_regex(' a + b '), 'a+b')
+        self.assertEqual(normalise_regex(''), '')
+        self.assertEqual(normalise_regex('  '), '  ')
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,45 @@
+import unittest
+from autolang import regex_to_dfa
+from autolang.backend.regex.compositional import ConstructCompositional
+from autolang.backend.regex.regex_input import parse_regex
+
+REGEXES = ['a', 'a+b', 'ab', 'a*', '(a+b)*', 'a(b+c)*d', '((a*)+(b*))*', '(ab+c)*(a+b)', 'a+a', '(a+b)*a(a+b)(a+b)',
+           'a∅+b', '(a+ε)b', '∅*a', '[a-c]{2,4}d?', '(ab){2,}', '(a?b){0,2}']
+
+class TestConstructCompositional(unittest.TestCase):
+
+    def test_to_dfa_args(self):
+        transition, start, accept = ConstructCompositional(parse_regex('ab*')).to_dfa_args()
+        self.assertEqual(start, 'q0')
+        self.assertEqual(transition, {
+            ('q0', 'a'): 'q1',
+            ('q0', 'b'): 'q2',
+            ('q1', 'a'): 'q2',
+            ('q1', 'b'): 'q1',
+            ('q2', 'a'): 'q2',
+            ('q2', 'b'): 'q2'
+        })
+        self.assertEqual(accept, {'q1'})
+
+    def test_language(self):
+        for regex in REGEXES:
+            compositional = regex_to_dfa(regex, method='compositional')
+            subset = regex_to_dfa(regex, method='subset')
+            self.assertEqual(compositional.L(6), subset.L(6))
+            self.assertEqual(len(compositional.states), len(subset.minimise().states)) # Already minimal
+
+    def test_intermediate_size(self):
+        # Union of many words, where every subexpression stays close to its own minimal size
+        words = ['abc', 'abd', 'acd', 'bcd', 'bca', 'cab', 'cba', 'dab']
+        construction = ConstructCompositional(parse_regex('+'.join(words)))
+        delta, _ = construction.construct()
+        self.assertLessEqual(construction.largest, len(delta) + 2)
+
+    def test_shared_subtrees(self):
+        construction = ConstructCompositional(parse_regex('(a+b)*c(a+b)*'))
+        construction.construct()
+        self.assertEqual(len(construction.memo), 7) # a, b, c, a+b, (a+b)*, c(a+b)*, and the whole regex
+
+
+if __name__ == '__main__':
+    unittest.main()
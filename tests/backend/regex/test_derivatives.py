@@ -0,0 +1,110 @@
+import unittest
+from autolang import RegexMatcher, regex_to_nfa
+from autolang.backend.regex.derivatives import union_of, concat_of, star_of, nullable, derivative
+from autolang.backend.regex.regex_ast import Symbol, Epsilon, Empty, Union, Concat, Star
+from autolang.backend.regex.regex_input import parse_regex
+
+REGEXES = ['', 'a', 'a+b', 'ab', 'a*', '(a+b)*', 'a(b+c)*d', '((a*)+(b*))*', '(ab+c)*(a+b)', '(a+b)*a(a+b)(a+b)']
+
+class TestSmartConstructors(unittest.TestCase):
+
+    def test_union(self):
+        a, b, c = Symbol('a'), Symbol('b'), Symbol('c')
+        self.assertIs(union_of(a, a), a)
+        self.assertIs(union_of(a, Empty()), a)
+        self.assertIs(union_of(Empty(), Empty()), Empty())
+        self.assertIs(union_of(a, b), union_of(b, a))
+        self.assertIs(union_of(union_of(a, b), c), union_of(a, union_of(c, b)))
+        # Left-nested unions built directly, not by `union_of()`, are flattened too
+        self.assertIs(union_of(Union(Union(a, b), c), a), union_of(a, union_of(b, c)))
+
+    def test_concat(self):
+        a, b, c = Symbol('a'), Symbol('b'), Symbol('c')
+        self.assertIs(concat_of(a, Epsilon()), a)
+        self.assertIs(concat_of(Epsilon(), a), a)
+        self.assertIs(concat_of(a, Empty()), Empty())
+        self.assertIs(concat_of(Concat(a, b), c), Concat(a, Concat(b, c)))
+
+    def test_star(self):
+        a = Symbol('a')
+        self.assertIs(star_of(Star(a)), Star(a))
+        self.assertIs(star_of(Epsilon()), Epsilon())
+        self.assertIs(star_of(Empty()), Epsilon())
+
+
+class TestDerivative(unittest.TestCase):
+
+    def test_nullable(self):
+        memo = {}
+        self.assertTrue(nullable(parse_regex('a*b*'), memo))
+        self.assertFalse(nullable(parse_regex('a*b'), memo))
+        self.assertTrue(nullable(Epsilon(), memo))
+        self.assertFalse(nullable(Empty(), memo))
+
+    def test_derivative(self):
+        a, b = Symbol('a'), Symbol('b')
+        self.assertIs(derivative(parse_regex('ab'), 'a', {}, {}), b)
+        self.assertIs(derivative(parse_regex('ab'), 'b', {}, {}), Empty())
+        self.assertIs(derivative(parse_regex('a*'), 'a', {}, {}), Star(a))
+        self.assertIs(derivative(parse_regex('a*b'), 'b', {}, {}), Epsilon())
+        self.assertIs(derivative(parse_regex('a+ab'), 'a', {}, {}), union_of(Epsilon(), b))
+
+
+class TestRegexMatcher(unittest.TestCase):
+
+    def test_accepts(self):
+        for regex in REGEXES:
+            matcher = RegexMatcher(regex)
+            for word in regex_to_nfa(regex).L(5):
+                self.assertTrue(matcher.accepts(word))
+            nfa = regex_to_nfa(regex)
+            for word in ('abc', 'ba', 'aaaaab', 'x'):
+                self.assertEqual(matcher.accepts(word), nfa.accepts(word))
+
+    def test_extended_syntax(self):
+        matcher = RegexMatcher('[a-c]{2,3}d?')
+        for word in ('ab', 'cab', 'bbd', 'abcd'):
+            self.assertTrue(matcher.accepts(word))
+        for word in ('a', 'abca', 'dd', 'ad', 'abcde'):
+            self.assertFalse(matcher.accepts(word))
+        self.assertTrue(RegexMatcher('(ab){3,}').accepts('ab' * 40))
+
+    def test_finitely_many_states(self):
+        matcher = RegexMatcher('(a+b)*a(a+b)(a+b)')
+        matcher.accepts('ab' * 500)
+        info = matcher.cache_info()
+        self.assertLess(info['size'], 100) # Derivatives repeat, so the memo stays small
+        self.assertGreater(info['hits'], 900)
+
+    def test_nested_star_collapsed(self):
+        # (R*)* and (R*){2,} have exactly the derivatives of R*, apart from themselves
+        for regex in ('((a+b)*)*', '(((a+b)*)*)*', '((a+b)*){2,}'):
+            matcher = RegexMatcher(regex)
+            plain = RegexMatcher('(a+b)*')
+            for word in ('a', 'ab', 'abba', 'babab'):
+                self.assertIs(matcher.step(matcher.tree, word[0]), plain.step(plain.tree, word[0]), regex)
+                self.assertTrue(matcher.accepts(word))
+                plain.accepts(word)
+            states = set(matcher.cache.values()) - {matcher.tree}
+            self.assertEqual(states, set(plain.cache.values()), regex)
+
+    def test_flush(self):
+        matcher = RegexMatcher('(a+b)*a(a+b)(a+b)', cache_size=2)
+        self.assertTrue(matcher.accepts('abab' * 10 + 'abb'))
+        self.assertGreater(matcher.cache_info()['flushes'], 0)
+        self.assertLessEqual(matcher.cache_info()['size'], 2) # Never over budget, even right after a derivative
+
+    def test_deep(self):
+        matcher = RegexMatcher('a' * 3000)
+        self.assertTrue(matcher.accepts('a' * 3000))
+        self.assertFalse(matcher.accepts('a' * 2999))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            RegexMatcher('a+')
+        with self.assertRaises(ValueError):
+            RegexMatcher('a', cache_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
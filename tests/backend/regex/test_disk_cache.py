@@ -0,0 +1,84 @@
+import unittest
+import tempfile
+import os
+from contextlib import closing
+from autolang import DFA, NFA, regex_to_nfa, regex_to_dfa
+from autolang.backend.regex.disk_cache import DiskCache, encode, decode
+from autolang.backend.regex.compile_cache import compile_cache
+
+class TestEncoding(unittest.TestCase):
+
+    def test_dfa(self):
+        dfa = regex_to_dfa('(a+b)*abb')
+        decoded = decode(*encode(dfa))
+        self.assertIsInstance(decoded, DFA)
+        self.assertEqual(decoded.transition.function, dfa.transition.function)
+        self.assertEqual((decoded.start, decoded.accept), (dfa.start, dfa.accept))
+
+    def test_nfa(self):
+        nfa = NFA({('q0', 'a'): ('q0', 'q1'), ('q0', ''): ('q2',), ('q1', 'b'): tuple(), ('q2', 'b'): ('q1',)}, 'q0', {'q1'})
+        decoded = decode(*encode(nfa))
+        self.assertIsInstance(decoded, NFA)
+        self.assertEqual(decoded.transition.function, nfa.transition.function)
+        self.assertEqual((decoded.start, decoded.accept), (nfa.start, nfa.accept))
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        regex_to_nfa.clear_cache()
+
+    def tearDown(self):
+        regex_to_nfa.set_disk_cache(None)
+        regex_to_nfa.clear_cache()
+        self.directory.cleanup()
+
+    def test_load_store(self):
+        cache = DiskCache(self.directory.name)
+        self.assertEqual(cache.path, os.path.join(self.directory.name, 'autolang_cache.sqlite3'))
+        self.assertIsNone(cache.load(('dfa', 'ab', 'followpos', False)))
+        cache.store(('dfa', 'ab', 'followpos', False), regex_to_dfa('ab'))
+        other = DiskCache(cache.path) # Another handle on the same file, e.g. from another process
+        other.store(('dfa', 'ab', 'followpos', False), regex_to_dfa('ab')) # Rewriting the same key is fine
+        self.assertEqual(set(other.load(('dfa', 'ab', 'followpos', False)).L(3)), {'ab'})
+        self.assertIsNone(other.load(('dfa', 'ab', 'subset', False)))
+        cache.clear()
+        self.assertIsNone(other.load(('dfa', 'ab', 'followpos', False)))
+
+    def test_persists_across_memory_cache(self):
+        regex_to_dfa.set_disk_cache(self.directory.name)
+        dfa = regex_to_dfa('(a+b)*a(a+b)')
+        nfa = regex_to_nfa('(a+b)*a(a+b)')
+        regex_to_nfa.clear_cache() # As after a restart
+        self.assertEqual(regex_to_dfa('(a+b)*a(a+b)').transition.function, dfa.transition.function)
+        self.assertEqual(regex_to_nfa('(a+b)*a(a+b)').transition.function, nfa.transition.function)
+        self.assertEqual(regex_to_nfa.cache_info()['disk_hits'], 2)
+
+    def test_sqlite_errors_fall_back(self):
+        regex_to_dfa.set_disk_cache(self.directory.name)
+        with open(os.path.join(self.directory.name, 'autolang_cache.sqlite3'), 'wb') as file:
+            file.write(b'not a database' * 100) # Corrupted after opening
+        self.assertEqual(set(regex_to_dfa('ab').L(3)), {'ab'})
+        info = regex_to_nfa.cache_info()
+        self.assertEqual((info['misses'], info['disk_hits']), (1, 0))
+        self.assertEqual(compile_cache.disk.errors, 2) # Both the load and the store failed
+
+    def test_bad_row_is_a_miss(self):
+        cache = DiskCache(self.directory.name)
+        key = ('dfa', 'ab', 'followpos', False)
+        for row in (('dfa', '{not json', b'', b''), # Corrupt meta
+                    ('dfa', '{"states": ["q0"], "alphabet": ["a"], "start": 0, "accept": []}', b'', b''), # Truncated table
+                    ('nfa', '{"states": ["q0"], "alphabet": ["a", ""], "start": 5, "accept": []}', b'', b'')): # Bad index
+            with closing(cache.connect()) as connection:
+                with connection:
+                    connection.execute('INSERT OR REPLACE INTO machines VALUES (?, ?, ?, ?, ?)', (cache.digest(key), *row))
+            self.assertIsNone(cache.load(key))
+        self.assertEqual((cache.errors, cache.misses, cache.hits), (3, 3, 0))
+        regex_to_dfa.set_disk_cache(cache.path)
+        self.assertEqual(set(regex_to_dfa('ab').L(3)), {'ab'}) # Rebuilt, and the bad row overwritten
+        self.assertEqual(set(DiskCache(cache.path).load(key).L(3)), {'ab'})
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,28 @@
+import unittest
+from autolang import regex_equivalent
+
+class TestRegexEquivalent(unittest.TestCase):
+
+    def test_equivalent(self):
+        self.assertIs(regex_equivalent('a', 'a'), True)
+        self.assertIs(regex_equivalent('a+b', 'b+a'), True)
+        self.assertIs(regex_equivalent('(a+b)*', '(a*b*)*'), True)
+        self.assertIs(regex_equivalent('(ab)*a', 'a(ba)*'), True)
+        self.assertIs(regex_equivalent('', 'ε'), True)
+        self.assertIs(regex_equivalent('a∅', '∅'), True)
+        self.assertIs(regex_equivalent('a*a*', 'a*'), True)
+
+    def test_counterexample(self):
+        self.assertEqual(regex_equivalent('a*', 'aa*'), '')
+        self.assertEqual(regex_equivalent('a', 'b'), 'a')
+        self.assertEqual(regex_equivalent('(a+b)*', '(ab)*'), 'a')
+        self.assertEqual(regex_equivalent('(ab)*', '(ab)*+abab*'), 'aba')
+        self.assertEqual(regex_equivalent('(a+b)*a(a+b)(a+b)', '(a+b)*a(a+b)'), 'aa')
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            regex_equivalent('a+', 'a')
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
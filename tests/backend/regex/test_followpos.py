@@ -0,0 +1,42 @@
+import unittest
+from autolang import regex_to_dfa
+from autolang.backend.regex.followpos import ConstructFollowpos
+from autolang.backend.regex.regex_input import parse_regex
+
+REGEXES = ['a', 'a+b', 'ab', 'a*', '(a+b)*', 'a(b+c)*d', '((a*)+(b*))*', '(ab+c)*(a+b)', 'a+a', '(a+b)*a(a+b)(a+b)']
+
+class TestConstructFollowpos(unittest.TestCase):
+
+    def test_to_dfa_args(self):
+        transition, start, accept = ConstructFollowpos(parse_regex('ab*')).to_dfa_args()
+        self.assertEqual(start, '{1}')
+        self.assertEqual(transition, {
+            ('{1}', 'a'): '{0,2}',
+            ('{1}', 'b'): '{}',
+            ('{0,2}', 'a'): '{}',
+            ('{0,2}', 'b'): '{0,2}',
+            ('{}', 'a'): '{}',
+            ('{}', 'b'): '{}'
+        })
+        self.assertEqual(accept, {'{0,2}'})
+
+    def test_nullable_start(self):
+        _, start, accept = ConstructFollowpos(parse_regex('a*')).to_dfa_args()
+        self.assertIn(start, accept)
+
+    def test_language(self):
+        for regex in REGEXES:
+            followpos = regex_to_dfa(regex, method='followpos')
+            subset = regex_to_dfa(regex, method='subset')
+            self.assertEqual(followpos.L(6), subset.L(6))
+            self.assertLessEqual(len(followpos.states), len(subset.states))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            regex_to_dfa('a+')
+        with self.assertRaises(ValueError):
+            regex_to_dfa('a', method='unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
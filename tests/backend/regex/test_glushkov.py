@@ -0,0 +1,53 @@
+import unittest
+from autolang import regex_to_nfa
+from autolang.backend.regex.glushkov import ConstructGlushkov
+from autolang.backend.regex.positions import Positions
+from autolang.backend.regex.regex_input import parse_regex
+
+REGEXES = ['', 'a', 'a+b', 'ab', 'a*', '(a+b)*', 'a(b+c)*d', '((a*)+(b*))*', '(ab+c)*(a+b)', 'a+a', '(ab)*(ab)*']
+
+class TestPositions(unittest.TestCase):
+
+    def test_positions(self):
+        positions = Positions(parse_regex('(a+b)*a'))
+        self.assertEqual(positions.letters, [None, ('a',), ('b',), ('a',)])
+        self.assertFalse(positions.nullable)
+        self.assertEqual(positions.first, 0b1110)
+        self.assertEqual(positions.last, 0b1000)
+        self.assertEqual(positions.follow, [0, 0b1110, 0b1110, 0])
+        self.assertEqual(positions.by_letter(0b1110), {'a': 0b1010, 'b': 0b0100})
+
+    def test_nullable(self):
+        self.assertTrue(Positions(parse_regex('')).nullable)
+        self.assertTrue(Positions(parse_regex('a*b*')).nullable)
+        self.assertFalse(Positions(parse_regex('a*b')).nullable)
+
+    def test_shared_subtrees(self):
+        positions = Positions(parse_regex('(ab)*(ab)*'))
+        self.assertEqual(len(positions.letters), 5) # Each occurrence is its own position
+
+
+class TestConstructGlushkov(unittest.TestCase):
+
+    def test_construct(self):
+        construction = ConstructGlushkov(parse_regex('ab*'))
+        self.assertEqual(construction.construct(), {
+            ('q0', 'a'): ('q1',),
+            ('q1', 'b'): ('q2',),
+            ('q2', 'b'): ('q2',)
+        })
+        self.assertEqual(construction.accept, {'q1', 'q2'})
+
+    def test_epsilon_free(self):
+        for regex in REGEXES:
+            nfa = regex_to_nfa(regex, method='glushkov')
+            self.assertFalse(any(nfa.transition.get((state, '')) for state in nfa.transition.states))
+            self.assertEqual(len(nfa.transition.states), len(regex.replace('(', '').replace(')', '').replace('+', '').replace('*', '')) + 1)
+
+    def test_language(self):
+        for regex in REGEXES:
+            self.assertEqual(regex_to_nfa(regex, method='glushkov').L(5), regex_to_nfa(regex, method='gnfa').L(5))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -1,5 +1,7 @@
 import unittest
 from autolang.backend.regex.gnfa import GNFA
+from autolang.backend.regex.regex_input import parse_regex
+from autolang.backend.regex.regex_ast import Symbol
 from autolang import NFA
 
 class TestGNFA(unittest.TestCase):
@@ -66,5 +68,19 @@ class TestGNFA(unittest.TestCase):
         self.assertEqual(nfa.accept, {'t'})
 
 
+class TestGNFAFromAST(unittest.TestCase):
+
+    def test_node_labels(self):
+        gnfa = GNFA(parse_regex('ab*+c'))
+        self.assertEqual(set(gnfa.alphabet), {'a', 'b', 'c'})
+        gnfa.eliminate()
+        self.assertTrue(all(label.kind in ('symbol', 'epsilon') for _, _, label in gnfa.edges))
+        self.assertIn(('s0', 't', Symbol('c')), gnfa.edges)
+        nfa = gnfa.to_nfa()
+        self.assertEqual(set(nfa.L(3)), {'a', 'ab', 'abb', 'c'})
+        # Same NFA as the string path
+        self.assertEqual(nfa.transition.function, GNFA('a.b*+c').to_nfa().transition.function)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
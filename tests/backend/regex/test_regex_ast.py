@@ -0,0 +1,99 @@
+import unittest
+import copy
+import pickle
+from autolang.backend.regex.regex_ast import Symbol, Epsilon, Union, Concat, Star, Repeat, CharClass, postorder, alphabet_of_node, to_string, expand_extended
+from autolang.backend.regex.regex_input import RegexParserInput, parse_regex
+
+class TestRegexAST(unittest.TestCase):
+
+    def test_hash_consing(self):
+        self.assertIs(Symbol('a'), Symbol('a'))
+        self.assertIs(Epsilon(), Epsilon())
+        self.assertIs(Union(Symbol('a'), Star(Symbol('b'))), Union(Symbol('a'), Star(Symbol('b'))))
+        self.assertIsNot(Union(Symbol('a'), Symbol('b')), Concat(Symbol('a'), Symbol('b')))
+        self.assertIsNot(Union(Symbol('a'), Symbol('b')), Union(Symbol('b'), Symbol('a')))
+
+    def test_immutable(self):
+        node = Symbol('a')
+        with self.assertRaises(AttributeError):
+            node.letter = 'b'
+        with self.assertRaises(AttributeError):
+            node.children = (Symbol('b'),)
+        self.assertIs(copy.deepcopy(node), node)
+        node = Concat(Symbol('a'), Star(Symbol('b')))
+        self.assertIs(pickle.loads(pickle.dumps(node)), node)
+
+    def test_postorder(self):
+        node = Concat(Symbol('a'), Star(Symbol('b')))
+        self.assertEqual([n.kind for n in postorder(node)], ['symbol', 'symbol', 'star', 'concat'])
+        self.assertEqual(alphabet_of_node(Union(Symbol('b'), Concat(Symbol('a'), Symbol('b')))), ('b', 'a'))
+
+    def test_to_string(self):
+        self.assertEqual(to_string(Epsilon()), 'ε')
+        self.assertEqual(to_string(Concat(Symbol('a'), Star(Symbol('b'))), explicit_concat=False), 'ab*')
+        self.assertEqual(to_string(Star(Symbol('a'))), 'a*')
+        self.assertEqual(to_string(Star(Concat(Symbol('a'), Symbol('b')))), '(a.b)*')
+        self.assertEqual(to_string(Concat(Union(Symbol('a'), Symbol('b')), Symbol('c'))), '(a+b).c')
+        self.assertEqual(to_string(Union(Union(Symbol('a'), Symbol('b')), Symbol('c'))), '(a+b)+c')
+        self.assertEqual(str(Union(Symbol('a'), Union(Symbol('b'), Symbol('c')))), 'a+b+c')
+
+    def test_deep(self):
+        node = parse_regex('a' * 5000) # Deeper than the recursion limit
+        self.assertEqual(len(list(postorder(node))), 9999)
+        self.assertEqual(to_string(node), '.'.join('a' * 5000))
+
+
+class TestRegexParserInputAST(unittest.TestCase):
+
+    def test_parse(self):
+        a, b, c = Symbol('a'), Symbol('b'), Symbol('c')
+        self.assertIs(RegexParserInput('a').parse(), a)
+        self.assertIs(RegexParserInput('a+b+c').parse(), Union(a, Union(b, c)))
+        self.assertIs(RegexParserInput('abc').parse(), Concat(a, Concat(b, c)))
+        self.assertIs(RegexParserInput('a(b+c)*').parse(), Concat(a, Star(Union(b, c))))
+        self.assertIs(RegexParserInput('((a))').parse(), a)
+        self.assertIs(RegexParserInput('ab + c').parse(), Union(Concat(a, b), c))
+        self.assertIs(parse_regex(''), Epsilon())
+
+    def test_shared_subtrees(self):
+        node = parse_regex('(ab)*(ab)*')
+        self.assertIs(node.children[0], node.children[1])
+
+    def test_round_trip(self):
+        for regex in ('a', 'a*', 'a+b', 'ab', '(a+b)*c', 'a(b+c)d*', '((a+b)*c)*', '(a*+b*)*'):
+            node = parse_regex(regex)
+            self.assertIs(parse_regex(str(node).replace('.', '')), node)
+
+    def test_invalid(self):
+        for regex in ('a+', '*a', 'a**', '(a', 'a()b'):
+            with self.assertRaises(SyntaxError):
+                parse_regex(regex)
+
+
+class TestExtendedNodes(unittest.TestCase):
+
+    def test_parse(self):
+        a, b = Symbol('a'), Symbol('b')
+        self.assertIs(parse_regex('a{2,4}'), Repeat(a, 2, 4))
+        self.assertIs(parse_regex('(ab){3,}'), Repeat(Concat(a, b), 3, None))
+        self.assertIs(parse_regex('a?b'), Concat(Repeat(a, 0, 1), b))
+        self.assertIs(parse_regex('[b-da]'), CharClass('abcd'))
+        self.assertIs(parse_regex('a{0,}'), Star(a)) # Trivial repetitions are normalised
+        self.assertIs(parse_regex('a{1}'), a)
+        self.assertIs(parse_regex('a{0}'), Epsilon())
+        self.assertEqual(alphabet_of_node(parse_regex('[ca]b{2}')), ('a', 'c', 'b'))
+
+    def test_round_trip(self):
+        for regex in ('a{2,4}', 'a{3}', '(a+b){2,}', 'a?b', '[abc]*', '[-a!]{2}', '([ab]c)?'):
+            node = parse_regex(regex)
+            self.assertIs(parse_regex(str(node).replace('.', '')), node)
+
+    def test_expand_extended(self):
+        self.assertIs(expand_extended(parse_regex('a{2,4}')), parse_regex('aa(ε+a(ε+a))'))
+        self.assertIs(expand_extended(parse_regex('(ab){2,}')), parse_regex('(ab)(ab)(ab)*'))
+        self.assertIs(expand_extended(parse_regex('[ab]?')), parse_regex('ε+(a+b)'))
+        self.assertIs(expand_extended(parse_regex('[ab]c'), classes=False), parse_regex('[ab]c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
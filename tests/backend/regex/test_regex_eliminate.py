@@ -36,5 +36,12 @@ class TestRegexParserEliminate(unittest.TestCase):
         self.assertEqual(RegexParserEliminate.parse('(a+b)*.c'), ('concat', ('(a+b)*', 'c')))
 
 
+    def test_trim_deep_brackets(self):
+        depth = 50000
+        self.assertEqual(RegexParserEliminate.trim_enclosing_brackets('(' * depth + 'a+b' + ')' * depth), 'a+b')
+        self.assertEqual(RegexParserEliminate.trim_enclosing_brackets('((a))(b)'), '((a))(b)')
+        self.assertEqual(RegexParserEliminate.trim_enclosing_brackets('()'), '')
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
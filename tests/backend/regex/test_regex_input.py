@@ -85,5 +85,46 @@ class TestAddConcat(unittest.TestCase):
         self.assertEqual(add_concat('a*(b+c*)((a+bb)*+ab)c'), 'a*.(b+c*).((a+b.b)*+a.b).c')
 
 
+class TestEpsilonEmptyLiterals(unittest.TestCase):
+
+    def test_literals(self):
+        self.assertTrue(is_valid_regex('ε'))
+        self.assertTrue(is_valid_regex('a+ε'))
+        self.assertTrue(is_valid_regex('(a∅)*'))
+        self.assertEqual(set(alphabet_of('aε+∅b')), {'a', 'b'})
+        self.assertEqual(add_concat('aε∅b'), 'a.ε.∅.b')
+
+
+class TestRegexParserInputLarge(unittest.TestCase):
+
+    def test_deep_nesting(self):
+        depth = 20000 # Far beyond the recursion limit
+        self.assertTrue(is_valid_regex('(' * depth + 'a+b' + ')' * depth + '*'))
+        self.assertFalse(is_valid_regex('(' * depth + 'a+b' + ')' * (depth - 1)))
+        self.assertFalse(is_valid_regex('(' * (depth - 1) + 'a+b' + ')' * depth))
+
+    def test_long(self):
+        regex = '+'.join('(ab*c)' for _ in range(20000)) # Over 100k characters
+        self.assertGreater(len(regex), 100000)
+        self.assertTrue(is_valid_regex(regex))
+        self.assertFalse(is_valid_regex(regex + '+'))
+
+
+class TestExtendedSyntax(unittest.TestCase):
+
+    def test_valid(self):
+        for regex in ('a{2}', 'a{2,}', 'a{2,5}', 'a{0,1}', 'a?', '(a+b){3}c', '[abc]', '[a-z]', '[-a]', '[a-c]?d{1,2}', 'ε?'):
+            self.assertTrue(is_valid_regex(regex))
+
+    def test_invalid(self):
+        for regex in ('a{3,2}', 'a{', 'a}', 'a{x}', 'a{-1}', '{2}', 'a{2}{3}', 'a?*', 'a*?', '?',
+                      '[]', '[a', 'a]', '[(]', '[a+b]'):
+            self.assertFalse(is_valid_regex(regex))
+
+    def test_alphabet_of(self):
+        self.assertEqual(set(alphabet_of('[a-c]{2,3}x?')), {'a', 'b', 'c', 'x'})
+        self.assertEqual(set(alphabet_of('[-a]')), {'-', 'a'})
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
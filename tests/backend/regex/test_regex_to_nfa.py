@@ -63,6 +63,42 @@ class TestRegexToNFA(unittest.TestCase):
     def test_invalid_input(self):
         pass
 
+    def test_epsilon_empty_literals(self):
+        for method in ('thompson', 'glushkov', 'antimirov', 'gnfa'):
+            self.assertEqual(set(regex_to_nfa('a∅+b', method=method).L(4)), {'b'})
+            self.assertEqual(set(regex_to_nfa('(a+ε)b', method=method).L(4)), {'ab', 'b'})
+            self.assertEqual(set(regex_to_nfa('∅*', method=method).L(4)), {''})
+            # Letters only under ∅ still belong to the alphabet, whichever method is used
+            nfa = regex_to_nfa('b*+∅a', method=method)
+            self.assertEqual(nfa.alphabet, ('a', 'b'), method)
+            self.assertEqual(nfa.universal_counterexample(), 'a', method)
+
+    def test_extended_syntax(self):
+        # Each regex against the same language written with core syntax only
+        cases = [('a{2,4}', 'aa+aaa+aaaa'),
+                 ('(ab){2}', 'abab'),
+                 ('a{2,}b', 'aaa*b'),
+                 ('(a+b)?c', 'c+ac+bc'),
+                 ('(a*b){0,2}', 'ε+a*b+a*ba*b'),
+                 ('[a-c]{2}', '(a+b+c)(a+b+c)'),
+                 ('[ab]*c?', '(a+b)*(ε+c)'),
+                 ('(a?b?){2,3}', '(ε+a+b+ab)(ε+a+b+ab)(ε+a+b+ab)')]
+        for regex, expanded in cases:
+            expected = set(regex_to_nfa(expanded).L(5))
+            for method in ('thompson', 'glushkov', 'antimirov', 'gnfa'):
+                self.assertEqual(set(regex_to_nfa(regex, method=method).L(5)), expected, (regex, method))
+            self.assertEqual(set(regex_to_nfa(regex, simplify=True).L(5)), expected, regex)
+
+    def test_extended_syntax_size(self):
+        # Classes add a single state, and repetitions no more than the copies they stand for
+        self.assertEqual(len(regex_to_nfa('[a-z]', method='glushkov').states), 2)
+        self.assertEqual(len(regex_to_nfa('[a-z]', method='thompson').states), 2)
+        self.assertEqual(len(regex_to_nfa('[a-z]{3}', method='antimirov').states), 4)
+        nfa = regex_to_nfa('(a+b){100}', method='thompson')
+        self.assertLessEqual(len(nfa.states), 101)
+        self.assertTrue(nfa.accepts('ab' * 50))
+        self.assertFalse(nfa.accepts('ab' * 49))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
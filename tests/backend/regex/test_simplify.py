@@ -0,0 +1,46 @@
+import unittest
+from autolang import simplify_regex, regex_to_nfa, regex_to_dfa
+from autolang.backend.regex.simplify import simplify_tree
+from autolang.backend.regex.regex_input import parse_regex
+
+class TestSimplifyRegex(unittest.TestCase):
+
+    def test_union(self):
+        self.assertEqual(simplify_regex('(a+a)'), 'a')
+        self.assertEqual(simplify_regex('a+(b+a)'), 'a+b')
+        self.assertEqual(simplify_regex('a+∅'), 'a')
+        self.assertEqual(simplify_regex('a+a*'), 'a*')
+        self.assertEqual(simplify_regex('(ε+a*)'), 'a*')
+        self.assertEqual(simplify_regex('ε+a'), 'ε+a')
+
+    def test_concat(self):
+        self.assertEqual(simplify_regex('a∅b'), '∅')
+        self.assertEqual(simplify_regex('aεb'), 'ab')
+        self.assertEqual(simplify_regex('a*a*b'), 'a*b')
+        self.assertEqual(simplify_regex('((ab)c)'), 'abc')
+
+    def test_star(self):
+        self.assertEqual(simplify_regex('(a*)*'), 'a*')
+        self.assertEqual(simplify_regex('ε*'), 'ε')
+        self.assertEqual(simplify_regex('∅*'), 'ε')
+        self.assertEqual(simplify_regex('(ε+a*+b)*'), '(a+b)*')
+        self.assertEqual(simplify_regex('(a*b*)*'), '(a+b)*')
+        self.assertEqual(simplify_regex('((a+a)*)*'), 'a*')
+
+    def test_fixpoint(self):
+        for regex in ('((a+a)*(a*)*)*+ε', '(a+b)*(a+ε)(b+∅)', '((a*)+(b*))*'):
+            simplified = parse_regex(simplify_regex(regex))
+            self.assertIs(simplify_tree(simplified), simplified)
+
+    def test_language(self):
+        for regex in ('((a+a)*(a*)*)*+ε', '(a+b)*(a+ε)(b+∅)', '((a*)+(b*))*', 'a(b+c)*d', '(ab+ε)*c*c*'):
+            self.assertEqual(regex_to_nfa(regex, simplify=True).L(5), regex_to_nfa(regex).L(5))
+            self.assertEqual(regex_to_dfa(regex, simplify=True).L(5), regex_to_dfa(regex).L(5))
+
+    def test_smaller(self):
+        regex = '((a+a)*)*(ε+b*)*'
+        self.assertLess(len(regex_to_nfa(regex, simplify=True).transition.states), len(regex_to_nfa(regex).transition.states))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
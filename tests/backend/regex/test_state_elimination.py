@@ -0,0 +1,52 @@
+import unittest
+from autolang import DFA, NFA, regex_to_nfa, regex_to_dfa
+from autolang.backend.regex.state_elimination import StateEliminator
+from autolang.backend.regex.regex_input import OP_CHARS
+
+REGEXES = ['a', 'a+b', 'ab', 'a*', '(a+b)*', 'a(b+c)*d', '((a*)+(b*))*', '(ab+c)*(a+b)', '(a+b)*a(a+b)(a+b)', 'a∅+b']
+
+class TestStateElimination(unittest.TestCase):
+
+    def test_round_trip(self):
+        for regex in REGEXES:
+            nfa = regex_to_nfa(regex)
+            dfa = regex_to_dfa(regex)
+            for heuristic in ('degree', 'weight', 'naive'):
+                self.assertEqual(regex_to_nfa(nfa.to_regex(heuristic)).L(6), nfa.L(6))
+                self.assertEqual(regex_to_nfa(dfa.to_regex(heuristic)).L(6), dfa.L(6))
+
+    def test_simple(self):
+        dfa = DFA({('q0', 'a'): 'q1', ('q0', 'b'): 'q2',
+                   ('q1', 'a'): 'q1', ('q1', 'b'): 'q2',
+                   ('q2', 'a'): 'q2', ('q2', 'b'): 'q2'}, 'q0', {'q1'})
+        self.assertEqual(dfa.to_regex(), 'aa*')
+        nfa = NFA({('q0', 'a'): ('q0', 'q1'), ('q1', ''): tuple()}, 'q0', {'q1'})
+        self.assertEqual(regex_to_nfa(nfa.to_regex()).L(4), nfa.L(4))
+
+    def test_empty_language(self):
+        dfa = DFA({('q0', 'a'): 'q0'}, 'q0', set())
+        self.assertEqual(dfa.to_regex(), '∅')
+        dfa = DFA({('q0', 'a'): 'q1', ('q1', 'a'): 'q1'}, 'q0', {'q0'})
+        self.assertEqual(dfa.to_regex(), 'ε')
+
+    def test_heuristics_shorter(self):
+        dfa = regex_to_dfa('(a+b)*a(a+b)(a+b)(a+b)')
+        self.assertLessEqual(len(dfa.to_regex('degree')), len(dfa.to_regex('naive')))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            StateEliminator([], 'q0', set(), 'unknown')
+
+    def test_regex_letters_rejected(self):
+        for letter in OP_CHARS:
+            with self.assertRaises(ValueError):
+                StateEliminator([(('q0', letter), ('q0',))], 'q0', {'q0'})
+
+    def test_round_trip_unusual_letters(self):
+        dfa = DFA({('q0', '-'): 'q1', ('q0', '!'): 'q0',
+                   ('q1', '-'): 'q1', ('q1', '!'): 'q0'}, 'q0', {'q1'})
+        self.assertEqual(regex_to_dfa(dfa.to_regex()).L(5), dfa.L(5))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,44 @@
+import unittest
+from autolang import regex_to_nfa
+from autolang.backend.regex.thompson import ConstructThompson
+from autolang.backend.regex.regex_input import parse_regex
+
+REGEXES = ['', 'a', 'a+b', 'ab', 'a*', '(a+b)*', 'a(b+c)*d', '((a*)+(b*))*', '(ab+c)*(a+b)', 'a+a']
+
+class TestConstructThompson(unittest.TestCase):
+
+    def test_construct(self):
+        construction = ConstructThompson(parse_regex('ab*'))
+        transition = construction.construct()
+        self.assertEqual(construction.states, ['s0', 't', 's1', 's2'])
+        self.assertEqual(transition, {
+            ('s0', 'a'): ('s1',),
+            ('s1', ''): ('s2',),
+            ('s2', ''): ('t',),
+            ('s2', 'b'): ('s2',)
+        })
+
+    def test_same_shape_as_gnfa(self):
+        for regex in REGEXES:
+            thompson = regex_to_nfa(regex, method='thompson')
+            gnfa = regex_to_nfa(regex, method='gnfa')
+            self.assertEqual(len(thompson.transition.states), len(gnfa.transition.states))
+            self.assertEqual(sorted(len(next_states) for next_states in thompson.transition.values()),
+                             sorted(len(next_states) for next_states in gnfa.transition.values()))
+            self.assertEqual(thompson.L(5), gnfa.L(5))
+
+    def test_long_regex(self):
+        regex = '+'.join('(ab*c)' for _ in range(2000)) + ''.join('a' for _ in range(2000))
+        nfa = regex_to_nfa(regex)
+        self.assertTrue(nfa.accepts('abbc' + 'a' * 2000))
+        self.assertFalse(nfa.accepts('abbc' + 'a' * 1999))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            regex_to_nfa('a', method='unknown')
+        with self.assertRaises(ValueError):
+            regex_to_nfa('a+')
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -1,5 +1,5 @@
 import unittest
-from autolang.backend.utils import words_of_length, words_to_length
+from autolang.backend.utils import words_of_length, words_to_length, sort_states, strongly_connected_components
 
 class TestGetMaxWordsSize(unittest.TestCase):
     pass
@@ -69,5 +69,33 @@ class TestWordsToLengthFromRegex(unittest.TestCase):
     pass
 
 
+class TestSortStates(unittest.TestCase):
+
+    def test_len_lex(self):
+        self.assertEqual(sort_states({'q10', 'q2', 'q1', 't'}), ('t', 'q1', 'q2', 'q10'))
+
+
+class TestStronglyConnectedComponents(unittest.TestCase):
+
+    def test_components(self):
+        graph = {'a': ['b'], 'b': ['c', 'a'], 'c': ['d'], 'd': ['c'], 'e': []}
+        components = strongly_connected_components(['a', 'b', 'c', 'd', 'e'], graph)
+        self.assertEqual({frozenset(c) for c in components}, {frozenset('ab'), frozenset('cd'), frozenset('e')})
+        # Reverse topological order: {c, d} is reachable from {a, b}, so must come first
+        order = [frozenset(c) for c in components]
+        self.assertLess(order.index(frozenset('cd')), order.index(frozenset('ab')))
+
+    def test_self_loop_and_missing(self):
+        components = strongly_connected_components(['a', 'b'], {'a': ['a']})
+        self.assertEqual(sorted(map(sorted, components)), [['a'], ['b']])
+
+    def test_long_chain(self):
+        # Deep enough to overflow a recursive implementation
+        n = 5000
+        graph = {i: [i + 1] for i in range(n)}
+        graph[n] = [0]
+        self.assertEqual(len(strongly_connected_components(range(n + 1), graph)), 1)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file